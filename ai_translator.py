@@ -4,21 +4,104 @@ AI-powered translation module using Groq API
 Supports high-quality Arabic translation for crypto and financial news
 """
 import os
+import re
+import json
 import logging
 import asyncio
-from typing import Optional
-from groq import AsyncGroq
+import time
+from typing import Dict, List, Optional
+from groq import AsyncGroq, RateLimitError
+
+from groq_scheduler import GroqRequestScheduler, PRIORITY_NORMAL, estimate_tokens
 
 logger = logging.getLogger(__name__)
 
+TRANSLATION_SYSTEM_PROMPT = """أنت مترجم محترف متخصص في الأخبار المالية والعملات المشفرة. 
+قم بترجمة النص التالي إلى العربية مع مراعاة:
+1. استخدام المصطلحات المالية العربية الصحيحة
+2. الحفاظ على المعنى المالي والاقتصادي
+3. جعل النص طبيعي ومفهوم للقارئ العربي
+4. استخدام تعبيرات مالية مناسبة للسوق العربي
+
+قم بالترجمة فقط بدون أي تفسيرات إضافية."""
+
+# Extra instructions for translating several numbered texts in one request
+BATCH_FORMAT_PROMPT = """
+
+ستصلك عدة نصوص مرقمة. ترجم كل نص على حدة وأجب بصيغة JSON فقط:
+{"translations": [{"id": 1, "text": "الترجمة"}, {"id": 2, "text": "الترجمة"}]}"""
+
+# Fallback parser for "1. text" / "2) text" style answers
+NUMBERED_LINE_PATTERN = re.compile(r'^\s*(\d+)\s*[.):\-]\s*(.+?)\s*$', re.MULTILINE)
+
+# Allowed values of the combined translation + market impact answer
+IMPACT_VALUES = ('إيجابي', 'سلبي', 'محايد')
+STRENGTH_VALUES = ('قوي', 'متوسط', 'ضعيف')
+ASSET_VALUES = ('البيتكوين', 'الإيثريوم', 'العملات المشفرة', 'الدولار الأمريكي', 'الذهب', 'النفط', 'الأسهم', 'السوق')
+ANALYSIS_FIELDS = ('translation', 'impact', 'asset', 'strength')
+
+# Translation and market impact in one completion (same cost as translation alone)
+ANALYSIS_SYSTEM_PROMPT = f"""أنت مترجم ومحلل أسواق مالية متخصص في الأخبار المالية والعملات المشفرة.
+1. ترجم النص إلى العربية باستخدام المصطلحات المالية العربية الصحيحة وبأسلوب طبيعي للقارئ العربي
+2. حدد تأثير الخبر على السوق: {' / '.join(IMPACT_VALUES)}
+3. حدد الأصل الأكثر تأثراً: {' / '.join(ASSET_VALUES)}
+4. حدد قوة التأثير: {' / '.join(STRENGTH_VALUES)}
+
+أجب بصيغة JSON فقط وبالقيم المذكورة حرفياً:
+{{"translation": "الترجمة", "impact": "محايد", "asset": "السوق", "strength": "متوسط"}}"""
+
+BATCH_ANALYSIS_FORMAT_PROMPT = """
+
+ستصلك عدة نصوص مرقمة. عالج كل نص على حدة وأجب بصيغة JSON فقط:
+{"items": [{"id": 1, "translation": "الترجمة", "impact": "محايد", "asset": "السوق", "strength": "متوسط"}]}"""
+
+
+def extract_json_object(response_text: str) -> Optional[dict]:
+    """First JSON object in a model answer (tolerates code fences and chatter), None if there is none"""
+    response_text = (response_text or "").strip()
+    start, end = response_text.find('{'), response_text.rfind('}')
+    if start == -1 or end <= start:
+        return None
+    try:
+        data = json.loads(response_text[start:end + 1])
+    except ValueError:
+        return None
+    return data if isinstance(data, dict) else None
+
+
+def validate_analysis(data) -> Optional[Dict[str, str]]:
+    """Strict schema check of a combined answer: every field present, enums from the allowed values"""
+    if not isinstance(data, dict):
+        return None
+    values = {}
+    for field_name in ANALYSIS_FIELDS:
+        value = data.get(field_name)
+        if not isinstance(value, str) or not value.strip():
+            return None
+        values[field_name] = value.strip()
+    if (values['impact'] not in IMPACT_VALUES or values['asset'] not in ASSET_VALUES
+            or values['strength'] not in STRENGTH_VALUES):
+        return None
+    return values
+
+
 class AITranslator:
     """AI-powered translator using Groq's free API with Arabic-optimized models"""
     
-    def __init__(self, api_key: Optional[str] = None):
+    # Bump whenever the translation prompt changes so cached translations are not reused
+    PROMPT_VERSION = "v1"
+    ANALYSIS_PROMPT_VERSION = "analysis-v1"
+    
+    def __init__(self, api_key: Optional[str] = None, scheduler: Optional[GroqRequestScheduler] = None,
+                 max_queue_wait: Optional[float] = 30.0):
         self.api_key = api_key or os.getenv('GROQ_API_KEY')
         self.client = None
         self.model = "llama-3.3-70b-versatile"  # Stable model that should work
         
+        # 🚦 Client-side RPM/TPM budget shared by every call to Groq
+        self.scheduler = scheduler or GroqRequestScheduler()
+        self.max_queue_wait = max_queue_wait
+        
         if self.api_key:
             try:
                 self.client = AsyncGroq(api_key=self.api_key)
@@ -29,7 +112,38 @@ class AITranslator:
         else:
             logger.warning("No GROQ_API_KEY found - AI translation disabled")
     
-    async def translate_to_arabic(self, text: str, context: str = "financial news") -> str:
+    async def _create_completion(self, messages: List[Dict[str, str]], max_tokens: int,
+                                 priority: int = PRIORITY_NORMAL, timing: Optional[Dict[str, float]] = None,
+                                 **params):
+        """
+        Chat completion sent through the rate-limit scheduler (raises if the budget wait is too long)
+        timing['sent_at'] gets the monotonic time the request left the scheduler queue
+        """
+        estimated = estimate_tokens(*(message['content'] for message in messages),
+                                    completion_tokens=max_tokens // 2)
+        if not await self.scheduler.acquire(estimated, priority, self.max_queue_wait):
+            raise RuntimeError("Groq rate budget exhausted, not queuing any longer")
+        if timing is not None:
+            timing['sent_at'] = time.monotonic()
+        
+        try:
+            response = await self.client.chat.completions.with_raw_response.create(
+                model=self.model,
+                messages=messages,
+                max_tokens=max_tokens,
+                **params
+            )
+        except RateLimitError as e:
+            self.scheduler.record_rate_limited(e.response.headers.get('retry-after'))
+            raise
+        
+        completion = await response.parse()
+        usage = getattr(completion, 'usage', None)
+        self.scheduler.record_response(response.headers, estimated, getattr(usage, 'total_tokens', None))
+        return completion
+    
+    async def translate_to_arabic(self, text: str, context: str = "financial news",
+                                  priority: int = PRIORITY_NORMAL, timing: Optional[Dict[str, float]] = None) -> str:
         """
         Translate text to Arabic using AI with financial/crypto context understanding
         """
@@ -44,26 +158,20 @@ class AITranslator:
                 text = text[:1000] + "..."
             
             # Create context-aware prompt for better translation
-            system_prompt = f"""أنت مترجم محترف متخصص في الأخبار المالية والعملات المشفرة. 
-قم بترجمة النص التالي إلى العربية مع مراعاة:
-1. استخدام المصطلحات المالية العربية الصحيحة
-2. الحفاظ على المعنى المالي والاقتصادي
-3. جعل النص طبيعي ومفهوم للقارئ العربي
-4. استخدام تعبيرات مالية مناسبة للسوق العربي
-
-قم بالترجمة فقط بدون أي تفسيرات إضافية."""
+            system_prompt = TRANSLATION_SYSTEM_PROMPT
 
             user_prompt = f"ترجم هذا النص من {context}:\n\n{text}"
             
             # Make API call
-            completion = await self.client.chat.completions.create(
-                model=self.model,
-                messages=[
+            completion = await self._create_completion(
+                [
                     {"role": "system", "content": system_prompt},
                     {"role": "user", "content": user_prompt}
                 ],
-                temperature=0.3,  # Lower temperature for more consistent translation
                 max_tokens=1024,
+                priority=priority,
+                timing=timing,
+                temperature=0.3,  # Lower temperature for more consistent translation
                 top_p=0.9
             )
             
@@ -76,6 +184,139 @@ class AITranslator:
             # Fallback to original text
             return text
     
+    async def translate_batch(self, texts: List[str], context: str = "financial news",
+                              priority: int = PRIORITY_NORMAL) -> List[Optional[str]]:
+        """
+        Translate several texts in one request
+        Returns one translation per input, None where the answer could not be matched to an item
+        """
+        if not self.client or not texts:
+            return [None] * len(texts)
+        
+        try:
+            numbered = "\n".join(
+                f"{index}. {' '.join(text.split())[:1000]}" for index, text in enumerate(texts, 1)
+            )
+            user_prompt = f"ترجم هذه النصوص من {context}:\n\n{numbered}"
+            
+            completion = await self._create_completion(
+                [
+                    {"role": "system", "content": TRANSLATION_SYSTEM_PROMPT + BATCH_FORMAT_PROMPT},
+                    {"role": "user", "content": user_prompt}
+                ],
+                max_tokens=min(4096, 256 * len(texts)),
+                priority=priority,
+                temperature=0.3,
+                top_p=0.9
+            )
+            
+            parsed = self._parse_batch_response(completion.choices[0].message.content)
+            results = [parsed.get(index) for index in range(1, len(texts) + 1)]
+            logger.info(f"AI batch translation: {sum(1 for r in results if r)}/{len(texts)} items in one request")
+            return results
+            
+        except Exception as e:
+            logger.error(f"AI batch translation failed: {e}")
+            return [None] * len(texts)
+    
+    @staticmethod
+    def _parse_batch_response(response_text: str) -> Dict[int, str]:
+        """Map item number -> translation from a JSON (or numbered list) answer"""
+        response_text = (response_text or "").strip()
+        translations: Dict[int, str] = {}
+        
+        # JSON answer, possibly wrapped in a code fence or surrounded by chatter
+        data = extract_json_object(response_text)
+        if data:
+            items = data.get('translations', [])
+            for item in items if isinstance(items, list) else []:
+                if isinstance(item, dict) and str(item.get('id', '')).isdigit() and item.get('text'):
+                    translations[int(item['id'])] = str(item['text']).strip()
+            if translations:
+                return translations
+        
+        # Numbered lines
+        for number, text in NUMBERED_LINE_PATTERN.findall(response_text):
+            translations.setdefault(int(number), text)
+        return translations
+    
+    async def translate_with_analysis(self, text: str, context: str = "financial news",
+                                      priority: int = PRIORITY_NORMAL,
+                                      timing: Optional[Dict[str, float]] = None) -> Optional[Dict[str, str]]:
+        """
+        Translation plus market impact in one completion
+        Returns {translation, impact, asset, strength}, None if the call failed or the answer broke the schema
+        """
+        if not self.client:
+            return None
+        
+        try:
+            text = ' '.join(text.split())[:1000]
+            completion = await self._create_completion(
+                [
+                    {"role": "system", "content": ANALYSIS_SYSTEM_PROMPT},
+                    {"role": "user", "content": f"النص من {context}:\n\n{text}"}
+                ],
+                max_tokens=1024,
+                priority=priority,
+                timing=timing,
+                temperature=0.2,
+                top_p=0.9,
+                response_format={"type": "json_object"}
+            )
+            
+            analysis = validate_analysis(extract_json_object(completion.choices[0].message.content))
+            if not analysis:
+                logger.warning("AI translation+analysis answer failed schema validation")
+                return None
+            logger.info(f"AI translation+analysis successful ({analysis['impact']} / {analysis['asset']})")
+            return analysis
+            
+        except Exception as e:
+            logger.error(f"AI translation+analysis failed: {e}")
+            return None
+    
+    async def translate_batch_with_analysis(self, texts: List[str], context: str = "financial news",
+                                            priority: int = PRIORITY_NORMAL) -> List[Optional[Dict[str, str]]]:
+        """
+        Translation plus market impact for several texts in one request
+        Returns one validated analysis per input, None where an item was missing or broke the schema
+        """
+        if not self.client or not texts:
+            return [None] * len(texts)
+        
+        try:
+            numbered = "\n".join(
+                f"{index}. {' '.join(text.split())[:1000]}" for index, text in enumerate(texts, 1)
+            )
+            completion = await self._create_completion(
+                [
+                    {"role": "system", "content": ANALYSIS_SYSTEM_PROMPT + BATCH_ANALYSIS_FORMAT_PROMPT},
+                    {"role": "user", "content": f"النصوص من {context}:\n\n{numbered}"}
+                ],
+                max_tokens=min(4096, 320 * len(texts)),
+                priority=priority,
+                temperature=0.2,
+                top_p=0.9,
+                response_format={"type": "json_object"}
+            )
+            
+            data = extract_json_object(completion.choices[0].message.content) or {}
+            items = data.get('items', [])
+            by_id: Dict[int, Dict[str, str]] = {}
+            for item in items if isinstance(items, list) else []:
+                analysis = validate_analysis(item)
+                if analysis and str(item.get('id', '')).isdigit():
+                    by_id[int(item['id'])] = analysis
+            
+            results = [by_id.get(index) for index in range(1, len(texts) + 1)]
+            logger.info(f"AI batch translation+analysis: {len(by_id)}/{len(texts)} valid items in one request")
+            return results
+            
+        except Exception as e:
+            logger.error(f"AI batch translation+analysis failed: {e}")
+            return [None] * len(texts)
+    
     async def analyze_market_impact(self, title: str, summary: str = "") -> dict:
         """
         Analyze market impact and sentiment for crypto/financial news
@@ -95,14 +336,13 @@ class AITranslator:
 أجب بصيغة JSON فقط:
 {"impact": "إيجابي/سلبي/محايد", "currency": "البيتكوين/الدولار الأمريكي/الذهب/الأسهم", "strength": "قوي/متوسط/ضعيف"}"""
 
-            completion = await self.client.chat.completions.create(
-                model=self.model,
-                messages=[
+            completion = await self._create_completion(
+                [
                     {"role": "system", "content": system_prompt},
                     {"role": "user", "content": content}
                 ],
-                temperature=0.1,
-                max_tokens=256
+                max_tokens=256,
+                temperature=0.1
             )
             
             result_text = completion.choices[0].message.content.strip()
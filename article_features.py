@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+Per-article feature cache
+Everything downstream stages derive from an article's text is computed once at ingest
+(and again only if the title, summary, link or timestamp it came from changes)
+"""
+import hashlib
+import re
+from dataclasses import dataclass
+from typing import Tuple
+from urllib.parse import urlsplit
+
+from keyword_matcher import KeywordMatches, keyword_matcher
+
+TOKEN_PATTERN = re.compile(r'\w+')
+
+# Query parameters that only track where a click came from
+TRACKING_PARAM_PREFIX = 'utm_'
+TRACKING_PARAMS = {'ref', 'source', 'fbclid', 'gclid'}
+
+
+@dataclass(frozen=True)
+class ArticleFeatures:
+    """Derived, read-only view of an article shared by all filters and formatters"""
+    text: str                   # Lowercased "title summary"
+    matches: KeywordMatches     # Keyword match vector from the shared matcher
+    arabic_ratio: float         # Share of letters in the Arabic block (0.0 - 1.0)
+    title_arabic_ratio: float   # The same for the title alone (what gets translated)
+    timestamp: int              # Publish time as UTC epoch seconds (0 = unknown)
+    canonical_id: str           # Stable ID from the normalized link (or title if no link), used for deduplication
+    inputs: Tuple[str, str, str, int]  # (title, summary, link, timestamp) the features were computed from
+
+    def has(self, label: str) -> bool:
+        """True if any keyword of the label matched"""
+        return self.matches.has(label)
+
+    def is_arabic(self, threshold: float = 0.7) -> bool:
+        """True if the text is mostly Arabic"""
+        return self.arabic_ratio > threshold
+
+    def is_title_arabic(self, threshold: float = 0.7) -> bool:
+        """True if the title is mostly Arabic (no translation needed)"""
+        return self.title_arabic_ratio > threshold
+
+
+def arabic_ratio(text: str) -> float:
+    """Share of letters in the Arabic Unicode block (U+0600 to U+06FF)"""
+    total_letters = 0
+    arabic_letters = 0
+    for char in text:
+        if char.isalpha():
+            total_letters += 1
+            if '\u0600' <= char <= '\u06FF':
+                arabic_letters += 1
+    return arabic_letters / total_letters if total_letters else 0.0
+
+
+def _is_tracking_param(name: str) -> bool:
+    """True for click-tracking query parameters"""
+    return name.startswith(TRACKING_PARAM_PREFIX) or name in TRACKING_PARAMS
+
+
+def canonical_link(link: str) -> str:
+    """Normalize a link so re-shared and tracked URLs of one story compare equal"""
+    if not link:
+        return ''
+    parts = urlsplit(link.strip())
+    host = parts.netloc.lower()
+    if host.startswith('www.'):
+        host = host[4:]
+    query = '&'.join(
+        param for param in parts.query.split('&')
+        if param and not _is_tracking_param(param.split('=', 1)[0].lower())
+    )
+    path = parts.path.rstrip('/')
+    return f"{host}{path}?{query}" if query else f"{host}{path}"
+
+
+def canonical_article_id(title: str, link: str) -> str:
+    """12-char ID from the canonical link, falling back to the normalized title"""
+    key = canonical_link(link) or ' '.join(TOKEN_PATTERN.findall(title.lower()))
+    return hashlib.md5(key.encode()).hexdigest()[:12]
+
+
+def extract_features(title: str, summary: str = "", link: str = "", timestamp: int = 0) -> ArticleFeatures:
+    """Compute an article's features in one go"""
+    summary, link, timestamp = summary or '', link or '', timestamp or 0
+    text = f"{title} {summary}".lower() if summary else title.lower()
+    return ArticleFeatures(
+        text=text,
+        matches=keyword_matcher.scan_text(text),
+        arabic_ratio=arabic_ratio(text),
+        title_arabic_ratio=arabic_ratio(title),
+        timestamp=timestamp,
+        canonical_id=canonical_article_id(title, link),
+        inputs=(title, summary, link, timestamp),
+    )
+
+
+def get_features(article) -> ArticleFeatures:
+    """Features attached to an article, (re)computed and attached if missing or if the article's text changed"""
+    inputs = (
+        article.title,
+        getattr(article, 'summary', '') or '',
+        getattr(article, 'link', '') or '',
+        getattr(article, 'timestamp', 0) or 0,
+    )
+    features = getattr(article, 'features', None)
+    if features is None or features.inputs != inputs:
+        features = extract_features(*inputs)
+        try:
+            article.features = features
+        except AttributeError:
+            pass  # Read-only article objects just recompute
+    return features
@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+Outgoing article priority
+Score = breaking indicators + source weight + freshness, plus aging while queued so routine
+items cannot starve behind a stream of urgent ones
+
+Freshness and aging are both linear in time, so the order between two waiting items never
+changes while they wait: a heap keyed once at enqueue time always yields the item with the
+highest current score, without re-scoring.
+"""
+import logging
+import time
+
+from article_features import get_features
+
+logger = logging.getLogger(__name__)
+
+# Section substrings -> weight (first match wins)
+SOURCE_WEIGHTS = [
+    ('ECONOMIC', 3),
+    ('CRYPTO', 2),
+    ('COINTELEGRAPH', 2),
+    ('COINDESK', 2),
+    ('FOREX', 1),
+    ('COMMODITIES', 1),
+    ('STOCK', 1),
+    ('HEADLINES', 1),
+]
+
+FRESHNESS_POINTS_PER_MINUTE = 0.1  # A story 30 min newer is worth a BREAKING section
+AGING_POINTS_PER_MINUTE = 0.5      # 10 min in the queue is worth an urgent keyword (must exceed freshness)
+
+
+def breaking_score(article) -> int:
+    """Breaking-news indicators: high-priority keywords, urgent keywords, BREAKING sections"""
+    score = 0
+    features = get_features(article)
+
+    # High priority keywords
+    if features.has('breaking:high_priority'):
+        score += 10
+
+    # Breaking indicators
+    if features.has('breaking:urgent'):
+        score += 5
+
+    # Breaking section bonus
+    if 'BREAKING' in (getattr(article, 'section', '') or '').upper():
+        score += 3
+
+    return score
+
+
+def source_weight(article) -> int:
+    """Weight of the section/source an article came from"""
+    section = (getattr(article, 'section', '') or '').upper()
+    for name, weight in SOURCE_WEIGHTS:
+        if name in section:
+            return weight
+    return 0
+
+
+def priority_score(article, waited_seconds: float = 0.0, now: float = None) -> float:
+    """Current score (higher = send first): breaking + source + freshness + aging"""
+    now = now or time.time()
+    published = get_features(article).timestamp or now
+    age_minutes = max(now - published, 0) / 60
+    return (breaking_score(article) + source_weight(article)
+            - FRESHNESS_POINTS_PER_MINUTE * age_minutes
+            + AGING_POINTS_PER_MINUTE * waited_seconds / 60)
+
+
+def rank_key(article, enqueued_at: float) -> float:
+    """
+    Heap key (lower = sent first) equivalent to -priority_score at any later time
+    enqueued_at: when the item started waiting, on the clock used for every key in the heap
+    A publish time in the future (usually a feed's timezone mistake) counts as now, like the
+    clamped age in priority_score, so it cannot buy unlimited freshness
+    """
+    now = time.time()
+    published = min(get_features(article).timestamp or now, now)
+    return -(breaking_score(article) + source_weight(article)
+             + FRESHNESS_POINTS_PER_MINUTE * published / 60
+             - AGING_POINTS_PER_MINUTE * enqueued_at / 60)
@@ -0,0 +1,194 @@
+#!/usr/bin/env python3
+"""
+Release-time-aware economic calendar scheduler
+Sleeps until just before each high-importance release, then polls tightly until the actual value appears
+"""
+import asyncio
+import logging
+from datetime import datetime, timezone, timedelta
+from typing import Awaitable, Callable, Dict, List, Optional, Tuple
+
+from config_free import Config
+from economic_event_store import (
+    EVENT_NEW, EVENT_ACTUAL_RELEASED, EVENT_ACTUAL_REVISED, EVENT_FORECAST_REVISED, EVENT_PREVIOUS_REVISED
+)
+
+logger = logging.getLogger(__name__)
+
+
+class EconomicReleaseScheduler:
+    """Schedule economic calendar polling around known release times"""
+
+    def __init__(self, scraper, on_release: Callable[..., Awaitable],
+                 on_upcoming: Optional[Callable[..., Awaitable]] = None,
+                 on_scheduled: Optional[Callable] = None,
+                 on_unscheduled: Optional[Callable] = None):
+        self.scraper = scraper
+        self.on_release = on_release
+        self.on_upcoming = on_upcoming
+        # Sync hooks so release messages can be pre-staged while an event is pending
+        self.on_scheduled = on_scheduled
+        self.on_unscheduled = on_unscheduled
+        self.running = False
+
+        self.lead_seconds = Config.ECONOMIC_RELEASE_LEAD_SECONDS
+        self.poll_interval = Config.ECONOMIC_RELEASE_POLL_SECONDS
+        self.poll_timeout = Config.ECONOMIC_RELEASE_POLL_TIMEOUT
+        self.refresh_interval = Config.ECONOMIC_SCHEDULE_REFRESH_SECONDS
+
+        # event_id -> (release time, event) for high-importance events still waiting on actual
+        self.pending: Dict[str, Tuple[datetime, object]] = {}
+
+        self.stats = {
+            'releases_posted': 0,
+            'polls': 0,
+            'last_latency_seconds': None,
+            'max_latency_seconds': 0.0,
+        }
+
+    @staticmethod
+    def get_release_time(event) -> Optional[datetime]:
+        """Scheduled release time of an event in UTC (calendar times are UTC)"""
+        if not event.time or ':' not in event.time:
+            return None  # TBD / All Day events have no release time
+        try:
+            hour, minute = map(int, event.time.split(':')[:2])
+            if event.event_date:
+                event_day = datetime.strptime(event.event_date, '%Y-%m-%d').replace(tzinfo=timezone.utc)
+            else:
+                event_day = datetime.now(timezone.utc)
+            return event_day.replace(hour=hour, minute=minute, second=0, microsecond=0)
+        except (ValueError, TypeError):
+            return None
+
+    async def refresh_schedule(self):
+        """Full calendar scrape: announce new events, post late releases, rebuild pending list"""
+        events = await self.scraper.scrape_economic_calendar()
+        if not events:
+            return
+
+        changes = self.scraper.event_store.apply(events)
+        await self._dispatch_changes(changes)
+
+        now = datetime.now(timezone.utc)
+        for event in events:
+            if event.importance != "High" or event.actual:
+                continue
+            release_time = self.get_release_time(event)
+            # Keep events whose polling window has not closed yet
+            if release_time and release_time + timedelta(seconds=self.poll_timeout) > now:
+                self._schedule(event.event_id, release_time, event)
+
+        logger.info(f"📅 SCHEDULER: {len(self.pending)} high-importance releases pending today")
+
+    def _schedule(self, event_id: str, release_time: datetime, event):
+        """Add or refresh a pending event and let the bot stage its release message"""
+        self.pending[event_id] = (release_time, event)
+        if self.on_scheduled:
+            self.on_scheduled(event)
+
+    def _unschedule(self, event_id: str) -> Optional[datetime]:
+        """Remove a pending event, returns its scheduled release time"""
+        scheduled = self.pending.pop(event_id, (None, None))[0]
+        if scheduled and self.on_unscheduled:
+            self.on_unscheduled(event_id)
+        return scheduled
+
+    async def _dispatch_changes(self, changes: List) -> int:
+        """Hand store deltas to the posting callbacks, returns number of releases posted"""
+        posted = 0
+        for change in changes:
+            event = change.event
+            if change.change_type == EVENT_ACTUAL_RELEASED:
+                # Post before unscheduling so a staged message is still available
+                scheduled = self.pending.get(event.event_id, (None, None))[0]
+                if not await self.on_release(event):
+                    # Still pending (and staged): the next poll reports the release again
+                    logger.warning(f"⚠️ SCHEDULER: Release post failed for {event.event_id}, will retry")
+                    continue
+                # Stored only once posted, so a failed post is reported again next scrape
+                self.scraper.event_store.acknowledge(change)
+                self._unschedule(event.event_id)
+                posted += 1
+                self._record_latency(scheduled)
+            elif change.change_type == EVENT_ACTUAL_REVISED:
+                self.scraper.event_store.acknowledge(change)  # Revisions are not posted
+            elif change.change_type in (EVENT_FORECAST_REVISED, EVENT_PREVIOUS_REVISED) \
+                    and event.event_id in self.pending:
+                # Restage so the pre-built message carries the revised values
+                self._schedule(event.event_id, self.pending[event.event_id][0], event)
+            elif change.change_type == EVENT_NEW and self.on_upcoming and not event.actual:
+                await self.on_upcoming(event)
+        return posted
+
+    def _record_latency(self, scheduled: Optional[datetime]):
+        """Track release-to-post latency for scheduled releases"""
+        self.stats['releases_posted'] += 1
+        if scheduled is None:
+            return
+        latency = (datetime.now(timezone.utc) - scheduled).total_seconds()
+        self.stats['last_latency_seconds'] = latency
+        self.stats['max_latency_seconds'] = max(self.stats['max_latency_seconds'], latency)
+        logger.info(f"⚡ SCHEDULER: Release posted {latency:.1f}s after scheduled time")
+
+    def _next_release_group(self) -> Optional[Tuple[datetime, List[str]]]:
+        """Earliest pending release time and all event_ids scheduled at that time"""
+        if not self.pending:
+            return None
+        next_time = min(release_time for release_time, _ in self.pending.values())
+        event_ids = [event_id for event_id, (release_time, _) in self.pending.items() if release_time == next_time]
+        return next_time, event_ids
+
+    async def _poll_until_released(self, release_time: datetime, event_ids: List[str]):
+        """Tight conditional-GET polling until every event in the group has an actual value"""
+        deadline = release_time + timedelta(seconds=self.poll_timeout)
+        logger.info(f"⚡ SCHEDULER: Polling for {len(event_ids)} release(s) at {release_time.strftime('%H:%M')} UTC")
+
+        while self.running and any(event_id in self.pending for event_id in event_ids):
+            if datetime.now(timezone.utc) > deadline:
+                for event_id in event_ids:
+                    if self._unschedule(event_id):
+                        logger.warning(f"⏰ SCHEDULER: No actual value within {self.poll_timeout}s for {event_id}")
+                return
+
+            self.stats['polls'] += 1
+            changes = await self.scraper.poll_calendar_changes()
+            await self._dispatch_changes(changes)
+
+            await asyncio.sleep(self.poll_interval)
+
+    async def run(self):
+        """Main scheduler loop"""
+        self.running = True
+        next_refresh = datetime.now(timezone.utc)
+
+        while self.running:
+            try:
+                now = datetime.now(timezone.utc)
+                if now >= next_refresh:
+                    await self.refresh_schedule()
+                    next_refresh = now + timedelta(seconds=self.refresh_interval)
+
+                group = self._next_release_group()
+                wake_time = next_refresh
+                if group:
+                    wake_time = min(wake_time, group[0] - timedelta(seconds=self.lead_seconds))
+
+                sleep_seconds = (wake_time - datetime.now(timezone.utc)).total_seconds()
+                if sleep_seconds > 0:
+                    logger.debug(f"📅 SCHEDULER: Sleeping {sleep_seconds:.0f}s")
+                    await asyncio.sleep(sleep_seconds)
+
+                # Woke up for a release rather than a refresh
+                if group and datetime.now(timezone.utc) >= group[0] - timedelta(seconds=self.lead_seconds):
+                    await self._poll_until_released(*group)
+
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"💥 Error in economic release scheduler: {e}")
+                await asyncio.sleep(60)  # Wait 1 minute before retry
+
+    def stop(self):
+        """Stop the scheduler loop"""
+        self.running = False
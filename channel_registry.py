@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+Channel registry
+Each channel declares its language, sections, filters and formatter; one ingest
+(fetch, filter, translate) fans every article out to all channels that want it
+"""
+import json
+import logging
+import os
+from dataclasses import dataclass, field
+from typing import Iterator, List, Optional, Set
+
+from article_features import get_features
+
+logger = logging.getLogger(__name__)
+
+LANGUAGES = ('ar', 'en')
+FORMATTERS = ('enhanced', 'headline')  # enhanced: CryptoArabicFormatter layout, headline: title + footer
+
+
+@dataclass
+class Channel:
+    """One Telegram chat and what it wants to receive"""
+    name: str
+    chat_id: str
+    language: str = 'ar'
+    formatter: str = 'enhanced'
+    sections: List[str] = field(default_factory=list)          # Section substrings to accept (empty = all)
+    exclude_sections: List[str] = field(default_factory=list)  # Section substrings to reject
+    labels: List[str] = field(default_factory=list)            # Keyword-matcher labels, any must match (empty = all)
+    primary: bool = False                                      # Gets startup/economic messages, keeps legacy seen IDs
+
+    def __post_init__(self):
+        self.chat_id = str(self.chat_id)
+        self.sections = [section.upper() for section in self.sections]
+        self.exclude_sections = [section.upper() for section in self.exclude_sections]
+        if self.language not in LANGUAGES:
+            raise ValueError(f"Channel {self.name}: unsupported language {self.language!r}")
+        if self.formatter not in FORMATTERS:
+            raise ValueError(f"Channel {self.name}: unknown formatter {self.formatter!r}")
+
+    def accepts(self, article) -> bool:
+        """True if the article matches this channel's sections and filters"""
+        section = (getattr(article, 'section', '') or '').upper()
+        if self.sections and not any(wanted in section for wanted in self.sections):
+            return False
+        if any(excluded in section for excluded in self.exclude_sections):
+            return False
+
+        features = get_features(article)
+        if self.labels and not any(features.has(label) for label in self.labels):
+            return False
+        # Only Arabic can be translated into; English channels skip Arabic-source articles
+        if self.language == 'en' and features.is_arabic():
+            return False
+        return True
+
+    def seen_key(self, article_id: str) -> str:
+        """Database key marking an article as posted here (primary keeps the bare article ID)"""
+        return article_id if self.primary else f"{article_id}@{self.name}"
+
+
+class ChannelRegistry:
+    """All channels served from one ingest"""
+
+    def __init__(self, channels: List[Channel]):
+        if not channels:
+            raise ValueError("At least one channel is required")
+        if not any(channel.primary for channel in channels):
+            channels[0].primary = True
+        self.channels = channels
+
+    def __iter__(self) -> Iterator[Channel]:
+        return iter(self.channels)
+
+    def __len__(self) -> int:
+        return len(self.channels)
+
+    @property
+    def primary(self) -> Channel:
+        """Channel for startup and economic calendar messages"""
+        return next(channel for channel in self.channels if channel.primary)
+
+    def get(self, name: str) -> Optional[Channel]:
+        """Channel by name, or None"""
+        return next((channel for channel in self.channels if channel.name == name), None)
+
+    def languages(self) -> Set[str]:
+        """Target languages across all channels"""
+        return {channel.language for channel in self.channels}
+
+    def targets(self, article) -> List[Channel]:
+        """Channels whose filters accept the article"""
+        return [channel for channel in self.channels if channel.accepts(article)]
+
+
+def load_channels(path: str, default_chat_id: str, default_language: str = 'ar') -> ChannelRegistry:
+    """
+    Channels from a JSON list of Channel fields, e.g.
+    [{"name": "arabic", "chat_id": "-100...", "language": "ar"},
+     {"name": "english", "chat_id": "-100...", "language": "en", "formatter": "headline", "labels": ["context:crypto"]}]
+    Without the file, the single TELEGRAM_CHANNEL_ID channel in the configured language
+    """
+    if path and os.path.exists(path):
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                channels = [Channel(**entry) for entry in json.load(f)]
+            registry = ChannelRegistry(channels)
+            logger.info(f"📡 Loaded {len(registry)} channels from {path}: "
+                        + ", ".join(f"{channel.name} ({channel.language})" for channel in registry))
+            return registry
+        except (OSError, ValueError, TypeError) as e:
+            logger.error(f"Invalid channel file {path}, using TELEGRAM_CHANNEL_ID only: {e}")
+
+    formatter = 'enhanced' if default_language == 'ar' else 'headline'
+    return ChannelRegistry([Channel('default', default_chat_id, default_language, formatter, primary=True)])
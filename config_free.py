@@ -15,12 +15,17 @@ class Config:
     # Telegram Configuration (ONLY REQUIRED)
     TELEGRAM_BOT_TOKEN = os.getenv('TELEGRAM_BOT_TOKEN', '7452324631:AAHFMFgb5s2Ef5YRTRDNxFNcb4ik-ETz_Tc')
     TELEGRAM_CHANNEL_ID = os.getenv('TELEGRAM_CHANNEL_ID', '--1001870604395')
+    CHANNELS_FILE = os.getenv('CHANNELS_FILE', 'channels.json')  # Optional channel list (language, sections, filters); falls back to TELEGRAM_CHANNEL_ID
     
     # AI TRANSLATION WITH GROQ (FREE API)
     USE_AI_TRANSLATION = True   # Enable Groq API for better Arabic translation
     GROQ_API_KEY = os.getenv('GROQ_API_KEY', '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')  # Free Groq API key
+    GROQ_REQUESTS_PER_MINUTE = int(os.getenv('GROQ_REQUESTS_PER_MINUTE', '30'))      # Free tier RPM for the translation model
+    GROQ_TOKENS_PER_MINUTE = int(os.getenv('GROQ_TOKENS_PER_MINUTE', '6000'))         # Free tier TPM for the translation model
+    AI_MARKET_ANALYSIS = os.getenv('AI_MARKET_ANALYSIS', 'true').lower() == 'true'   # Translation + market impact in one Groq call
+    GROQ_MAX_QUEUE_WAIT = float(os.getenv('GROQ_MAX_QUEUE_WAIT', '30'))               # Seconds to wait for budget before using Google
     ENABLE_ARABIC = True        # Enable/disable Arabic translation (True=Arabic, False=English only)
-    USE_IMAGES = False         # FREE: No images, text only
+    USE_IMAGES = os.getenv('USE_IMAGES', 'false').lower() == 'true'  # Photos for articles with a valid image (text only by default)
     
     # Not needed for free version
     OPENAI_API_KEY = ''
@@ -101,6 +106,13 @@ class Config:
     MAX_ARTICLES_PER_SCRAPE = int(os.getenv('MAX_ARTICLES_PER_SCRAPE', '8'))   # Increased for better coverage
     MAX_ECONOMIC_EVENTS = int(os.getenv('MAX_ECONOMIC_EVENTS', '5'))           # More economic events
     
+    # Economic calendar release scheduler (disabled by default per user request)
+    ENABLE_ECONOMIC_CALENDAR = os.getenv('ENABLE_ECONOMIC_CALENDAR', 'False').lower() == 'true'
+    ECONOMIC_RELEASE_LEAD_SECONDS = int(os.getenv('ECONOMIC_RELEASE_LEAD_SECONDS', '20'))        # Wake up this early before a release
+    ECONOMIC_RELEASE_POLL_SECONDS = float(os.getenv('ECONOMIC_RELEASE_POLL_SECONDS', '3'))       # Poll interval around release time
+    ECONOMIC_RELEASE_POLL_TIMEOUT = int(os.getenv('ECONOMIC_RELEASE_POLL_TIMEOUT', '900'))       # Give up 15 min after scheduled time
+    ECONOMIC_SCHEDULE_REFRESH_SECONDS = int(os.getenv('ECONOMIC_SCHEDULE_REFRESH_SECONDS', '3600'))  # Full calendar rescrape
+    
     # Request Headers
     REQUEST_HEADERS = {
         'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
@@ -120,11 +132,71 @@ class Config:
     # Database Settings - Production optimized for better performance
     DATABASE_FILE = os.getenv('DATABASE_FILE', 'production_seen_articles.json')
     MAX_DATABASE_SIZE = int(os.getenv('MAX_DATABASE_SIZE', '3000'))  # Increased for better performance
+    ECONOMIC_EVENTS_FILE = os.getenv('ECONOMIC_EVENTS_FILE', 'economic_events.json')  # Economic calendar event store
+    
+    # Translation cache (memory LRU + SQLite on disk)
+    TRANSLATION_CACHE_FILE = os.getenv('TRANSLATION_CACHE_FILE', 'translation_cache.db')
+    TRANSLATION_CACHE_SIZE = int(os.getenv('TRANSLATION_CACHE_SIZE', '500'))               # Entries kept in memory
+    TRANSLATION_CACHE_TTL_HOURS = float(os.getenv('TRANSLATION_CACHE_TTL_HOURS', '72'))     # Entries older than this are re-translated
+    TRANSLATION_BATCH_SIZE = int(os.getenv('TRANSLATION_BATCH_SIZE', '10'))                 # Headlines per Groq batch request
+    GOOGLE_TRANSLATE_CONCURRENCY = int(os.getenv('GOOGLE_TRANSLATE_CONCURRENCY', '2'))      # Worker threads for the Google fallback
+    GOOGLE_TRANSLATE_TIMEOUT = float(os.getenv('GOOGLE_TRANSLATE_TIMEOUT', '10'))           # Seconds per Google call
+    
+    # 📖 GLOSSARY: Templated headlines are translated locally, LLM output is post-edited with the same terms
+    GLOSSARY_FAST_PATH = os.getenv('GLOSSARY_FAST_PATH', 'true').lower() == 'true'
+    GLOSSARY_ARABIC_DIGITS = os.getenv('GLOSSARY_ARABIC_DIGITS', 'false').lower() == 'true'  # ٠-٩ instead of 0-9
+    
+    # 🏁 HEDGED TRANSLATION: Start Google if Groq has not answered within its usual latency
+    HEDGED_TRANSLATION = os.getenv('HEDGED_TRANSLATION', 'true').lower() == 'true'
+    HEDGE_PERCENTILE = float(os.getenv('HEDGE_PERCENTILE', '0.9'))                          # Groq latency percentile that triggers the hedge
+    HEDGE_DELAY_SECONDS = float(os.getenv('HEDGE_DELAY_SECONDS', '3'))                      # Threshold until enough Groq samples exist
+    HEDGE_MIN_SAMPLES = int(os.getenv('HEDGE_MIN_SAMPLES', '20'))                           # Groq calls needed before using the percentile
+    
+    # Learned relevance filter (train with: python relevance_model.py)
+    RELEVANCE_MODEL_FILE = os.getenv('RELEVANCE_MODEL_FILE', 'relevance_model.json')        # Skipped if the file does not exist
+    RELEVANCE_REJECTS_FILE = os.getenv('RELEVANCE_REJECTS_FILE', 'rejected_articles.json')  # Labeled rejects (negatives)
+    RELEVANCE_THRESHOLD = float(os.getenv('RELEVANCE_THRESHOLD', '0.5'))                    # Minimum probability to post
     
     # Rate Limiting - Anti-ban optimization
-    MESSAGE_DELAY_SECONDS = int(os.getenv('MESSAGE_DELAY_SECONDS', '6'))  # Slower to avoid Telegram limits
+    TELEGRAM_CHAT_MESSAGES_PER_MINUTE = float(os.getenv('TELEGRAM_CHAT_MESSAGES_PER_MINUTE', '20'))  # Telegram's per-channel limit
+    TELEGRAM_CHAT_BURST = float(os.getenv('TELEGRAM_CHAT_BURST', '1'))                               # Messages a channel may get back to back
+    TELEGRAM_GLOBAL_MESSAGES_PER_SECOND = float(os.getenv('TELEGRAM_GLOBAL_MESSAGES_PER_SECOND', '30'))  # Telegram's bot-wide limit
+    TELEGRAM_MAX_FLOOD_WAIT_SECONDS = float(os.getenv('TELEGRAM_MAX_FLOOD_WAIT_SECONDS', '300'))      # Total 429 retry_after one message may wait before it fails
     MAX_RETRIES = int(os.getenv('MAX_RETRIES', '2'))  # Reduced retries to save resources
-    
+    FETCH_RETRY_DELAY_SECONDS = float(os.getenv('FETCH_RETRY_DELAY_SECONDS', '10'))  # Pause between fetch attempts of one source
+    CYCLE_DEADLINE_SECONDS = float(os.getenv('CYCLE_DEADLINE_SECONDS', '90'))        # ⏰ Fetch budget per news cycle; slower sources are cancelled and retried next cycle
+
+    # 🏭 PIPELINE: filter → translate → format → send stages joined by bounded queues
+    PIPELINE_FETCH_QUEUE_SIZE = int(os.getenv('PIPELINE_FETCH_QUEUE_SIZE', '2'))            # Fetched batches waiting for the filter (fetching pauses when full)
+    PIPELINE_QUEUE_SIZE = int(os.getenv('PIPELINE_QUEUE_SIZE', '20'))                       # Articles waiting between later stages
+    PIPELINE_TRANSLATE_WORKERS = int(os.getenv('PIPELINE_TRANSLATE_WORKERS', '2'))          # Concurrent translation batches
+    PIPELINE_SEND_WORKERS = int(os.getenv('PIPELINE_SEND_WORKERS', '1'))                    # 1 keeps posts in pipeline order (more are safe via the send journal)
+    
+    # 🧾 SEND JOURNAL: Every post is reserved before sending and settled as sent/failed (no double posts)
+    SEND_JOURNAL_FILE = os.getenv('SEND_JOURNAL_FILE', 'send_journal.db')
+    SEND_JOURNAL_STALE_SECONDS = float(os.getenv('SEND_JOURNAL_STALE_SECONDS', '600'))       # Reservation age after which an unverifiable sender counts as dead
+    SEND_JOURNAL_RETRY_UNCONFIRMED = os.getenv('SEND_JOURNAL_RETRY_UNCONFIRMED', 'false').lower() == 'true'  # Resend crash-interrupted posts (may duplicate)
+    
+    # 📤 OUTBOX: Formatted posts are written to disk until sent, and resumed first after a restart
+    OUTBOX_FILE = os.getenv('OUTBOX_FILE', 'outbox.db')
+    OUTBOX_MAX_AGE_HOURS = float(os.getenv('OUTBOX_MAX_AGE_HOURS', '6'))  # Unsent posts older than this are dropped on startup
+    
+    # ⚡ POST-THEN-EDIT: Post the headline before translation finishes, edit the full message in afterwards
+    POST_THEN_EDIT = os.getenv('POST_THEN_EDIT', 'false').lower() == 'true'
+    POST_THEN_EDIT_BREAKING_ONLY = os.getenv('POST_THEN_EDIT_BREAKING_ONLY', 'true').lower() == 'true'  # Routine news waits for the translation
+    
+    # 📰 DIGEST: When the send backlog exceeds what the rate limit drains in time, coalesce lower-priority headlines
+    DIGEST_MODE = os.getenv('DIGEST_MODE', 'false').lower() == 'true'  # Opt-in: also raises the per-scrape cap below
+    DIGEST_LATENCY_TARGET_SECONDS = float(os.getenv('DIGEST_LATENCY_TARGET_SECONDS', '60'))  # Backlog beyond this much send time goes into digests
+    DIGEST_MAX_ARTICLES_PER_SCRAPE = int(os.getenv('DIGEST_MAX_ARTICLES_PER_SCRAPE', '30'))  # Replaces MAX_ARTICLES_PER_SCRAPE in digest mode
+    
+    # 📸 IMAGES (USE_IMAGES): Image URLs are validated with a cached HEAD check before sendPhoto, bad ones go out as text
+    IMAGE_CHECK_TIMEOUT = float(os.getenv('IMAGE_CHECK_TIMEOUT', '3'))        # Seconds per HEAD check
+    IMAGE_CHECK_CONCURRENCY = int(os.getenv('IMAGE_CHECK_CONCURRENCY', '8'))  # Parallel HEAD checks
+    IMAGE_CACHE_SIZE = int(os.getenv('IMAGE_CACHE_SIZE', '1000'))             # URLs kept in the validation cache
+    IMAGE_CACHE_TTL_HOURS = float(os.getenv('IMAGE_CACHE_TTL_HOURS', '6'))    # Re-check a URL after this long
+    IMAGE_MEDIA_GROUPS = os.getenv('IMAGE_MEDIA_GROUPS', 'false').lower() == 'true'  # Bursts of photo posts go out as one sendMediaGroup album
+
     # Memory optimization settings - Performance mode
     ENABLE_MEMORY_OPTIMIZATION = True
     MAX_MEMORY_CACHE_SIZE = 150  # Increased cache for better performance (400MB RAM)
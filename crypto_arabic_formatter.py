@@ -4,15 +4,119 @@ Enhanced Arabic formatter for crypto and financial news
 Creates detailed market analysis format like professional trading channels
 """
 import re
+import html
 import logging
-from typing import Dict, Optional, List
+from dataclasses import dataclass, field
+from typing import Dict, Optional, List, Tuple
 from datetime import datetime, timezone
 import asyncio
 
 from config_free import Config
+from keyword_matcher import keyword_matcher
+from article_features import get_features
+from telegram_sender import TELEGRAM_MESSAGE_LIMIT
 
 logger = logging.getLogger(__name__)
 
+# Headlines in a digest are cut to this length so one item can never overflow a message
+DIGEST_HEADLINE_CHARS = 300
+
+# Crypto asset keywords, checked in order (first asset with a match wins)
+CRYPTO_ASSET_KEYWORDS = {
+    'bitcoin': ['bitcoin', 'btc', 'بيتكوين'],
+    'ethereum': ['ethereum', 'eth', 'إيثريوم'],
+    'crypto_general': ['crypto', 'cryptocurrency', 'altcoin', 'العملات المشفرة']
+}
+
+# Market sentiment indicators
+POSITIVE_WORDS = [
+    'rise', 'up', 'gain', 'high', 'surge', 'boost', 'strong', 'growth',
+    'bullish', 'rally', 'increase', 'record', 'all-time high', 'ath'
+]
+NEGATIVE_WORDS = [
+    'fall', 'down', 'drop', 'decline', 'crash', 'dump', 'weak', 'loss',
+    'bearish', 'decrease', 'low', 'correction', 'sell-off', 'plunge'
+]
+
+for _asset, _keywords in CRYPTO_ASSET_KEYWORDS.items():
+    keyword_matcher.add_keywords(f'asset:{_asset}', _keywords)
+keyword_matcher.add_keywords('sentiment:positive', POSITIVE_WORDS)
+keyword_matcher.add_keywords('sentiment:negative', NEGATIVE_WORDS)
+
+# Strip value suffixes and separators like M, K, B, %, ',' before comparing numbers
+NON_NUMERIC_PATTERN = re.compile(r'[^\d.-]')
+
+# Indicator keywords -> which way is good for USD (checked in order, so
+# 'unemployment' must come before 'employment')
+USD_IMPACT_RULES = [
+    (('unemployment',), 'lower'),
+    (('payroll', 'jobs', 'employment'), 'higher'),
+    (('pmi',), 'higher'),
+    (('cpi', 'inflation', 'ppi'), 'band'),  # Meeting expectations is positive
+]
+INFLATION_BAND = 0.2
+
+
+def clean_number(val) -> Optional[float]:
+    """Convert a calendar value like '3.5%' or '150K' to float, None if not numeric"""
+    if not val:
+        return None
+    try:
+        return float(NON_NUMERIC_PATTERN.sub('', str(val)))
+    except (TypeError, ValueError):
+        return None
+
+
+def get_usd_impact_rule(indicator: str) -> Optional[str]:
+    """Direction rule for an indicator name, None if we have no rule for it"""
+    indicator = indicator.lower()
+    for keywords, direction in USD_IMPACT_RULES:
+        if any(keyword in indicator for keyword in keywords):
+            return direction
+    return None
+
+
+def classify_usd_impact(direction: Optional[str], actual_num: Optional[float],
+                        forecast_num: Optional[float], previous_num: Optional[float]) -> Optional[str]:
+    """Compare actual against forecast (or previous) using a direction rule"""
+    if not direction or not actual_num:
+        return None
+
+    if direction == 'band':
+        if forecast_num:
+            return 'positive' if abs(actual_num - forecast_num) < INFLATION_BAND else 'negative'
+        return None
+
+    reference = forecast_num or previous_num
+    if not reference or actual_num == reference:
+        return None  # Exactly as expected
+    if direction == 'higher':
+        return 'positive' if actual_num > reference else 'negative'
+    return 'positive' if actual_num < reference else 'negative'
+
+
+@dataclass
+class StagedEconomicRelease:
+    """
+    Release message built before the event, with only the actual value left to fill
+    Everything but the actual value and the result line is known ahead of time
+    """
+    event_id: str
+    head: str  # Header, country, event name, previous/estimate lines, current label
+    tails: Dict[str, str] = field(default_factory=dict)  # impact -> separator, result line, footer
+    direction: Optional[str] = None
+    forecast_num: Optional[float] = None
+    previous_num: Optional[float] = None
+
+    def classify(self, actual: str) -> str:
+        """USD impact of an actual value, 'neutral' when no rule applies"""
+        impact = classify_usd_impact(self.direction, clean_number(actual), self.forecast_num, self.previous_num)
+        return impact or 'neutral'
+
+    def render(self, actual: str) -> str:
+        """Final message: precomputed head + actual value + precomputed tail"""
+        return f"{self.head}{actual}\n{self.tails[self.classify(actual)]}"
+
 class CryptoArabicFormatter:
     """Enhanced Arabic formatter for crypto-focused financial news"""
     
@@ -79,10 +183,18 @@ class CryptoArabicFormatter:
                 'ar': "أمريكا",
                 'en': "America"
             },
+            'market_impact': {
+                'ar': "التأثير المتوقع:",
+                'en': "Expected impact:"
+            },
             'breaking_news': {
                 'ar': "عاجل:",
                 'en': "Breaking:"
             },
+            'news_digest': {
+                'ar': "ملخص الأخبار:",
+                'en': "News digest:"
+            },
             'follow_us_updates': {
                 'ar': "<a href=\"https://t.me/crypto0omazen\">🚀 انضم لقناة التوصيات</a>\n<a href=\"https://t.me/dr0chart_news\">📰 انضم لقناة الاخبار</a>",
                 'en': "Follow us for updates : <a href=\"https://t.me/news_crypto_911\">@news_crypto_911</a>"
@@ -112,6 +224,7 @@ class CryptoArabicFormatter:
             'economic_data': '📋',
             'fed': '🏦',
             'important': '⚡',
+            'digest': '📰',
         }
         
         # Enhanced economic data terms in Arabic (matching TradingView style)
@@ -175,59 +288,57 @@ class CryptoArabicFormatter:
             'neutral': 'تأثير محايد على الأسواق'
         }
     
-    def get_text(self, key: str) -> str:
+    def get_text(self, key: str, language: Optional[str] = None) -> str:
         """
-        Get translated text based on current language setting
+        Get translated text for a language ('ar'/'en', default: current language setting)
         """
         if key not in self.translations:
             logger.warning(f"Translation key '{key}' not found")
             return key
         
-        lang = 'ar' if Config.ENABLE_ARABIC else 'en'
+        lang = language or ('ar' if Config.ENABLE_ARABIC else 'en')
         return self.translations[key].get(lang, key)
     
+    def _get_event_emoji(self, event_name_arabic: str) -> str:
+        """Choose emoji based on economic event type"""
+        if 'بطالة' in event_name_arabic:
+            return "💼"  # Briefcase for unemployment
+        elif 'وظائف' in event_name_arabic or 'توظيف' in event_name_arabic:
+            return "🏢"  # Office building for jobs
+        elif 'تضخم' in event_name_arabic or 'أسعار المستهلك' in event_name_arabic:
+            return "📊"  # Chart for inflation
+        elif 'مشتريات' in event_name_arabic:
+            return "🏭"  # Factory for PMI
+        elif 'فائدة' in event_name_arabic:
+            return "🏦"  # Bank for interest rates
+        elif 'تجزئة' in event_name_arabic:
+            return "🛍️"  # Shopping for retail
+        else:
+            return "📈"  # Default economic chart
+    
     # NOTE: This method has been replaced by investing_scraper.py economic calendar functionality
     # Keeping for backward compatibility only
     
-    def detect_crypto_asset(self, title: str, summary: str = "") -> str:
+    def detect_crypto_asset(self, title: str, summary: str = "", features=None) -> str:
         """
         Detect which crypto asset is the main focus
         """
-        content = f"{title} {summary}".lower()
-        
-        crypto_assets = {
-            'bitcoin': ['bitcoin', 'btc', 'بيتكوين'],
-            'ethereum': ['ethereum', 'eth', 'إيثريوم'], 
-            'crypto_general': ['crypto', 'cryptocurrency', 'altcoin', 'العملات المشفرة']
-        }
+        matches = features.matches if features else keyword_matcher.scan(title, summary)
         
-        for asset, keywords in crypto_assets.items():
-            for keyword in keywords:
-                if keyword in content:
-                    return asset
+        for asset in CRYPTO_ASSET_KEYWORDS:
+            if matches.has(f'asset:{asset}'):
+                return asset
         
         return 'crypto_general'
     
-    def analyze_market_sentiment(self, title: str, summary: str = "") -> Dict:
+    def analyze_market_sentiment(self, title: str, summary: str = "", features=None) -> Dict:
         """
         Analyze market sentiment and direction from news content
         """
-        content = f"{title} {summary}".lower()
-        
-        # Positive indicators
-        positive_words = [
-            'rise', 'up', 'gain', 'high', 'surge', 'boost', 'strong', 'growth',
-            'bullish', 'rally', 'increase', 'record', 'all-time high', 'ath'
-        ]
+        matches = features.matches if features else keyword_matcher.scan(title, summary)
         
-        # Negative indicators  
-        negative_words = [
-            'fall', 'down', 'drop', 'decline', 'crash', 'dump', 'weak', 'loss',
-            'bearish', 'decrease', 'low', 'correction', 'sell-off', 'plunge'
-        ]
-        
-        positive_score = sum(1 for word in positive_words if word in content)
-        negative_score = sum(1 for word in negative_words if word in content)
+        positive_score = matches.count('sentiment:positive')
+        negative_score = matches.count('sentiment:negative')
         
         if positive_score > negative_score:
             return {
@@ -248,24 +359,27 @@ class CryptoArabicFormatter:
                 'direction': 'sideways'
             }
     
-    async def format_enhanced_arabic_news(self, article, translation: str, market_analysis: Dict) -> str:
+    async def format_enhanced_arabic_news(self, article, translation: str, market_analysis: Dict,
+                                          language: Optional[str] = None) -> str:
         """
         Create enhanced Arabic news format like professional trading channels
+        (language picks the label texts, default: current language setting)
         """
         try:
             # Detect crypto asset and sentiment
-            crypto_asset = self.detect_crypto_asset(article.title, getattr(article, 'summary', ''))
-            sentiment_analysis = self.analyze_market_sentiment(article.title, getattr(article, 'summary', ''))
+            features = get_features(article)
+            crypto_asset = self.detect_crypto_asset(article.title, features=features)
+            sentiment_analysis = self.analyze_market_sentiment(article.title, features=features)
             
             # Format as general crypto/market news (economic data now handled separately)
             return await self._format_crypto_market_news(
-                translation, crypto_asset, market_analysis, sentiment_analysis
+                translation, crypto_asset, market_analysis, sentiment_analysis, language
             )
                 
         except Exception as e:
             logger.error(f"Error in enhanced formatting: {e}")
             # Fallback to simple format
-            return await self._format_simple_news(translation, market_analysis)
+            return await self._format_simple_news(translation, market_analysis, language)
     
     async def format_economic_announcement(self, event_name_english: str, event_name_arabic: str, country_flag: str = "🇺🇸", event_time: str = None, is_today: bool = False, previous: str = None, forecast: str = None) -> str:
         """
@@ -278,20 +392,7 @@ class CryptoArabicFormatter:
             return None  # Don't send events that are not today
         
         # Enhanced emojis for different event types
-        if 'بطالة' in event_name_arabic:
-            emoji = "💼"  # Briefcase for unemployment
-        elif 'وظائف' in event_name_arabic or 'توظيف' in event_name_arabic:
-            emoji = "🏢"  # Office building for jobs
-        elif 'تضخم' in event_name_arabic or 'أسعار المستهلك' in event_name_arabic:
-            emoji = "📊"  # Chart for inflation
-        elif 'مشتريات' in event_name_arabic:
-            emoji = "🏭"  # Factory for PMI
-        elif 'فائدة' in event_name_arabic:
-            emoji = "🏦"  # Bank for interest rates
-        elif 'تجزئة' in event_name_arabic:
-            emoji = "🛍️"  # Shopping for retail
-        else:
-            emoji = "📈"  # Default economic chart
+        emoji = self._get_event_emoji(event_name_arabic)
         
         # Convert time to Saudi Arabia timezone if provided
         saudi_time = None
@@ -356,20 +457,7 @@ class CryptoArabicFormatter:
         message += f"{country} - {country_flag}\n"
         
         # Choose emoji based on event type for better visual context
-        if 'بطالة' in event_name_arabic:
-            event_emoji = "💼"  # Briefcase for unemployment
-        elif 'وظائف' in event_name_arabic or 'توظيف' in event_name_arabic:
-            event_emoji = "🏢"  # Office building for jobs
-        elif 'تضخم' in event_name_arabic or 'أسعار المستهلك' in event_name_arabic:
-            event_emoji = "📊"  # Chart for inflation
-        elif 'مشتريات' in event_name_arabic:
-            event_emoji = "🏭"  # Factory for PMI
-        elif 'فائدة' in event_name_arabic:
-            event_emoji = "🏦"  # Bank for interest rates
-        elif 'تجزئة' in event_name_arabic:
-            event_emoji = "🛍️"  # Shopping for retail
-        else:
-            event_emoji = "📈"  # Default economic chart
+        event_emoji = self._get_event_emoji(event_name_arabic)
             
         message += f"{event_emoji} {event_name_arabic}\n\n"
         
@@ -381,8 +469,14 @@ class CryptoArabicFormatter:
         if actual:
             message += f"{self.get_text('current')} {actual}\n"
         
+        message += self._format_release_tail(impact_analysis)
+        
+        return message
+    
+    def _format_release_tail(self, impact_analysis: str = None) -> str:
+        """Separator, result line and footer of a release message"""
         # Add separator line for better readability
-        message += "\n" + "➖" * 25 + "\n\n"
+        tail = "\n" + "➖" * 25 + "\n\n"
         
         # Result analysis with appropriate emoji based on impact
         if impact_analysis:
@@ -392,14 +486,45 @@ class CryptoArabicFormatter:
                 result_emoji = "❌"  # Red X for negative
             else:
                 result_emoji = "⚖️"  # Scale for neutral
-            message += f"{result_emoji} {self.get_text('result')} {impact_analysis}"
+            tail += f"{result_emoji} {self.get_text('result')} {impact_analysis}"
         else:
-            message += f"⚖️ {self.get_text('result')} {self.get_text('as_expected_for_usd')}"
+            tail += f"⚖️ {self.get_text('result')} {self.get_text('as_expected_for_usd')}"
         
         # Add footer for engagement
-        message += f"\n\n{self.get_text('follow_us_analysis')}"
+        tail += f"\n\n{self.get_text('follow_us_analysis')}"
         
-        return message
+        return tail
+    
+    def prepare_economic_release(self, event_id: str, event_name: str, event_name_arabic: str,
+                                 country: str, country_flag: str,
+                                 previous: str = None, forecast: str = None) -> StagedEconomicRelease:
+        """
+        Pre-stage a release message while the event is still upcoming
+        Produces the same text as format_economic_data_release once the actual is filled in
+        """
+        head = f"{self.get_text('released_now')}\n\n"
+        head += f"{country} - {country_flag}\n"
+        head += f"{self._get_event_emoji(event_name_arabic)} {event_name_arabic}\n\n"
+        if previous:
+            head += f"{self.get_text('previous_short')} {previous}\n"
+        if forecast:
+            head += f"{self.get_text('estimate')} {forecast}\n"
+        head += f"{self.get_text('current')} "
+        
+        tails = {
+            'positive': self._format_release_tail(self.get_text('positive_for_usd')),
+            'negative': self._format_release_tail(self.get_text('negative_for_usd')),
+            'neutral': self._format_release_tail(self.get_text('as_expected_for_usd')),
+        }
+        
+        return StagedEconomicRelease(
+            event_id=event_id,
+            head=head,
+            tails=tails,
+            direction=get_usd_impact_rule(event_name),
+            forecast_num=clean_number(forecast),
+            previous_num=clean_number(previous),
+        )
     
     async def _format_economic_data_release(self, translation: str, data: Dict, analysis: Dict, sentiment: Dict) -> str:
         """
@@ -462,75 +587,82 @@ class CryptoArabicFormatter:
         """
         Analyze USD impact based on economic indicator type and values
         """
-        indicator = data.get('indicator', '').lower()
-        
-        # Convert values to float for comparison (remove letters like M, K, %)
-        def clean_number(val):
-            if not val:
-                return None
-            try:
-                # Remove common suffixes and convert
-                clean_val = re.sub(r'[mkb%]', '', str(val).lower())
-                return float(clean_val)
-            except:
-                return None
-        
-        actual_num = clean_number(actual_val)
-        forecast_num = clean_number(forecast_val) 
-        previous_num = clean_number(previous_val)
-        
-        # Employment indicators (higher jobs = stronger USD)
-        if any(keyword in indicator for keyword in ['payroll', 'jobs', 'employment']):
-            if actual_num and forecast_num:
-                return 'positive' if actual_num > forecast_num else 'negative'
-            elif actual_num and previous_num:
-                return 'positive' if actual_num > previous_num else 'negative'
-        
-        # Unemployment (lower unemployment = stronger USD)
-        elif 'unemployment' in indicator:
-            if actual_num and forecast_num:
-                return 'positive' if actual_num < forecast_num else 'negative'
-            elif actual_num and previous_num:
-                return 'positive' if actual_num < previous_num else 'negative'
-                
-        # PMI (higher PMI = stronger USD)
-        elif 'pmi' in indicator:
-            if actual_num and forecast_num:
-                return 'positive' if actual_num > forecast_num else 'negative'
-            elif actual_num and previous_num:
-                return 'positive' if actual_num > previous_num else 'negative'
-        
-        # Inflation (moderate inflation good, too high or low bad)
-        elif any(keyword in indicator for keyword in ['cpi', 'inflation', 'ppi']):
-            if actual_num and forecast_num:
-                # This is complex, but generally meeting expectations is positive
-                return 'positive' if abs(actual_num - forecast_num) < 0.2 else 'negative'
+        direction = get_usd_impact_rule(data.get('indicator', ''))
+        impact = classify_usd_impact(direction, clean_number(actual_val),
+                                     clean_number(forecast_val), clean_number(previous_val))
+        if impact:
+            return impact
         
         # Default fallback based on sentiment
         return sentiment.get('sentiment', 'neutral') if sentiment.get('sentiment') in ['positive', 'negative'] else 'neutral'
     
-    async def _format_crypto_market_news(self, translation: str, asset: str, analysis: Dict, sentiment: Dict) -> str:
+    def _format_impact_line(self, analysis: Dict, language: Optional[str] = None) -> str:
+        """Impact line for AI market analysis (empty for the neutral default)"""
+        if not analysis or analysis.get('source') != 'ai':
+            return ""
+        
+        impact = analysis['impact']
+        strong = analysis.get('strength') == 'قوي'
+        if impact == 'إيجابي':
+            emoji = self.market_emojis['strong_positive' if strong else 'positive']
+        elif impact == 'سلبي':
+            emoji = self.market_emojis['strong_negative' if strong else 'negative']
+        else:
+            emoji = self.market_emojis['neutral']
+        
+        return f"{emoji} {self.get_text('market_impact', language)} {impact} على {analysis['currency']} ({analysis['strength']})\n\n"
+    
+    async def _format_crypto_market_news(self, translation: str, asset: str, analysis: Dict, sentiment: Dict,
+                                         language: Optional[str] = None) -> str:
         """
-        Format general crypto market news (NO impact analysis for non-economic news)
+        Format general crypto market news (impact line only when the AI analysed the article)
         """
         # Choose emoji based on asset
         asset_emoji = self.market_emojis.get(asset, self.market_emojis['crypto'])
         
-        # Build simple message without impact analysis
-        message = f"{self.market_emojis['breaking']} {self.get_text('breaking_news')} {asset_emoji}\n\n"
+        message = f"{self.market_emojis['breaking']} {self.get_text('breaking_news', language)} {asset_emoji}\n\n"
         message += f"{translation}\n\n"
-        message += f"{self.get_text('follow_us_updates')}"
+        message += self._format_impact_line(analysis, language)
+        message += f"{self.get_text('follow_us_updates', language)}"
         
         return message
     
-    async def _format_simple_news(self, translation: str, analysis: Dict) -> str:
+    async def _format_simple_news(self, translation: str, analysis: Dict, language: Optional[str] = None) -> str:
         """
         Simple fallback format
         """
-        message = f"{self.market_emojis['breaking']} {self.get_text('breaking_news')} {self.market_emojis['crypto']} {translation}\n\n"
-        message += f"{self.get_text('follow_us_updates')}"
+        message = f"{self.market_emojis['breaking']} {self.get_text('breaking_news', language)} {self.market_emojis['crypto']} {translation}\n\n"
+        message += f"{self.get_text('follow_us_updates', language)}"
         return message
 
+    def format_digest(self, headlines: List[Tuple[str, str]], language: Optional[str] = None,
+                      limit: int = TELEGRAM_MESSAGE_LIMIT) -> List[Tuple[str, int]]:
+        """
+        Coalesce (headline, link) pairs into multi-headline digest messages
+        Split so every message stays within Telegram's length limit; order is kept
+        Returns (message, number of headlines in it) pairs
+        """
+        header = f"{self.market_emojis['digest']} {self.get_text('news_digest', language)}\n\n"
+        footer = f"\n{self.get_text('follow_us_updates', language)}"
+        messages = []
+        lines: List[str] = []
+        size = len(header) + len(footer)
+        
+        for headline, link in headlines:
+            headline = html.escape(headline[:DIGEST_HEADLINE_CHARS])
+            line = (f"▪️ <a href=\"{html.escape(link, quote=True)}\">{headline}</a>\n" if link
+                    else f"▪️ {headline}\n")
+            if lines and size + len(line) > limit:
+                messages.append((header + ''.join(lines) + footer, len(lines)))
+                lines = []
+                size = len(header) + len(footer)
+            lines.append(line)
+            size += len(line)
+        
+        if lines:
+            messages.append((header + ''.join(lines) + footer, len(lines)))
+        return messages
+
 # Test function
 async def test_formatter():
     """Test the crypto Arabic formatter"""
@@ -0,0 +1,182 @@
+"""
+Persistent store for economic calendar events
+Diffs each calendar scrape against what we already know and reports only the changes
+"""
+import json
+import os
+from dataclasses import dataclass
+from datetime import datetime, timezone, timedelta
+from typing import Dict, Any, List, Optional
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Change types emitted by EconomicEventStore.apply()
+EVENT_NEW = 'new'
+EVENT_ACTUAL_RELEASED = 'actual_released'
+EVENT_ACTUAL_REVISED = 'actual_revised'
+EVENT_FORECAST_REVISED = 'forecast_revised'
+EVENT_PREVIOUS_REVISED = 'previous_revised'
+
+# Values the calendar uses for "nothing published yet"
+EMPTY_VALUES = {None, '', '--', 'TBD', '-'}
+
+# Stored field -> change type emitted when it changes on a known event
+# (schedule time is part of event_id, so a rescheduled event shows up as new)
+TRACKED_FIELDS = [
+    ('forecast', EVENT_FORECAST_REVISED),
+    ('previous', EVENT_PREVIOUS_REVISED),
+]
+
+
+@dataclass
+class EventChange:
+    """A single change detected for an economic event"""
+    change_type: str
+    event: Any  # EconomicEvent
+    old_value: Optional[str] = None
+    new_value: Optional[str] = None
+
+
+def _clean_value(value: Optional[str]) -> Optional[str]:
+    """Normalize empty calendar cells to None"""
+    if value in EMPTY_VALUES:
+        return None
+    return value.strip() if isinstance(value, str) else value
+
+
+class EconomicEventStore:
+    """Simple file-based store of economic events keyed by event_id"""
+
+    def __init__(self, db_file: str = "economic_events.json"):
+        self.db_file = db_file
+        self.events: Dict[str, Dict[str, Any]] = {}
+        self.load_store()
+
+    def load_store(self):
+        """Load known events from file"""
+        try:
+            if os.path.exists(self.db_file):
+                with open(self.db_file, 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+                    self.events = data.get('events', {})
+                    logger.info(f"Loaded {len(self.events)} economic events from store")
+            else:
+                logger.info("Economic event store not found, starting empty")
+        except Exception as e:
+            logger.error(f"Error loading economic event store: {e}")
+            self.events = {}
+
+    def save_store(self):
+        """Save known events to file"""
+        try:
+            data = {
+                'events': self.events,
+                'last_updated': datetime.now(timezone.utc).isoformat()
+            }
+
+            # Write to a temp file first so a crash never leaves a truncated store
+            tmp_file = f"{self.db_file}.tmp"
+            with open(tmp_file, 'w', encoding='utf-8') as f:
+                json.dump(data, f, indent=2, ensure_ascii=False)
+            os.replace(tmp_file, self.db_file)
+
+            logger.debug(f"Saved {len(self.events)} economic events to store")
+
+        except Exception as e:
+            logger.error(f"Error saving economic event store: {e}")
+
+    def get_event(self, event_id: str) -> Optional[Dict[str, Any]]:
+        """Get the stored record for an event"""
+        return self.events.get(event_id)
+
+    def apply(self, events: List[Any]) -> List[EventChange]:
+        """
+        Merge a fresh calendar scrape into the store
+        Returns only the deltas (new events, released actuals, revisions)
+        Actual values are stored only once acknowledge() is called, so an actual change
+        keeps being reported until it has been delivered
+        """
+        changes: List[EventChange] = []
+        now = datetime.now(timezone.utc).isoformat()
+
+        for event in events:
+            actual = _clean_value(event.actual)
+            record = self.events.get(event.event_id)
+
+            if record is None:
+                self.events[event.event_id] = {
+                    'event_name': event.event_name,
+                    'event_name_arabic': event.event_name_arabic,
+                    'country': event.country,
+                    'importance': event.importance,
+                    'event_date': getattr(event, 'event_date', ''),
+                    'time': event.time,
+                    'forecast': _clean_value(event.forecast),
+                    'previous': _clean_value(event.previous),
+                    'actual': None,  # Set by acknowledge()
+                    'first_seen': now,
+                    'updated_at': now,
+                }
+                changes.append(EventChange(EVENT_NEW, event))
+                # Events first seen after release still need their release post
+                if actual is not None:
+                    changes.append(EventChange(EVENT_ACTUAL_RELEASED, event, None, actual))
+                continue
+
+            record_changed = False
+
+            for field, change_type in TRACKED_FIELDS:
+                new_value = _clean_value(getattr(event, field))
+                old_value = record.get(field)
+                # A blank cell on a later scrape is not a revision
+                if new_value is not None and new_value != old_value:
+                    record[field] = new_value
+                    record_changed = True
+                    changes.append(EventChange(change_type, event, old_value, new_value))
+
+            old_actual = record.get('actual')
+            if actual is not None and actual != old_actual:
+                change_type = EVENT_ACTUAL_RELEASED if old_actual is None else EVENT_ACTUAL_REVISED
+                changes.append(EventChange(change_type, event, old_actual, actual))
+
+            if record_changed:
+                record['updated_at'] = now
+
+        if changes:
+            self.save_store()
+            logger.info(f"📅 Economic calendar: {len(changes)} changes detected "
+                        f"({', '.join(sorted(set(change.change_type for change in changes)))})")
+        else:
+            logger.debug("📅 Economic calendar: no changes since last scrape")
+
+        return changes
+
+    def acknowledge(self, change: EventChange):
+        """Record an actual value as delivered (it is not reported again)"""
+        if change.change_type not in (EVENT_ACTUAL_RELEASED, EVENT_ACTUAL_REVISED):
+            return
+        record = self.events.get(change.event.event_id)
+        if record is None or record.get('actual') == change.new_value:
+            return
+        record['actual'] = change.new_value
+        record['updated_at'] = datetime.now(timezone.utc).isoformat()
+        self.save_store()
+
+    def cleanup_old_events(self, max_age_days: int = 3):
+        """Remove events that were last updated more than max_age_days ago"""
+        cutoff = (datetime.now(timezone.utc) - timedelta(days=max_age_days)).isoformat()
+        stale_ids = [
+            event_id for event_id, record in self.events.items()
+            if record.get('updated_at', '') < cutoff
+        ]
+
+        if stale_ids:
+            for event_id in stale_ids:
+                del self.events[event_id]
+            self.save_store()
+            logger.info(f"Cleaned up economic event store, removed {len(stale_ids)} old events")
+
+    def get_event_count(self) -> int:
+        """Get total number of stored events"""
+        return len(self.events)
@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""
+Google Translate fallback that never blocks the event loop
+deep_translator is synchronous, so every call runs in a small dedicated thread pool with a timeout
+"""
+import asyncio
+import logging
+import re
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional
+
+from deep_translator import GoogleTranslator
+
+logger = logging.getLogger(__name__)
+
+MAX_TEXT_LENGTH = 800
+HTML_TAG_PATTERN = re.compile(r'<[^>]+>')
+
+
+def clean_text(text: str) -> str:
+    """Strip HTML and extra whitespace, cap length for the free endpoint"""
+    text = HTML_TAG_PATTERN.sub('', text)
+    text = ' '.join(text.split())
+    if len(text) > MAX_TEXT_LENGTH:
+        text = text[:MAX_TEXT_LENGTH] + "..."
+    return text
+
+
+class FallbackTranslator:
+    """Async wrapper around GoogleTranslator backed by a bounded executor"""
+
+    def __init__(self, source: str = 'en', target: str = 'ar', max_workers: int = 2, timeout: float = 10.0):
+        self.source = source
+        self.target = target
+        self.timeout = timeout
+        self.max_workers = max_workers
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='google-translate')
+        # One slot per worker thread, held until the thread finishes (even if its caller timed out)
+        self.semaphore = asyncio.Semaphore(max_workers)
+        # One GoogleTranslator per worker thread (it keeps per-request state)
+        self._local = threading.local()
+
+        self.stats = {'calls': 0, 'timeouts': 0, 'failures': 0}
+
+        # Fail fast at startup if the translator cannot be created
+        self._get_translator()
+
+    def _get_translator(self) -> GoogleTranslator:
+        """Thread-local GoogleTranslator instance"""
+        translator = getattr(self._local, 'translator', None)
+        if translator is None:
+            translator = GoogleTranslator(source=self.source, target=self.target)
+            self._local.translator = translator
+        return translator
+
+    def _translate_sync(self, text: str) -> str:
+        """Blocking single translation (worker thread)"""
+        return self._get_translator().translate(text)
+
+    def _translate_batch_sync(self, texts: List[str]) -> List[str]:
+        """Blocking batch translation (worker thread)"""
+        return self._get_translator().translate_batch(texts)
+
+    def _release(self, future: asyncio.Future):
+        """Free the slot of a finished pool call (its result may have been abandoned on timeout)"""
+        self.semaphore.release()
+        if not future.cancelled():
+            future.exception()  # Mark retrieved so abandoned failures are not logged as unhandled
+
+    async def _run(self, func, *args, timeout: float):
+        """
+        Run a blocking call in the pool with a timeout
+        The timeout covers only the call itself: waiting for a free thread does not eat into it,
+        and a timed-out call keeps its slot until the thread is really done
+        """
+        await self.semaphore.acquire()
+        self.stats['calls'] += 1
+        try:
+            future = asyncio.get_running_loop().run_in_executor(self.executor, func, *args)
+        except BaseException:
+            self.semaphore.release()
+            raise
+        future.add_done_callback(self._release)
+        try:
+            # Shielded: a timeout abandons the call but the slot follows the thread, not the caller
+            return await asyncio.wait_for(asyncio.shield(future), timeout)
+        except asyncio.TimeoutError:
+            self.stats['timeouts'] += 1
+            raise
+
+    async def translate(self, text: str) -> Optional[str]:
+        """Translate one text, None on failure or timeout"""
+        try:
+            return await self._run(self._translate_sync, clean_text(text), timeout=self.timeout)
+        except asyncio.TimeoutError:
+            logger.warning(f"Google translation timed out after {self.timeout}s")
+        except Exception as e:
+            self.stats['failures'] += 1
+            logger.error(f"Google translation failed: {e}")
+        return None
+
+    async def translate_batch(self, texts: List[str]) -> List[Optional[str]]:
+        """
+        Translate several texts using deep_translator's batch API
+        Texts are split across the pool's workers so chunks run concurrently
+        """
+        if not texts:
+            return []
+
+        cleaned = [clean_text(text) for text in texts]
+        chunk_size = -(-len(cleaned) // self.max_workers)  # Ceiling division
+        chunks = [cleaned[start:start + chunk_size] for start in range(0, len(cleaned), chunk_size)]
+
+        results = await asyncio.gather(
+            *(self._run(self._translate_batch_sync, chunk, timeout=self.timeout * len(chunk)) for chunk in chunks),
+            return_exceptions=True
+        )
+
+        translations: List[Optional[str]] = []
+        for chunk, result in zip(chunks, results):
+            if isinstance(result, BaseException):
+                if not isinstance(result, asyncio.TimeoutError):
+                    self.stats['failures'] += 1
+                logger.error(f"Google batch translation failed for {len(chunk)} items: {result!r}")
+                translations.extend([None] * len(chunk))
+            else:
+                translations.extend(result)
+        return translations
+
+    def close(self):
+        """Shut the worker pool down without waiting for stuck calls"""
+        self.executor.shutdown(wait=False)
@@ -4,49 +4,167 @@ FREE Arabic Financial News Bot
 No API keys required except Telegram Bot Token
 """
 import asyncio
-import aiohttp
 import logging
 import json
-import re
-from datetime import datetime, timezone, timedelta
-from typing import Optional, List, Dict, Any
-import pytz
+import time
+from datetime import datetime, timezone
+from typing import Optional, List, Dict, Any, Awaitable, Callable
 
 # Import enhanced modules
 from config_free import Config
-from deep_translator import GoogleTranslator
-from ai_translator import AITranslator
-from crypto_arabic_formatter import CryptoArabicFormatter
-from investing_scraper import InvestingNewsScraper, EconomicEvent
+from ai_translator import AITranslator, validate_analysis
+from groq_scheduler import GroqRequestScheduler, PRIORITY_BREAKING, PRIORITY_NORMAL
+from fallback_translator import FallbackTranslator
+from crypto_arabic_formatter import CryptoArabicFormatter, clean_number, get_usd_impact_rule, classify_usd_impact
+from investing_scraper import InvestingNewsScraper, EconomicEvent, ARABIC_EVENT_PATTERNS
+from calendar_scheduler import EconomicReleaseScheduler
 from rss_scraper import RSSNewsScraper
 from database import ArticleDatabase
 from error_handler import setup_logging
+from telegram_sender import TelegramSender, TELEGRAM_CAPTION_LIMIT, MEDIA_GROUP_LIMIT
+from channel_registry import Channel, load_channels
+from send_journal import SendJournal
+from outbox import Outbox, OutboxArticle, OutboxEntry
+from image_cache import ImageCache
+from publish_time import now_timestamp
+from keyword_matcher import keyword_matcher
+from article_features import arabic_ratio, get_features
+from relevance_model import load_relevance_model
+from translation_cache import TranslationCache, GOOGLE_MODEL
+from latency_histogram import LatencyHistogram
+from article_priority import rank_key
+from news_pipeline import NewsPipeline, PipelineItem, END_TO_END_BUCKETS
+from glossary_translator import GlossaryTranslator
 
 logger = logging.getLogger(__name__)
 
+# Market analysis used when no AI analysis is available for an article
+DEFAULT_MARKET_ANALYSIS = {'impact': 'محايد', 'currency': 'الدولار الأمريكي'}
+
+# RSS feeds stop this long before the cycle deadline, so the feeds that finished are merged before the cut
+FEED_DEADLINE_MARGIN_SECONDS = 1.0
+
+# ✅ EXPANDED FINANCIAL KEYWORDS: Comprehensive coverage for all financial content
+FINANCIAL_KEYWORDS = [
+    # Core Financial
+    'stock', 'share', 'market', 'trading', 'investor', 'investment', 'portfolio', 'dividend',
+    'earnings', 'revenue', 'profit', 'loss', 'ipo', 'merger', 'acquisition', 'buyback',
+    
+    # Economic Indicators  
+    'fed', 'federal reserve', 'interest rate', 'inflation', 'gdp', 'unemployment', 'job',
+    'consumer price', 'ppi', 'cpi', 'retail sales', 'housing', 'manufacturing',
+    
+    # Forex & Currencies
+    'dollar', 'euro', 'yen', 'pound', 'currency', 'forex', 'exchange rate', 'devaluation',
+    'central bank', 'monetary policy', 'quantitative easing',
+    
+    # Commodities & Energy
+    'oil', 'crude', 'gold', 'silver', 'copper', 'wheat', 'corn', 'natural gas', 'commodity',
+    'opec', 'energy', 'mining', 'metals', 'agriculture',
+    
+    # Crypto (additional)
+    'blockchain', 'defi', 'nft', 'stablecoin', 'altcoin', 'binance', 'coinbase',
+    
+    # 🔥 EXPANDED: Major Companies & Financial Terms
+    'apple', 'tesla', 'microsoft', 'google', 'amazon', 'meta', 'nvidia', 'berkshire',
+    'ceo', 'cfo', 'president', 'company', 'corporation', 'firm', 'business', 'financial',
+    'bank', 'banking', 'credit', 'loan', 'reserves', 'fund', 'finance', 'capital',
+    'imf', 'world bank', 'economic', 'economy', 'tariff', 'trade', 'export', 'import',
+    'sales', 'growth', 'decline', 'billion', 'million', 'lawsuit', 'jury', 'settlement',
+    'regulatory', 'regulation', 'policy', 'announcement', 'guidance', 'forecast'
+]
+
+# Crypto assets get flag priority over countries and commodities
+CRYPTO_FLAGS = ['₿', '🪙', '🔷', '🔸', '🔵', '⛓️', '🏗️', '🎨']
+
+keyword_matcher.add_keywords('relevance:crypto', Config.CRYPTO_KEYWORDS)
+keyword_matcher.add_keywords('relevance:financial', FINANCIAL_KEYWORDS)
+keyword_matcher.add_keywords('context:crypto', ['bitcoin', 'crypto*', 'ethereum'])
+
 class FreeArabicNewsBot:
     """Enhanced Arabic crypto news bot with AI translation"""
     
     def __init__(self):
         self.bot_token = Config.TELEGRAM_BOT_TOKEN
-        self.channel_id = Config.TELEGRAM_CHANNEL_ID
+        
+        # 📡 Channels fed from one ingest (primary gets startup and economic calendar messages)
+        self.channels = load_channels(Config.CHANNELS_FILE, Config.TELEGRAM_CHANNEL_ID,
+                                      'ar' if Config.ENABLE_ARABIC else 'en')
+        self.channel_id = self.channels.primary.chat_id
         self.base_url = f"https://api.telegram.org/bot{self.bot_token}"
+        
+        # 📤 Rate-aware send queue (token buckets per chat and global, one pooled session)
+        self.telegram = TelegramSender(
+            self.bot_token,
+            chat_rate=Config.TELEGRAM_CHAT_MESSAGES_PER_MINUTE / 60,
+            chat_burst=Config.TELEGRAM_CHAT_BURST,
+            global_rate=Config.TELEGRAM_GLOBAL_MESSAGES_PER_SECOND,
+            max_retries=Config.MAX_RETRIES,
+            max_flood_wait=Config.TELEGRAM_MAX_FLOOD_WAIT_SECONDS
+        )
         self.running = False
         
         # Initialize components
         self.scraper = InvestingNewsScraper()
         self.rss_scraper = RSSNewsScraper()  # NEW: RSS scraper for CoinDesk + Cointelegraph
         self.database = ArticleDatabase('production_seen_articles.json')  # Use production database
+        self.journal = SendJournal(Config.SEND_JOURNAL_FILE)  # 🧾 reserve → sent/failed, shared by all senders
+        self.outbox = Outbox(Config.OUTBOX_FILE, Config.OUTBOX_MAX_AGE_HOURS * 3600)  # 📤 formatted posts survive restarts
         self.formatter = CryptoArabicFormatter()
         
-        # Economic calendar DISABLED per user request
-        # self.pending_events = []
-        # self.last_calendar_check = None
+        # 📖 Glossary built from the curated event names and economic terms
+        self.glossary = GlossaryTranslator(
+            ARABIC_EVENT_PATTERNS,
+            self.scraper.economic_terms_arabic,
+            self.formatter.economic_terms,
+            arabic_digits=Config.GLOSSARY_ARABIC_DIGITS
+        )
+        
+        # Economic calendar scheduler (created by economic_release_task when enabled)
+        self.calendar_scheduler = None
+        # event_id -> StagedEconomicRelease for pending high-importance events
+        self.staged_releases = {}
+        
+        # 💾 Translation cache shared by Groq and Google translations
+        self.translation_cache = TranslationCache(
+            Config.TRANSLATION_CACHE_FILE,
+            Config.TRANSLATION_CACHE_SIZE,
+            Config.TRANSLATION_CACHE_TTL_HOURS * 3600
+        )
+        
+        # ⏱️ Per-provider translation latency (backs the hedging threshold)
+        self.translation_latency = {
+            'groq': LatencyHistogram('groq'),
+            GOOGLE_MODEL: LatencyHistogram(GOOGLE_MODEL),
+        }
+        
+        # 📸 Image URLs are validated (and cached) before they reach sendPhoto
+        self.images = ImageCache(
+            Config.IMAGE_CACHE_SIZE,
+            Config.IMAGE_CACHE_TTL_HOURS * 3600,
+            Config.IMAGE_CHECK_TIMEOUT,
+            Config.IMAGE_CHECK_CONCURRENCY
+        ) if Config.USE_IMAGES else None
+        
+        # 🏭 Staged pipeline: fetched batches flow through filter → translate → format → send
+        self.pipeline = self._build_pipeline()
+        self.in_flight_ids = set()  # Articles between the filter and the send stage
+        self._outbox_retry_task: Optional[asyncio.Task] = None  # 📤 Per-cycle requeue of failed outbox posts
+        self.cycle_deadline: Optional[float] = None  # ⏰ Event loop time by which this cycle's fetches must finish
+        self.publish_to_post_latency = LatencyHistogram('publish→post', END_TO_END_BUCKETS)    # First visible post
+        self.publish_to_edit_latency = LatencyHistogram('publish→edit', END_TO_END_BUCKETS)    # Post-then-edit: full message edited in
+        
+        # 🧠 Learned relevance filter (None until a model has been trained)
+        self.relevance_model = load_relevance_model(Config.RELEVANCE_MODEL_FILE, Config.RELEVANCE_THRESHOLD)
         
         # Initialize AI translator (FREE)
         if Config.USE_AI_TRANSLATION:
             try:
-                self.ai_translator = AITranslator(Config.GROQ_API_KEY)
+                self.ai_translator = AITranslator(
+                    Config.GROQ_API_KEY,
+                    scheduler=GroqRequestScheduler(Config.GROQ_REQUESTS_PER_MINUTE, Config.GROQ_TOKENS_PER_MINUTE),
+                    max_queue_wait=Config.GROQ_MAX_QUEUE_WAIT
+                )
                 logger.info("AI Translator initialized with Groq API (FREE)")
             except Exception as e:
                 logger.error(f"Failed to initialize AI translator: {e}")
@@ -54,9 +172,14 @@ class FreeArabicNewsBot:
         else:
             self.ai_translator = None
         
-        # Fallback Google Translator
+        # Fallback Google Translator (blocking library, runs in a bounded thread pool)
         try:
-            self.translator = GoogleTranslator(source='en', target='ar')
+            self.translator = FallbackTranslator(
+                source='en',
+                target='ar',
+                max_workers=Config.GOOGLE_TRANSLATE_CONCURRENCY,
+                timeout=Config.GOOGLE_TRANSLATE_TIMEOUT
+            )
             logger.info("Google Translator initialized as fallback")
         except Exception as e:
             logger.error(f"Failed to initialize Google translator: {e}")
@@ -78,6 +201,7 @@ class FreeArabicNewsBot:
             # Commodities
             'oil': '🛢️', 'gold': '🥇', 'silver': '🥈', 'copper': '🟫',
         }
+        keyword_matcher.add_keywords('flag', self.country_flags)
         
         # 🕐 CONDITIONAL: Set timezone based on SCRAPING_MODE
         # if Config.SCRAPING_MODE == 2:  # CoinDesk only
@@ -97,24 +221,37 @@ class FreeArabicNewsBot:
             'messages_sent': 0,
             'articles_processed': 0,
             'translation_successes': 0,
+            'relevance_rejected': 0,
+            'hedges_started': 0,
+            'hedge_fallback_wins': 0,
+            'quick_posts': 0,
+            'messages_edited': 0,
+            'digest_messages': 0,
+            'digested_articles': 0,
+            'photos_sent': 0,
+            'image_fallbacks': 0,
+            'media_groups': 0,
+            'sources_timed_out': 0,
             'start_time': self.startup_time
         }
         
         logger.info("Free Arabic News Bot initialized")
     
-    def detect_country_flag(self, title: str, summary: str = "") -> str:
+    def detect_country_flag(self, title: str, summary: str = "", features=None) -> str:
         """Detect appropriate flag emoji based on content with crypto priority"""
-        content = f"{title} {summary}".lower()
+        matches = features.matches if features else keyword_matcher.scan(title, summary)
+        matched = matches.get('flag')
+        if not matched:
+            return '🪙'
         
         # Check crypto assets first (higher priority)
-        crypto_flags = ['₿', '🪙', '🔷', '🔸', '🔵', '⛓️', '🏗️', '🎨']
         for keyword, flag in self.country_flags.items():
-            if keyword in content and flag in crypto_flags:
+            if keyword in matched and flag in CRYPTO_FLAGS:
                 return flag
         
         # Check other flags
         for keyword, flag in self.country_flags.items():
-            if keyword in content:
+            if keyword in matched:
                 return flag
         
         return '🪙'  # Default to crypto emoji for crypto-focused bot
@@ -138,50 +275,13 @@ class FreeArabicNewsBot:
         else:
             return '📰'
     
-    def is_relevant_news(self, title: str, summary: str = "") -> bool:
+    def is_relevant_news(self, title: str, summary: str = "", features=None) -> bool:
         """🎯 STRICT: Financial markets content ONLY - NO world news, politics, or wars"""
-        content = f"{title} {summary}".lower()
+        matches = features.matches if features else keyword_matcher.scan(title, summary)
         
         # ✅ REQUIRED: Must contain financial market keywords
-        crypto_score = 0
-        for keyword in Config.CRYPTO_KEYWORDS:
-            if keyword.lower() in content:
-                crypto_score += 2  # Higher weight for crypto
-        
-        # ✅ EXPANDED FINANCIAL KEYWORDS: Comprehensive coverage for all financial content
-        financial_keywords = [
-            # Core Financial
-            'stock', 'share', 'market', 'trading', 'investor', 'investment', 'portfolio', 'dividend',
-            'earnings', 'revenue', 'profit', 'loss', 'ipo', 'merger', 'acquisition', 'buyback',
-            
-            # Economic Indicators  
-            'fed', 'federal reserve', 'interest rate', 'inflation', 'gdp', 'unemployment', 'job',
-            'consumer price', 'ppi', 'cpi', 'retail sales', 'housing', 'manufacturing',
-            
-            # Forex & Currencies
-            'dollar', 'euro', 'yen', 'pound', 'currency', 'forex', 'exchange rate', 'devaluation',
-            'central bank', 'monetary policy', 'quantitative easing',
-            
-            # Commodities & Energy
-            'oil', 'crude', 'gold', 'silver', 'copper', 'wheat', 'corn', 'natural gas', 'commodity',
-            'opec', 'energy', 'mining', 'metals', 'agriculture',
-            
-            # Crypto (additional)
-            'blockchain', 'defi', 'nft', 'stablecoin', 'altcoin', 'binance', 'coinbase',
-            
-            # 🔥 EXPANDED: Major Companies & Financial Terms
-            'apple', 'tesla', 'microsoft', 'google', 'amazon', 'meta', 'nvidia', 'berkshire',
-            'ceo', 'cfo', 'president', 'company', 'corporation', 'firm', 'business', 'financial',
-            'bank', 'banking', 'credit', 'loan', 'reserves', 'fund', 'finance', 'capital',
-            'imf', 'world bank', 'economic', 'economy', 'tariff', 'trade', 'export', 'import',
-            'sales', 'growth', 'decline', 'billion', 'million', 'lawsuit', 'jury', 'settlement',
-            'regulatory', 'regulation', 'policy', 'announcement', 'guidance', 'forecast'
-        ]
-        
-        financial_score = 0
-        for keyword in financial_keywords:
-            if keyword in content:
-                financial_score += 1
+        crypto_score = 2 * matches.count('relevance:crypto')  # Higher weight for crypto
+        financial_score = matches.count('relevance:financial')
         
         total_score = crypto_score + financial_score
         
@@ -194,29 +294,11 @@ class FreeArabicNewsBot:
             return False
     
     def is_text_arabic(self, text: str) -> bool:
-        """Check if text is already in Arabic"""
-        if not text:
-            return False
-        
-        # Count Arabic characters
-        arabic_chars = 0
-        total_letters = 0
-        
-        for char in text:
-            if char.isalpha():
-                total_letters += 1
-                # Arabic Unicode range: U+0600 to U+06FF
-                if '\u0600' <= char <= '\u06FF':
-                    arabic_chars += 1
-        
-        if total_letters == 0:
-            return False
-        
-        # If more than 70% of letters are Arabic, consider it Arabic text
-        arabic_ratio = arabic_chars / total_letters
-        return arabic_ratio > 0.7
+        """Check if text is already in Arabic (more than 70% of its letters)"""
+        return arabic_ratio(text) > 0.7 if text else False
 
-    async def translate_to_arabic(self, text: str, context: str = "crypto news") -> str:
+    async def translate_to_arabic(self, text: str, context: str = "crypto news",
+                                  priority: int = PRIORITY_NORMAL) -> str:
         """Translate text to Arabic using AI or Google Translate (optimized)"""
         
         # Skip translation for very short text
@@ -228,104 +310,301 @@ class FreeArabicNewsBot:
             logger.info("Text is already in Arabic, skipping translation")
             return text
         
+        # 📖 Templated headlines are answered instantly from the glossary
+        if Config.GLOSSARY_FAST_PATH:
+            translation = self.glossary.translate(text)
+            if translation:
+                self.stats['translation_successes'] += 1
+                logger.info("📖 Glossary translation (no API call)")
+                return translation
+        
         # Try AI translation first if available (with quick timeout)
         if self.ai_translator and self.ai_translator.client:
-            try:
-                translation = await self.ai_translator.translate_to_arabic(text, context)
-                if translation and translation != text:  # Check if translation actually worked
-                    self.stats['translation_successes'] += 1
-                    logger.info("AI translation successful")
+            # 💾 CACHE: Re-published headlines and retried sends reuse the earlier translation
+            cached = self.translation_cache.get(text, self.ai_translator.model,
+                                                f"{AITranslator.PROMPT_VERSION}:{context}")
+            if cached:
+                logger.info("💾 AI translation served from cache")
+                return cached
+            
+            # 🌐 Titles the prefetch already sent through its Google batch fallback
+            cached = self.translation_cache.get(text, GOOGLE_MODEL)
+            if cached:
+                logger.info("💾 Google translation served from cache")
+                return cached
+            
+            if Config.HEDGED_TRANSLATION and self.translator:
+                translation = await self._translate_hedged(text, context, priority)
+                if translation:
                     return translation
-            except Exception as e:
-                logger.warning(f"AI translation failed quickly, using Google fallback: {e}")
+                return text  # Both providers already tried
+            
+            translation = await self._translate_with_groq(text, context, priority)
+            if translation:
+                return translation
         
-        # Fallback to Google Translate (faster and more reliable)
+        # Fallback to Google Translate (thread pool with timeout, never blocks the event loop)
         if self.translator:
-            try:
-                # Clean text
-                text = re.sub(r'<[^>]+>', '', text)  # Remove HTML
-                text = re.sub(r'\s+', ' ', text).strip()  # Clean whitespace
-                
-                if len(text) > 800:
-                    text = text[:800] + "..."
-                
-                # Translate
-                translation = self.translator.translate(text)
-                self.stats['translation_successes'] += 1
-                logger.info("Google translation successful")
+            translation = await self._translate_with_google(text)
+            if translation:
                 return translation
-                
-            except Exception as e:
-                logger.error(f"Google translation failed: {e}")
         
         return text  # Return original if all translation fails
     
-    async def send_message(self, text: str, image_url: str = None) -> bool:
-        """Send message to Telegram channel with optional image"""
+    def _record_groq_latency(self, timing: Dict[str, float]) -> float:
+        """Groq latency since the request left the scheduler queue (0 if it was never sent)"""
+        if 'sent_at' not in timing:
+            return 0.0
+        latency = time.monotonic() - timing['sent_at']
+        self.translation_latency['groq'].record(latency)
+        return latency
+    
+    async def _translate_with_groq(self, text: str, context: str, priority: int = PRIORITY_NORMAL,
+                                   timing: Optional[Dict[str, float]] = None) -> Optional[str]:
+        """
+        Groq translation stored in the cache, None if it failed
+        Latency is measured from when the request was sent, so rate-limit queueing does not inflate it
+        """
+        timing = {} if timing is None else timing
         try:
-            # Add retry logic for network issues
-            for attempt in range(Config.MAX_RETRIES):
-                try:
-                    async with aiohttp.ClientSession() as session:
-                        # 📸 NEW: Send with image if available
-                        if image_url:
-                            # Send as photo with caption
-                            data = {
-                                'chat_id': self.channel_id,
-                                'photo': image_url,
-                                'caption': text,
-                                'parse_mode': 'HTML'
-                            }
-                            endpoint = f"{self.base_url}/sendPhoto"
-                            logger.info(f"📸 Sending message with image: {image_url}")
-                        else:
-                            # Send as text message with HTML parse mode
-                            data = {
-                                'chat_id': self.channel_id,
-                                'text': text,
-                                'parse_mode': 'HTML',
-                                'disable_web_page_preview': True
-                            }
-                            endpoint = f"{self.base_url}/sendMessage"
-                        
-                        async with session.post(endpoint, json=data, timeout=10) as response:
-                            if response.status == 200:
-                                result = await response.json()
-                                if result.get('ok'):
-                                    self.stats['messages_sent'] += 1
-                                    logger.info("Message sent successfully")
-                                    return True
-                                else:
-                                    logger.error(f"Telegram API error: {result.get('description')}")
-                                    return False
-                            else:
-                                logger.error(f"HTTP error: {response.status}")
-                                if attempt < Config.MAX_RETRIES - 1:
-                                    await asyncio.sleep(5)  # Wait before retry
-                                    continue
-                                return False
-                                
-                except aiohttp.ClientError as e:
-                    logger.error(f"Network error (attempt {attempt + 1}): {e}")
-                    if attempt < Config.MAX_RETRIES - 1:
-                        await asyncio.sleep(10)  # Wait longer for network issues
-                        continue
-                    return False
-            
-            return False
+            if Config.AI_MARKET_ANALYSIS:
+                # One call gives both the translation and the market impact
+                analysis = await self.ai_translator.translate_with_analysis(text, context, priority, timing)
+                latency = self._record_groq_latency(timing)
+                if analysis:
+                    self.stats['translation_successes'] += 1
+                    return self._store_analysis(text, context, analysis, latency)
+                return None
             
+            translation = await self.ai_translator.translate_to_arabic(text, context, priority, timing)
+            latency = self._record_groq_latency(timing)
+            if translation and translation != text:  # Check if translation actually worked
+                translation = self.glossary.post_edit(text, translation)
+                self.translation_cache.put(text, self.ai_translator.model,
+                                           f"{AITranslator.PROMPT_VERSION}:{context}", translation, latency)
+                self.stats['translation_successes'] += 1
+                logger.info("AI translation successful")
+                return translation
         except Exception as e:
-            logger.error(f"Error sending message: {e}")
+            logger.warning(f"AI translation failed quickly, using Google fallback: {e}")
+        return None
+    
+    async def _translate_with_google(self, text: str) -> Optional[str]:
+        """Google translation (cached or fresh), None if it failed"""
+        cached = self.translation_cache.get(text, GOOGLE_MODEL)
+        if cached:
+            logger.info("💾 Google translation served from cache")
+            return cached
+        
+        started = time.monotonic()
+        translation = await self.translator.translate(text)
+        latency = time.monotonic() - started
+        self.translation_latency[GOOGLE_MODEL].record(latency)
+        if translation:
+            translation = self.glossary.post_edit(text, translation)
+            self.translation_cache.put(text, GOOGLE_MODEL, '', translation, latency)
+            self.stats['translation_successes'] += 1
+            logger.info("Google translation successful")
+            return translation
+        return None
+    
+    def _store_analysis(self, text: str, context: str, analysis: Dict[str, str], latency: float) -> str:
+        """
+        Cache a combined answer: the translation for translate_to_arabic, the whole answer for get_market_analysis
+        Returns the (glossary post-edited) translation
+        """
+        analysis = {**analysis, 'translation': self.glossary.post_edit(text, analysis['translation'])}
+        model = self.ai_translator.model
+        self.translation_cache.put(text, model, f"{AITranslator.PROMPT_VERSION}:{context}",
+                                   analysis['translation'], latency)
+        self.translation_cache.put(text, model, f"{AITranslator.ANALYSIS_PROMPT_VERSION}:{context}",
+                                   json.dumps(analysis, ensure_ascii=False), latency)
+        return analysis['translation']
+    
+    def get_market_analysis(self, text: str, context: str) -> Dict[str, str]:
+        """AI market impact cached by the combined translation call, neutral default otherwise"""
+        if not (Config.AI_MARKET_ANALYSIS and self.ai_translator and self.ai_translator.client):
+            return DEFAULT_MARKET_ANALYSIS
+        cached = self.translation_cache.get(text, self.ai_translator.model,
+                                            f"{AITranslator.ANALYSIS_PROMPT_VERSION}:{context}")
+        try:
+            analysis = validate_analysis(json.loads(cached)) if cached else None
+        except ValueError:
+            analysis = None
+        if not analysis:
+            return DEFAULT_MARKET_ANALYSIS
+        return {
+            'impact': analysis['impact'],
+            'currency': analysis['asset'],
+            'strength': analysis['strength'],
+            'source': 'ai',
+        }
+    
+    def _get_hedge_delay(self) -> float:
+        """Seconds to wait for Groq before also starting Google"""
+        groq_latency = self.translation_latency['groq']
+        delay = groq_latency.percentile(Config.HEDGE_PERCENTILE) if groq_latency.count >= Config.HEDGE_MIN_SAMPLES else None
+        return Config.HEDGE_DELAY_SECONDS if delay is None else delay  # None: no samples yet
+    
+    async def _translate_hedged(self, text: str, context: str, priority: int = PRIORITY_NORMAL) -> Optional[str]:
+        """
+        Hedged request: Groq first, Google as well if Groq is slower than its usual p90
+        The first acceptable translation wins and the other request is cancelled
+        """
+        hedge_delay = self._get_hedge_delay()
+        timing: Dict[str, float] = {}
+        groq_task = asyncio.create_task(self._translate_with_groq(text, context, priority, timing))
+        done, _ = await asyncio.wait({groq_task}, timeout=hedge_delay)
+        if done:
+            # Groq answered in time; only a failed answer needs the fallback
+            return groq_task.result() or await self._translate_with_google(text)
+        
+        self.stats['hedges_started'] += 1
+        logger.info(f"🏁 Groq slower than {hedge_delay:.2f}s, racing Google fallback")
+        google_task = asyncio.create_task(self._translate_with_google(text))
+        pending = {groq_task, google_task}
+        
+        try:
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    translation = task.result()
+                    if translation:
+                        if task is google_task:
+                            self.stats['hedge_fallback_wins'] += 1
+                            if groq_task in pending:
+                                # Censored sample: Groq took at least this long, leaving it out would bias the percentile low
+                                self._record_groq_latency(timing)
+                        return translation
+            return None
+        finally:
+            # Cancel the loser (a Google call already in its worker thread finishes there unobserved)
+            for task in pending:
+                task.cancel()
+    
+    def _get_translation_context(self, article) -> str:
+        """Translation context hint for an article"""
+        return "cryptocurrency news" if get_features(article).has('context:crypto') else "financial news"
+    
+    def _get_translation_priority(self, article) -> int:
+        """Groq queue priority: breaking news is translated before routine headlines"""
+        features = get_features(article)
+        if features.has('breaking:urgent') or features.has('breaking:indicator'):
+            return PRIORITY_BREAKING
+        return PRIORITY_NORMAL
+    
+    async def prefetch_translations(self, articles: List):
+        """Batch-translate titles into the translation cache so per-article translation is a cache hit"""
+        ai_available = bool(self.ai_translator and self.ai_translator.client)
+        if not (ai_available or self.translator):
+            return
+        
+        # context -> titles still needing a translation -> Groq priority (deduplicated, order kept)
+        pending: Dict[str, Dict[str, int]] = {}
+        for article in articles:
+            title = article.title
+            if len(title.strip()) < 10 or get_features(article).is_title_arabic():
+                continue
+            if Config.GLOSSARY_FAST_PATH and self.glossary.translate(title, record_stats=False):
+                continue  # Translated locally, no API call needed
+            context = self._get_translation_context(article)
+            if ai_available and self.translation_cache.contains(
+                    title, self.ai_translator.model, f"{AITranslator.PROMPT_VERSION}:{context}"):
+                continue
+            if self.translation_cache.contains(title, GOOGLE_MODEL):
+                continue
+            titles = pending.setdefault(context, {})
+            titles[title] = min(titles.get(title, PRIORITY_NORMAL), self._get_translation_priority(article))
+        
+        # Titles Groq could not take (no client or the whole batch request failed)
+        fallback_titles: List[str] = []
+        
+        for context, title_priorities in pending.items():
+            # Breaking headlines go into the first batches (stable sort keeps feed order otherwise)
+            titles = sorted(title_priorities, key=title_priorities.get)
+            if not ai_available:
+                fallback_titles.extend(titles)
+                continue
+            
+            prompt_version = f"{AITranslator.PROMPT_VERSION}:{context}"
+            for start in range(0, len(titles), Config.TRANSLATION_BATCH_SIZE):
+                batch = titles[start:start + Config.TRANSLATION_BATCH_SIZE]
+                started = time.monotonic()
+                priority = min(title_priorities[title] for title in batch)
+                
+                if Config.AI_MARKET_ANALYSIS:
+                    analyses = await self.ai_translator.translate_batch_with_analysis(batch, context, priority)
+                    latency_per_item = (time.monotonic() - started) / len(batch)
+                    if not any(analyses):
+                        fallback_titles.extend(batch)
+                        continue
+                    # Items that broke the schema get a single combined call later
+                    for title, analysis in zip(batch, analyses):
+                        if analysis:
+                            self._store_analysis(title, context, analysis, latency_per_item)
+                    continue
+                
+                translations = await self.ai_translator.translate_batch(batch, context, priority)
+                latency_per_item = (time.monotonic() - started) / len(batch)
+                
+                if not any(translations):
+                    fallback_titles.extend(batch)
+                    continue
+                
+                # Items missing from the answer fall back to single translation later
+                for title, translation in zip(batch, translations):
+                    if translation and translation != title:
+                        self.translation_cache.put(title, self.ai_translator.model, prompt_version,
+                                                   self.glossary.post_edit(title, translation), latency_per_item)
+        
+        # Several titles need the fallback: one Google batch instead of N blocking calls
+        if self.translator and len(fallback_titles) > 1:
+            started = time.monotonic()
+            translations = await self.translator.translate_batch(fallback_titles)
+            latency_per_item = (time.monotonic() - started) / len(fallback_titles)
+            for title, translation in zip(fallback_titles, translations):
+                if translation:
+                    self.translation_cache.put(title, GOOGLE_MODEL, '',
+                                               self.glossary.post_edit(title, translation), latency_per_item)
+            logger.info(f"🌐 Google batch fallback: {sum(1 for t in translations if t)}/{len(fallback_titles)} titles")
+    
+    def _log_groq_budget(self):
+        """Log Groq RPM/TPM usage and warn before a quota runs out"""
+        groq_stats = self.ai_translator.scheduler.get_stats()
+        logger.info(f"🚦 Groq budget: {groq_stats['window_requests']}/{Config.GROQ_REQUESTS_PER_MINUTE} requests, "
+                    f"{groq_stats['window_tokens']}/{Config.GROQ_TOKENS_PER_MINUTE} tokens this minute, "
+                    f"{groq_stats['throttled']} throttled ({groq_stats['wait_seconds']:.1f}s waited), "
+                    f"{groq_stats['rate_limited']} rate limited")
+        for quota, seconds in groq_stats['forecast_exhaustion_seconds'].items():
+            if seconds is not None:
+                logger.warning(f"⚠️ Groq {quota} quota forecast to run out in {seconds:.0f}s at the current pace")
+    
+    async def send_message(self, text: str, image_url: str = None) -> bool:
+        """Send message to Telegram channel with optional image (queued, rate limited)"""
+        if image_url:
+            logger.info(f"📸 Sending message with image: {image_url}")
+        result = await self.telegram.send_message(self.channel_id, text, image_url)
+        return self._record_send(result)
+    
+    def _record_send(self, result) -> bool:
+        """Count a finished send"""
+        if result is None:
             return False
+        self.stats['messages_sent'] += 1
+        logger.info("Message sent successfully")
+        return True
     
-    async def format_arabic_message(self, article) -> str:
-        """🌍 FLEXIBLE: Format article as Arabic (if enabled) or English financial message"""
+    async def format_arabic_message(self, article, arabic_title: Optional[str] = None,
+                                    channel: Optional[Channel] = None) -> str:
+        """🌍 FLEXIBLE: Format article in the channel's language and layout (default: primary channel)"""
+        channel = channel or self.channels.primary
+        features = get_features(article)
         try:
-            # 🚀 CHECK CONFIG: Skip Arabic translation if disabled
-            if not Config.ENABLE_ARABIC:
+            # 🚀 CHECK CHANNEL: English channels get the source text without translation
+            if channel.language == 'en':
                 # 🇺🇸 ENGLISH ONLY MODE: Send news directly without translation
                 section_emoji = self._get_section_emoji(getattr(article, 'section', ''))
-                flag = self.detect_country_flag(article.title, getattr(article, 'summary', ''))
+                flag = self.detect_country_flag(article.title, features=features)
                 
                 message = f"🚨 {section_emoji} {flag} BREAKING: {article.title}\n\n"
                 
@@ -341,43 +620,71 @@ class FreeArabicNewsBot:
             
             # 🇸🇦 ARABIC MODE: Original Arabic translation flow
             # Determine context for better translation
-            content = f"{article.title} {getattr(article, 'summary', '')}"
-            context = "cryptocurrency news" if any(crypto in content.lower() for crypto in ['bitcoin', 'crypto', 'ethereum']) else "financial news"
+            context = self._get_translation_context(article)
+            
+            # Translate title to Arabic (unless the translate stage already did)
+            if arabic_title is None:
+                arabic_title = await self.translate_to_arabic(article.title, context,
+                                                              self._get_translation_priority(article))
             
-            # Translate title to Arabic
-            arabic_title = await self.translate_to_arabic(article.title, context)
+            # Market impact comes from the same Groq call as the translation (no extra API cost)
+            market_analysis = self.get_market_analysis(article.title, context)
             
-            # Simple market analysis (no API calls for efficiency)
-            market_analysis = {'impact': 'محايد', 'currency': 'الدولار الأمريكي'}
+            if channel.formatter == 'headline':
+                return self._format_arabic_headline(article, arabic_title, features)
             
             # Use enhanced formatter for professional-style messages
             message = await self.formatter.format_enhanced_arabic_news(
-                article, arabic_title, market_analysis
+                article, arabic_title, market_analysis, channel.language
             )
             
             return message
             
         except Exception as e:
             logger.error(f"💥 Error formatting message: {e}")
-            # 🛡️ ROBUST FALLBACK: Based on config setting
-            flag = self.detect_country_flag(article.title, getattr(article, 'summary', ''))
+            # 🛡️ ROBUST FALLBACK: Based on the channel language
+            flag = self.detect_country_flag(article.title, features=features)
             section_emoji = self._get_section_emoji(getattr(article, 'section', ''))
             
-            if Config.ENABLE_ARABIC:
-                return f"عاجل: {section_emoji} {flag} {article.title}\n\n <a href=\"https://t.me/crypto0omazen\">🚀 انضم لقناة التوصيات</a>\n<a href=\"https://t.me/dr0chart_news\">📰 انضم لقناة الاخبار</a>"
+            if channel.language == 'ar':
+                return self._format_arabic_headline(article, article.title, features)
             else:
                 return f"🚨 {section_emoji} {flag} BREAKING: {article.title}\n\nFollow us: <a href=\"https://t.me/news_crypto_911\">@news_crypto_911</a>"
     
-    async def post_articles(self, articles):
-        """Post filtered articles to Telegram channel"""
-        posted_count = 0
-        
+    def _format_arabic_headline(self, article, arabic_title: str, features=None) -> str:
+        """Plain Arabic headline with the channel links"""
+        flag = self.detect_country_flag(article.title, features=features)
+        section_emoji = self._get_section_emoji(getattr(article, 'section', ''))
+        return f"عاجل: {section_emoji} {flag} {arabic_title}\n\n <a href=\"https://t.me/crypto0omazen\">🚀 انضم لقناة التوصيات</a>\n<a href=\"https://t.me/dr0chart_news\">📰 انضم لقناة الاخبار</a>"
+    
+    def _pending_channels(self, article) -> List[Channel]:
+        """Channels that want the article and have not had it posted yet"""
+        pending = []
+        for channel in self.channels.targets(article):
+            key = channel.seen_key(article.article_id)
+            if not self.database.is_article_seen(key) and not self.journal.is_claimed(key):
+                pending.append(channel)
+        return pending
+    
+    def _max_articles_per_scrape(self) -> int:
+        """Articles taken per fetch (digest mode coalesces the surplus instead of dropping it)"""
+        return Config.DIGEST_MAX_ARTICLES_PER_SCRAPE if Config.DIGEST_MODE else Config.MAX_ARTICLES_PER_SCRAPE
+    
+    def select_articles(self, articles) -> List:
+        """Freshness window, learned relevance filter and per-scrape limit for one fetched batch"""
         # 🚀 CONDITIONAL TIMING: Apply different logic based on SCRAPING_MODE and source
         fresh_articles = []
+        
+        # Freshness bounds computed once per batch as epoch seconds
+        now_ts = now_timestamp()
+        news_min_ts = now_ts - 3 * 3600    # 3 hours tolerance for fresh news
+        crypto_min_ts = now_ts - 4 * 3600  # 4 hours for crypto
+        max_future_ts = now_ts + 30 * 60   # Allow 30 min future articles
+        
         for article in articles:
             try:
-                # 🚫 SKIP: Already seen articles (early filtering)
-                if self.database.is_article_seen(article.article_id):
+                # 🚫 SKIP: Articles every interested channel has seen, and articles still in the pipeline
+                if article.article_id in self.in_flight_ids or not self._pending_channels(article):
                     continue
                 
                 # 🎯 SMART FILTERING: Only apply advanced timezone filtering for specific modes
@@ -388,81 +695,36 @@ class FreeArabicNewsBot:
                     fresh_articles.append(article)
                     continue
                 
-                # Parse article publish time (for timezone filtering)
-                if hasattr(article, 'published') and article.published:
-                    # Handle different date formats
-                    published_time = None
-                    if isinstance(article.published, str):
-                        # Try different datetime formats (CoinDesk uses RFC 2822 format)
-                        date_formats = [
-                            '%a, %d %b %Y %H:%M:%S %z',    # CoinDesk format: "Sat, 02 Aug 2025 16:43:51 +0000"
-                            '%Y-%m-%d %H:%M:%S %z',
-                            '%Y-%m-%d %H:%M:%S', 
-                            '%Y-%m-%d %H:%M', 
-                            '%a, %d %b %Y %H:%M:%S %Z',
-                            '%a, %d %b %Y %H:%M:%S'         # Fallback without timezone
-                        ]
-                        
-                        for fmt in date_formats:
-                            try:
-                                published_time = datetime.strptime(article.published, fmt)
-                                if published_time.tzinfo is None:
-                                    published_time = published_time.replace(tzinfo=timezone.utc)
-                                logger.debug(f"🕒 Parsed time: {published_time} from format {fmt}")
-                                break
-                            except ValueError:
-                                continue
-                    
-                    # If we couldn't parse time, include the article (better safe than sorry)
-                    if published_time is None:
-                        fresh_articles.append(article)
-                        continue
-                    
-                    # ✅ FIXED: Saudi Arabia timezone filtering with proper tolerance
-                    saudi_tz = pytz.timezone('Asia/Riyadh')
-                    current_time = datetime.now(saudi_tz)
-                    time_tolerance = timedelta(hours=3)  # Increased tolerance for fresh news
-                    max_future_time = current_time + timedelta(minutes=30)  # Allow 30 min future articles
-                    
-                    # Convert published_time to Saudi timezone for comparison
-                    if published_time.tzinfo is not None:
-                        published_time_saudi = published_time.astimezone(saudi_tz)
-                    else:
-                        # If no timezone info, assume UTC and convert
-                        published_time = published_time.replace(tzinfo=timezone.utc)
-                        published_time_saudi = published_time.astimezone(saudi_tz)
-                    
-                    logger.debug(f"🇸🇦 TIME COMPARISON: Article: {published_time_saudi} vs Current: {current_time}")
-                    
-                    # ✅ SIMPLIFIED: Check if article is within the last 3 hours (fresh news)
-                    min_time = current_time - time_tolerance  # 3 hours back
-                    is_fresh = min_time <= published_time_saudi <= max_future_time
-                    
-                    # 🪙 Special handling for crypto news (more lenient)
-                    if hasattr(article, 'section') and 'CRYPTO' in article.section.upper():
-                        crypto_tolerance = timedelta(hours=4)  # 4 hours for crypto
-                        crypto_min_time = current_time - crypto_tolerance
-                        is_fresh = crypto_min_time <= published_time_saudi <= max_future_time
-                        logger.debug(f"🪙 CRYPTO: {article.title[:40]}... ({published_time_saudi.strftime('%H:%M')} KSA) - {'✅ FRESH' if is_fresh else '❌ OLD'}")
-                    else:
-                        logger.debug(f"📰 NEWS: {article.title[:40]}... ({published_time_saudi.strftime('%H:%M')} KSA) - {'✅ FRESH' if is_fresh else '❌ OLD'}")
-                    
-                    if is_fresh:
-                        fresh_articles.append(article)
-                        logger.debug(f"✅ FRESH: {article.title[:50]}... (published: {published_time_saudi})")
-                    elif published_time_saudi > max_future_time:
-                        logger.debug(f"🔮 FUTURE: Skipping {article.title[:50]}... (published: {published_time_saudi}) - too far in future")
-                    else:
-                        logger.debug(f"⏰ OLD: Skipping {article.title[:50]}... (published: {published_time_saudi})")
-                else:
-                    # No publish time, include it
+                # Publish time was parsed once at ingest (UTC epoch seconds, 0 = unknown)
+                published_ts = getattr(article, 'timestamp', 0)
+                
+                # If we couldn't parse time, include the article (better safe than sorry)
+                if not published_ts:
+                    fresh_articles.append(article)
+                    continue
+                
+                # ✅ Freshness window: last 3 hours (4 hours for crypto), up to 30 min in the future
+                is_crypto = hasattr(article, 'section') and 'CRYPTO' in article.section.upper()
+                min_ts = crypto_min_ts if is_crypto else news_min_ts
+                is_fresh = min_ts <= published_ts <= max_future_ts
+                
+                if is_fresh:
                     fresh_articles.append(article)
+                    logger.debug(f"✅ FRESH: {article.title[:50]}... ({(now_ts - published_ts) // 60} min old)")
+                elif published_ts > max_future_ts:
+                    logger.debug(f"🔮 FUTURE: Skipping {article.title[:50]}... - too far in future")
+                else:
+                    logger.debug(f"⏰ OLD: Skipping {article.title[:50]}... ({(now_ts - published_ts) // 60} min old)")
             except Exception as e:
                 logger.debug(f"Error parsing article time: {e}")
                 # If error parsing time, include the article
                 fresh_articles.append(article)
         
         relevant_articles = fresh_articles
+        
+        # 🧠 LEARNED FILTER: Score the whole batch at once, before any translation or send
+        if self.relevance_model and relevant_articles:
+            relevant_articles = self._filter_by_relevance_model(relevant_articles)
          
         # 📊 SMART LOGGING: Show different messages based on filtering mode
         if Config.SCRAPING_MODE == 1:
@@ -472,190 +734,599 @@ class FreeArabicNewsBot:
         else:
             logger.info(f"🌐 MIXED SOURCES: Using {len(relevant_articles)} articles from {len(articles)} total (conditional timing)")
         
+        # 🔥 Most important first, so the per-scrape limit cuts routine items rather than urgent ones
+        entered_at = time.monotonic()
+        relevant_articles.sort(key=lambda article: rank_key(article, entered_at))
+        
         # Limit to max articles per scrape
-        relevant_articles = relevant_articles[:Config.MAX_ARTICLES_PER_SCRAPE]
+        return relevant_articles[:self._max_articles_per_scrape()]
+    
+    def _build_pipeline(self) -> NewsPipeline:
+        """
+        filter → (quick_post) → translate → format → (image) → send, each stage with its own workers and bounded queue
+        Every queue after the filter is a heap: the highest-priority waiting article is always taken next
+        A batch lost to a stage error is released, so its articles can be fetched again
+        """
+        pipeline = NewsPipeline("news").add_stage('filter', self._filter_stage, queue_size=Config.PIPELINE_FETCH_QUEUE_SIZE)
+        if Config.POST_THEN_EDIT:
+            # ⚡ Headlines go out before the translation round-trip
+            pipeline.add_stage('quick_post', self._quick_post_stage, workers=Config.PIPELINE_SEND_WORKERS,
+                               queue_size=Config.PIPELINE_QUEUE_SIZE, priority=self._outgoing_rank, on_drop=self._release_items)
+        pipeline = (pipeline
+                    .add_stage('translate', self._translate_stage, workers=Config.PIPELINE_TRANSLATE_WORKERS,
+                               queue_size=Config.PIPELINE_QUEUE_SIZE, batch_size=Config.TRANSLATION_BATCH_SIZE,
+                               priority=self._outgoing_rank, on_drop=self._release_items)
+                    .add_stage('format', self._format_stage, queue_size=Config.PIPELINE_QUEUE_SIZE,
+                               priority=self._outgoing_rank, on_drop=self._release_items))
+        if self.images:
+            # 📸 Whatever queued up is validated concurrently (mostly cache hits from the filter's prefetch)
+            pipeline.add_stage('image', self._image_stage, queue_size=Config.PIPELINE_QUEUE_SIZE,
+                               batch_size=Config.PIPELINE_QUEUE_SIZE, priority=self._outgoing_rank, on_drop=self._release_items)
+        return (pipeline
+                .add_stage('send', self._send_stage, workers=Config.PIPELINE_SEND_WORKERS,
+                           queue_size=Config.PIPELINE_QUEUE_SIZE, priority=self._outgoing_rank, on_drop=self._release_items,
+                           # Digest mode looks at the whole queued backlog at once
+                           batch_size=Config.PIPELINE_QUEUE_SIZE if Config.DIGEST_MODE else 1))
+    
+    def _release_items(self, items):
+        """Forget articles a failed stage dropped: no longer in flight, nothing left in the outbox"""
+        for item in items:
+            self.outbox.remove(item.payload.article_id)
+            self.in_flight_ids.discard(item.payload.article_id)
+    
+    def _outgoing_rank(self, item) -> float:
+        """🔥 Heap key: breaking indicators, source weight, freshness and aging since the article entered the pipeline"""
+        return rank_key(item.payload, item.created_at)
+    
+    async def _filter_stage(self, batches):
+        """Split fetched batches into the articles worth translating"""
+        items = []
+        for batch in batches:
+            for article in self.select_articles(batch.payload):
+                if article.article_id in self.in_flight_ids:
+                    continue  # Same article twice in one batch
+                self.in_flight_ids.add(article.article_id)
+                item = batch.derive(article)
+                item.values['channels'] = self._pending_channels(article)
+                items.append(item)
+                if self.images:
+                    # Checked while the article is being translated
+                    self.images.prefetch(getattr(article, 'image_url', None))
+        return items
+    
+    async def _quick_post_stage(self, items):
+        """⚡ Post-then-edit: publish a minimal headline now, the send stage edits in the full message"""
+        for item in items:
+            article = item.payload
+            if Config.POST_THEN_EDIT_BREAKING_ONLY and self._get_translation_priority(article) != PRIORITY_BREAKING:
+                continue
+            # Arabic-source titles need no translation round-trip, English channels none at all
+            if get_features(article).is_title_arabic():
+                continue
+            channels = [channel for channel in item.values['channels']
+                        if channel.language == 'ar' and self._reserve(channel, article)]
+            if not channels:
+                continue
+            
+            # Glossary translation when the headline is templated, otherwise the source headline
+            headline = (self.glossary.translate(article.title) if Config.GLOSSARY_FAST_PATH else None) or article.title
+            message = self._format_arabic_headline(article, headline)
+            # Text only: no image fetch on the latency-critical path, and the edit stays a text edit
+            results = await asyncio.gather(*(
+                self.telegram.submit_message(channel.chat_id, message) for channel in channels
+            ), return_exceptions=True)
+            
+            quick_posts = {}
+            for channel, result in zip(channels, results):
+                if isinstance(result, Exception) or not self._record_send(result):
+                    self._mark_failed(channel, article, result)
+                    continue  # The send stage posts the full message normally
+                quick_posts[channel.name] = {'message_id': result.get('message_id'), 'text': message}
+                self._mark_posted(channel, article, result)
+            
+            if quick_posts:
+                item.values['quick_posts'] = quick_posts
+                self.stats['quick_posts'] += len(quick_posts)
+                self._record_publish_latency(self.publish_to_post_latency, article)
+                logger.info(f"⚡ Quick-posted headline to {', '.join(quick_posts)}: {article.title[:50]}...")
+        return items
+    
+    async def _translate_stage(self, items):
+        """Translate a micro-batch of titles once per target language (shared by all channels)"""
+        # Only Arabic is translated into; English channels post the source text
+        arabic_items = [item for item in items
+                        if any(channel.language == 'ar' for channel in item.values['channels'])]
+        if not arabic_items:
+            return items
+        
+        # 🌍 PREFETCH: Translate all titles of this micro-batch in as few Groq requests as possible
+        try:
+            await self.prefetch_translations([item.payload for item in arabic_items])
+        except Exception as e:
+            logger.error(f"Error prefetching translations: {e}")
         
-        for article in relevant_articles:
+        for item in arabic_items:
+            article = item.payload
             try:
-                # Check if already posted
-                if self.database.is_article_seen(article.article_id):
-                    continue
-                
-                self.stats['articles_processed'] += 1
-                
-                # Format Arabic message
-                message = await self.format_arabic_message(article)
-                
-                # Send message with image if available  
-                success = await self.send_message(message, article.image_url if hasattr(article, 'image_url') else None)
-                
-                if success:
-                    # Mark as seen in database
-                    self.database.mark_article_seen(
-                        article.article_id,
-                        article.title,
-                        article.link,
-                        getattr(article, 'published', datetime.now(pytz.timezone('Asia/Riyadh')).isoformat())
+                item.values['arabic_title'] = await self.translate_to_arabic(
+                    article.title, self._get_translation_context(article), self._get_translation_priority(article)
+                )
+            except Exception as e:
+                logger.error(f"Error translating article: {e}")  # Format stage retries the translation
+        return items
+    
+    async def _format_stage(self, items):
+        """Build each channel's message (once per language and layout)"""
+        for item in items:
+            self.stats['articles_processed'] += 1
+            by_layout: Dict[tuple, str] = {}
+            item.values['messages'] = {}
+            for channel in item.values['channels']:
+                layout = (channel.language, channel.formatter)
+                if layout not in by_layout:
+                    by_layout[layout] = await self.format_arabic_message(
+                        item.payload, item.values.get('arabic_title'), channel
                     )
-                    
-                    posted_count += 1
-                    logger.info(f"Posted Arabic article: {article.title[:50]}...")
-                    
-                    # Add delay between posts
-                    await asyncio.sleep(Config.MESSAGE_DELAY_SECONDS)
+                item.values['messages'][channel.name] = by_layout[layout]
+        
+        # 📤 Ready-to-send messages hit the disk before the sender sees them
+        self.outbox.put([entry for item in items for entry in self._outbox_entries(item)])
+        return items
+    
+    def _outbox_entries(self, item) -> List[OutboxEntry]:
+        """Outbox rows for a formatted item (one per target channel)"""
+        article = item.payload
+        stored = OutboxArticle(
+            article.article_id, article.title, getattr(article, 'link', '') or '',
+            getattr(article, 'published', '') or '', getattr(article, 'timestamp', 0) or 0,
+            getattr(article, 'section', '') or '', getattr(article, 'image_url', None)
+        )
+        quick_posts = item.values.get('quick_posts', {})
+        entries = []
+        for channel in item.values['channels']:
+            headline = item.values.get('arabic_title') if channel.language == 'ar' else None
+            quick_post = quick_posts.get(channel.name)
+            entries.append(OutboxEntry(
+                stored, channel.name, item.values['messages'][channel.name], headline or article.title,
+                quick_post['message_id'] if quick_post else None
+            ))
+        return entries
+    
+    def _resume_outbox(self) -> Optional[asyncio.Task]:
+        """
+        📤 Requeue unfinished outbox posts straight into the send stage: at startup whatever a
+        previous run left, on later cycles the sends and edits that failed
+        The send journal skips any that did go out before the restart
+        """
+        items: Dict[str, PipelineItem] = {}
+        for entry in self.outbox.load():
+            channel = self.channels.get(entry.channel)
+            if channel is None:
+                continue  # Channel removed from the registry since
+            if entry.article.article_id in self.in_flight_ids:
+                continue  # Still on its way through the pipeline
+            item = items.get(entry.article.article_id)
+            if item is None:
+                item = items[entry.article.article_id] = PipelineItem(entry.article)
+                item.values.update(channels=[], messages={}, quick_posts={})
+            item.values['channels'].append(channel)
+            item.values['messages'][channel.name] = entry.text
+            if channel.language == 'ar':
+                item.values['arabic_title'] = entry.headline
+            if entry.quick_message_id:
+                # Always edit after a restart (the quick text is not kept)
+                item.values['quick_posts'][channel.name] = {'message_id': entry.quick_message_id, 'text': None}
+        if not items:
+            return None
+        
+        # Claimed before the first fetch can admit the same articles again
+        self.in_flight_ids.update(items)
+        logger.info(f"📤 Resuming {len(items)} articles from the outbox")
+        
+        async def requeue():
+            pending = list(items.values())
+            try:
+                while pending:
+                    await self.pipeline.submit_to('image' if self.images else 'send', pending[0])
+                    pending.pop(0)
+            finally:
+                # Not handed over (cancelled or failed): unclaim so a later cycle retries them from the outbox
+                self.in_flight_ids.difference_update(item.payload.article_id for item in pending)
+        task = asyncio.create_task(requeue())
+        task.add_done_callback(self._log_resume_error)
+        return task
+    
+    @staticmethod
+    def _log_resume_error(task: asyncio.Task):
+        """Surface a failed outbox requeue (nothing awaits the task)"""
+        if not task.cancelled() and task.exception():
+            logger.error(f"💥 Outbox requeue failed: {task.exception()}")
+    
+    def _retry_outbox(self):
+        """📤 Requeue failed sends from the outbox, unless the previous requeue is still feeding the pipeline"""
+        if self._outbox_retry_task and not self._outbox_retry_task.done():
+            return
+        self._outbox_retry_task = self._resume_outbox()
+    
+    def _reserve(self, channel: Channel, article) -> bool:
+        """🧾 Claim the send of an article to a channel (False: sent or being sent elsewhere)"""
+        if self.journal.reserve(channel.seen_key(article.article_id), channel.chat_id):
+            return True
+        logger.info(f"🧾 Skipping {channel.name} send, already claimed: {article.title[:50]}...")
+        return False
+    
+    def _mark_failed(self, channel: Channel, article, error=None):
+        """Release a reservation after a failed send (retried on the next fetch)"""
+        self.journal.mark_failed(channel.seen_key(article.article_id), str(error or 'send failed'))
+    
+    def _mark_posted(self, channel: Channel, article, result=None):
+        """Mark an article as sent for one channel (journal first, then the seen database)"""
+        message_id = result.get('message_id') if isinstance(result, dict) else None
+        self.journal.mark_sent(channel.seen_key(article.article_id), message_id)
+        self.database.mark_article_seen(
+            channel.seen_key(article.article_id),
+            article.title,
+            article.link,
+            getattr(article, 'published', '') or datetime.now(timezone.utc).isoformat()
+        )
+    
+    def _record_publish_latency(self, histogram: LatencyHistogram, article):
+        """⏱️ Source publish time to now"""
+        published_ts = getattr(article, 'timestamp', 0)
+        if published_ts:
+            histogram.record(max(now_timestamp() - published_ts, 0))
+    
+    async def _image_stage(self, items):
+        """📸 Validate the batch's image URLs concurrently; articles without a usable one go out as text"""
+        valid = await self.images.validate_many(getattr(item.payload, 'image_url', None) for item in items)
+        for item in items:
+            item.values['image_url'] = valid.get(getattr(item.payload, 'image_url', None))
+        return items
+    
+    @staticmethod
+    def _photo_for(message: str, image_url: Optional[str]) -> Optional[str]:
+        """Image to send with a message (None when it would not fit in a caption)"""
+        return image_url if image_url and len(message) <= TELEGRAM_CAPTION_LIMIT else None
+    
+    async def _send_post(self, channel: Channel, message: str, image_url: Optional[str] = None):
+        """
+        Post one message; a photo Telegram refuses is resent as text right away (no retry round)
+        Other failures (network, flood control, server errors) return None without touching the image
+        """
+        if not image_url:
+            return await self.telegram.submit_message(channel.chat_id, message)
+        result, error = await self.telegram.send_message_with_error(channel.chat_id, message, image_url)
+        if result is not None:
+            self.stats['photos_sent'] += 1
+            return result
+        if not error.is_photo_rejected():
+            return None
+        logger.warning(f"📸 Telegram refused image, posting as text: {image_url}")
+        self.images.reject(image_url)
+        self.stats['image_fallbacks'] += 1
+        return await self.telegram.submit_message(channel.chat_id, message)
+    
+    def _plan_media_groups(self, items, skipped: set) -> Dict[str, List]:
+        """
+        📸 Channel name -> items to post as one album
+        Only for bursts: two or more photo posts for a channel in the same batch
+        """
+        if not (self.images and Config.IMAGE_MEDIA_GROUPS):
+            return {}
+        plan = {}
+        for channel in self.channels:
+            candidates = [item for item in items if channel in item.values['channels']
+                          and (channel.name, id(item)) not in skipped
+                          and channel.name not in item.values.get('quick_posts', {})
+                          and self._photo_for(item.values['messages'][channel.name], item.values.get('image_url'))]
+            if len(candidates) > 1:
+                plan[channel.name] = sorted(candidates, key=self._outgoing_rank)
+        return plan
+    
+    async def _send_media_groups(self, plan: Dict[str, List]) -> set:
+        """Send planned albums (text posts if an album is refused); returns IDs of articles posted"""
+        posted_ids = set()
+        for channel in self.channels:
+            items = [item for item in plan.get(channel.name, []) if self._reserve(channel, item.payload)]
+            for start in range(0, len(items), MEDIA_GROUP_LIMIT):
+                album = items[start:start + MEDIA_GROUP_LIMIT]
+                if len(album) > 1:
+                    results, error = await self.telegram.send_media_group_with_error(channel.chat_id, [
+                        (item.values['image_url'], item.values['messages'][channel.name]) for item in album
+                    ])
                 else:
-                    logger.error(f"Failed to post Arabic article: {article.title[:50]}...")
-                    
-            except Exception as e:
-                logger.error(f"Error posting Arabic article: {e}")
+                    results, error = None, None  # A lone leftover is just a photo post
+                
+                if results:
+                    self.stats['media_groups'] += 1
+                    self.stats['photos_sent'] += len(album)
+                    logger.info(f"📸 Album of {len(album)} posts sent to {channel.name}")
+                elif error and not error.is_photo_rejected():
+                    # Not the photos' fault: resending as text would only hit the same failure
+                    results = [None] * len(album)
+                else:
+                    if len(album) > 1:
+                        logger.warning(f"📸 Album of {len(album)} refused by {channel.name}, posting as text")
+                        self.stats['image_fallbacks'] += len(album)
+                    results = [await self._send_post(channel, item.values['messages'][channel.name],
+                                                     None if len(album) > 1 else item.values['image_url'])
+                               for item in album]
+                
+                for item, result in zip(album, results):
+                    if not self._record_send(result):
+                        self._mark_failed(channel, item.payload)
+                        self._keep_in_outbox(item, channel)
+                        continue
+                    self._mark_posted(channel, item.payload, result)
+                    self._record_publish_latency(self.publish_to_post_latency, item.payload)
+                    posted_ids.add(item.payload.article_id)
+        return posted_ids
+    
+    def _plan_digests(self, items) -> Dict[str, List]:
+        """
+        📰 Channel name -> items to coalesce into digest messages
+        Only when a channel's backlog (this batch, its Telegram queue and every article still on
+        its way from translation onwards) exceeds what its rate limit drains within the latency
+        target; the most urgent items still go out as full messages
+        """
+        if not Config.DIGEST_MODE:
+            return {}
+        budget = max(1, int(Config.DIGEST_LATENCY_TARGET_SECONDS * Config.TELEGRAM_CHAT_MESSAGES_PER_MINUTE / 60))
+        # Articles past the filter but not yet here (counted for every channel: an upper bound)
+        upstream = self.pipeline.backlog(after='filter')
+        
+        plan = {}
+        for channel in self.channels:
+            # Quick-posted articles only need their edit
+            candidates = [item for item in items if channel in item.values['channels']
+                          and channel.name not in item.values.get('quick_posts', {})]
+            queued = self.telegram.pending(channel.chat_id) + upstream
+            if len(candidates) + queued <= budget:
                 continue
+            # Full messages for the highest-priority items, one slot left for the digest itself
+            keep = max(budget - queued - 1, 0)
+            ranked = sorted(candidates, key=self._outgoing_rank)
+            if len(ranked) - keep > 1:
+                plan[channel.name] = ranked[keep:]
+        return plan
+    
+    async def _send_digests(self, plan: Dict[str, List]) -> set:
+        """Send planned digests; returns IDs of articles posted in at least one"""
+        posted_ids = set()
+        for channel in self.channels:
+            items = [item for item in plan.get(channel.name, []) if self._reserve(channel, item.payload)]
+            if not items:
+                continue
+            headlines = []
+            for item in items:
+                article = item.payload
+                headline = item.values.get('arabic_title') if channel.language == 'ar' else None
+                headlines.append((headline or article.title, getattr(article, 'link', '')))
+            
+            # Each digest message is all-or-nothing for the articles it carries
+            offset = 0
+            for message, count in self.formatter.format_digest(headlines, channel.language):
+                included = items[offset:offset + count]
+                offset += count
+                result = await self.telegram.send_message(channel.chat_id, message)
+                if not self._record_send(result):
+                    logger.error(f"Failed to send digest of {len(included)} articles to {channel.name}")
+                    for item in included:
+                        self._mark_failed(channel, item.payload)
+                        self._keep_in_outbox(item, channel)
+                    continue
+                for item in included:
+                    self._mark_posted(channel, item.payload, result)
+                    self._record_publish_latency(self.publish_to_post_latency, item.payload)
+                    posted_ids.add(item.payload.article_id)
+                self.stats['digest_messages'] += 1
+                self.stats['digested_articles'] += len(included)
+                logger.info(f"📰 Digest of {len(included)} headlines sent to {channel.name}")
+        return posted_ids
+    
+    async def _send_stage(self, items):
+        """Send to every target channel at once (per-chat queues, shared global limit), mark posted ones seen"""
+        posted = []
+        digest_plan = self._plan_digests(items)
+        digested = {(name, id(item)) for name, planned in digest_plan.items() for item in planned}
+        album_plan = self._plan_media_groups(items, digested)
+        grouped = {(name, id(item)) for name, planned in album_plan.items() for item in planned}
+        for item in items:
+            article = item.payload
+            # Validated by the image stage (absent = text only)
+            image_url = item.values.get('image_url')
+            quick_posts = item.values.get('quick_posts', {})
+            calls = []
+            for channel in item.values['channels']:
+                if (channel.name, id(item)) in digested or (channel.name, id(item)) in grouped:
+                    continue  # Goes out in this batch's digest or album
+                message = item.values['messages'][channel.name]
+                quick_post = quick_posts.get(channel.name)
+                if quick_post is None:
+                    if self._reserve(channel, article):
+                        calls.append((channel, False, self._send_post(channel, message, self._photo_for(message, image_url))))
+                elif message != quick_post['text']:
+                    # ⚡ Replace the quick headline with the full message
+                    calls.append((channel, True, self.telegram.submit_edit(
+                        channel.chat_id, quick_post['message_id'], message
+                    )))
+            results = await asyncio.gather(*(call for _, _, call in calls), return_exceptions=True)
+            
+            sent_to = []
+            edited = []
+            for (channel, is_edit, _), result in zip(calls, results):
+                if isinstance(result, Exception) or result is None:
+                    action = "edit" if is_edit else "post"
+                    logger.error(f"Failed to {action} article in {channel.name}: {article.title[:50]}..."
+                                 + (f" ({result})" if isinstance(result, Exception) else ""))
+                    if not is_edit:
+                        self._mark_failed(channel, article, result)
+                    # The entry stays, so the next cycle posts or edits again
+                    self._keep_in_outbox(item, channel)
+                    continue
+                if is_edit:
+                    edited.append(channel.name)
+                    continue
+                self._record_send(result)
+                self._mark_posted(channel, article, result)
+                sent_to.append(channel.name)
+            
+            if edited:
+                self.stats['messages_edited'] += len(edited)
+                self._record_publish_latency(self.publish_to_edit_latency, article)
+                logger.info(f"✏️ Edited full message into {', '.join(edited)}: {article.title[:50]}...")
+            if sent_to:
+                if not quick_posts:
+                    self._record_publish_latency(self.publish_to_post_latency, article)
+                logger.info(f"Posted article to {', '.join(sent_to)}: {article.title[:50]}...")
+            if sent_to or quick_posts:
+                posted.append(item)
         
-        return posted_count
+        grouped_ids = await self._send_digests(digest_plan) if digest_plan else set()
+        grouped_ids |= await self._send_media_groups(album_plan) if album_plan else set()
+        for item in items:
+            if item.payload.article_id in grouped_ids and item not in posted:
+                posted.append(item)
+            # Failed channels keep their outbox entry; unposted articles become eligible again on the next fetch
+            kept = item.values.get('outbox_kept', set())
+            for channel in item.values['channels']:
+                if channel.name not in kept:
+                    self.outbox.remove(item.payload.article_id, channel.name)
+            self.in_flight_ids.discard(item.payload.article_id)
+        return posted
     
-    # DISABLED: Economic calendar functionality removed per user request
-    async def check_economic_calendar_DISABLED(self):
-        """Check for upcoming and released economic events - DISABLED"""
-        return  # Economic calendar disabled
+    @staticmethod
+    def _keep_in_outbox(item, channel: Channel):
+        """📤 Leave a channel's outbox entry in place after a failed send or edit (retried next cycle)"""
+        item.values.setdefault('outbox_kept', set()).add(channel.name)
+    
+    def _filter_by_relevance_model(self, articles: List) -> List:
+        """Drop articles the learned classifier scores below threshold (one batch per cycle)"""
         try:
-            logger.info("Checking economic calendar...")
+            # Titles only: the model is trained on the titles of posted and rejected articles
+            probabilities = self.relevance_model.predict_proba([article.title for article in articles])
+        except Exception as e:
+            logger.error(f"Error scoring relevance batch: {e}")
+            return articles
+        
+        kept = []
+        for article, probability in zip(articles, probabilities):
+            if probability >= self.relevance_model.threshold:
+                kept.append(article)
+            else:
+                logger.debug(f"🧠 REJECTED ({probability:.2f}): {article.title[:50]}...")
+        
+        rejected = len(articles) - len(kept)
+        if rejected:
+            self.stats['relevance_rejected'] += rejected
+            logger.info(f"🧠 Relevance model: kept {len(kept)}/{len(articles)} articles")
+        return kept
+    
+    async def post_economic_release(self, event: EconomicEvent) -> bool:
+        """Post a "صدر الآن" message as soon as an event's actual value appears (True once it is out)"""
+        event_key = f"{event.event_id}_released"
+        if self.database.is_article_seen(event_key):
+            return True  # Already sent release message
+        
+        try:
+            # Kept until the event is unscheduled, so a failed post can reuse it
+            staged = self.staged_releases.get(event.event_id)
+            if staged:
+                # Pre-built message, only the actual value is filled in at publish time
+                message = staged.render(event.actual)
+            else:
+                message = await self.formatter.format_economic_data_release(
+                    event_name_arabic=event.event_name_arabic,
+                    country=self._get_event_country(event),
+                    country_flag=self.scraper.get_country_flag(event.country),
+                    previous=event.previous,
+                    forecast=event.forecast,
+                    actual=event.actual,
+                    impact_analysis=self._analyze_economic_impact(event)
+                )
+            return await self._send_economic_message(message, event, event_key)
             
-            # Get economic events
-            events = await self.scraper.scrape_economic_calendar()
+        except Exception as e:
+            logger.error(f"Error posting economic release: {e}")
+            return False
+    
+    def stage_economic_release(self, event: EconomicEvent):
+        """Pre-build the release message for a pending event so publishing only fills in the actual"""
+        self.staged_releases[event.event_id] = self.formatter.prepare_economic_release(
+            event_id=event.event_id,
+            event_name=event.event_name,
+            event_name_arabic=event.event_name_arabic,
+            country=self._get_event_country(event),
+            country_flag=self.scraper.get_country_flag(event.country),
+            previous=event.previous,
+            forecast=event.forecast
+        )
+        logger.debug(f"📝 Staged release message for {event.event_name}")
+    
+    def unstage_economic_release(self, event_id: str):
+        """Drop a staged release message (event no longer pending)"""
+        self.staged_releases.pop(event_id, None)
+    
+    def _get_event_country(self, event: EconomicEvent) -> str:
+        """Country label used in economic calendar messages"""
+        return "أمريكا" if "US" in event.country.upper() else event.country
+    
+    async def post_economic_announcement(self, event: EconomicEvent) -> bool:
+        """Post a "ترقبوا اليوم" message for a newly seen event scheduled for today"""
+        event_key = f"{event.event_id}_upcoming"
+        if self.database.is_article_seen(event_key):
+            return False  # Already sent upcoming message
+        
+        try:
+            # 📅 FILTER: Only announce events that are for today
+            if not self._filter_today_events([event]):
+                return False
             
-            # 📅 FILTER: Only process events that are relevant for today
-            today_events = self._filter_today_events(events)
-            logger.info(f"📅 Found {len(today_events)} events for today out of {len(events)} total")
+            message = await self.formatter.format_economic_announcement(
+                event_name_english=event.event_name,  # 🇬🇧 Original English title
+                event_name_arabic=event.event_name_arabic,  # 🇸🇦 Arabic translation
+                country_flag=self.scraper.get_country_flag(event.country),
+                event_time=event.time,
+                is_today=True,  # ✅ Already filtered to TODAY events
+                previous=event.previous,  # 📈 Previous value
+                forecast=event.forecast   # 🔮 Forecast value
+            )
+            if not message:
+                return False
+            return await self._send_economic_message(message, event, event_key)
             
-            for event in today_events:
-                try:
-                    # Create different keys for before/after event states with date
-                    current_date = datetime.now(timezone.utc).strftime('%Y-%m-%d')
-                    event_base_key = f"{event.event_name}_{event.time}_{event.country}_{current_date}"
-                    upcoming_key = f"{event_base_key}_upcoming"
-                    released_key = f"{event_base_key}_released"
-                    
-                    # Check if event is current (time-based logic)
-                    is_event_released = self._is_event_released(event)
-                    
-                    if is_event_released and event.actual and event.actual not in ["", "--", "TBD"]:
-                        # Event has been released with actual data - send "صدر الآن" message
-                        if self.database.is_article_seen(released_key):
-                            continue  # Already sent release message
-                            
-                        message = await self.formatter.format_economic_data_release(
-                            event_name_arabic=event.event_name_arabic,
-                            country="أمريكا" if "US" in event.country.upper() else event.country,
-                            country_flag=self.scraper.get_country_flag(event.country),
-                            previous=event.previous,
-                            forecast=event.forecast,
-                            actual=event.actual,
-                            impact_analysis=self._analyze_economic_impact(event)
-                        )
-                        event_key = released_key
-                        
-                    else:
-                        # Upcoming event - send "ترقبوا اليوم" message (ONLY if today)
-                        if self.database.is_article_seen(upcoming_key):
-                            continue  # Already sent upcoming message
-                        
-                        # 📅 CHECK: Only send if event is TODAY
-                        current_date = datetime.now(timezone.utc).date()
-                        is_today = True  # For simulated events, assume today
-                        
-                        # For real events, check if they're actually today
-                        if hasattr(event, 'event_date') and event.event_date:
-                            try:
-                                if isinstance(event.event_date, str):
-                                    event_date = datetime.strptime(event.event_date, '%Y-%m-%d').date()
-                                else:
-                                    event_date = event.event_date
-                                is_today = (event_date == current_date)
-                            except:
-                                is_today = True  # Default to today if can't parse
-                        
-                        message = await self.formatter.format_economic_announcement(
-                            event_name_english=event.event_name,  # 🇬🇧 Original English title
-                            event_name_arabic=event.event_name_arabic,  # 🇸🇦 Arabic translation
-                            country_flag=self.scraper.get_country_flag(event.country),
-                            event_time=event.time,
-                            is_today=is_today,  # ✅ Only show TODAY events
-                            previous=event.previous,  # 📈 Previous value
-                            forecast=event.forecast   # 🔮 Forecast value
-                        )
-                        
-                        # Skip if message is None (not today)
-                        if not message:
-                            continue
-                            
-                        event_key = upcoming_key
-                    
-                    # Send message with image if available
-                    success = await self.send_message(message, event.image_url if hasattr(event, 'image_url') else None)
-                    
-                    if success:
-                        # Mark as seen
-                        self.database.mark_article_seen(
-                            event_key,
-                            event.event_name,
-                            f"economic_calendar_{event.event_name}",
-                            datetime.now(timezone.utc).isoformat()
-                        )
-                        logger.info(f"Posted economic event: {event.event_name}")
-                        
-                        # Add delay between posts
-                        await asyncio.sleep(Config.MESSAGE_DELAY_SECONDS)
-                    
-                except Exception as e:
-                    logger.error(f"Error posting economic event: {e}")
-                    continue
-                    
         except Exception as e:
-            logger.error(f"Error checking economic calendar: {e}")
+            logger.error(f"Error posting economic announcement: {e}")
+            return False
+    
+    async def _send_economic_message(self, message: str, event: EconomicEvent, event_key: str) -> bool:
+        """Send an economic calendar message and mark it as seen"""
+        success = await self.send_message(message)
+        
+        if success:
+            self.database.mark_article_seen(
+                event_key,
+                event.event_name,
+                f"economic_calendar_{event.event_name}",
+                datetime.now(timezone.utc).isoformat()
+            )
+            logger.info(f"Posted economic event: {event.event_name}")
+        
+        return success
     
     def _analyze_economic_impact(self, event: EconomicEvent) -> str:
         """Analyze the impact of economic event on USD"""
         try:
-            if not event.actual or not event.forecast:
-                return "كما هو متوقع للدولار الأمريكي"
-            
-            # Clean and compare values
-            def clean_value(val):
-                if not val:
-                    return None
-                try:
-                    return float(re.sub(r'[^\d.-]', '', str(val)))
-                except:
-                    return None
-            
-            actual_val = clean_value(event.actual)
-            forecast_val = clean_value(event.forecast)
-            
-            if actual_val is None or forecast_val is None:
-                return "كما هو متوقع للدولار الأمريكي"
-            
-            event_lower = event.event_name.lower()
-            
-            # Employment indicators (higher = better for USD)
-            if any(keyword in event_lower for keyword in ['payroll', 'jobs', 'employment']):
-                if actual_val > forecast_val:
-                    return "إيجابي للدولار الأمريكي"
-                elif actual_val < forecast_val:
-                    return "سلبي للدولار الأمريكي"
-            
-            # Unemployment (lower = better for USD)
-            elif 'unemployment' in event_lower:
-                if actual_val < forecast_val:
-                    return "إيجابي للدولار الأمريكي"
-                elif actual_val > forecast_val:
-                    return "سلبي للدولار الأمريكي"
-            
-            # PMI (higher = better for USD)
-            elif 'pmi' in event_lower:
-                if actual_val > forecast_val:
-                    return "إيجابي للدولار الأمريكي"
-                elif actual_val < forecast_val:
-                    return "سلبي للدولار الأمريكي"
-            
+            impact = classify_usd_impact(
+                get_usd_impact_rule(event.event_name),
+                clean_number(event.actual),
+                clean_number(event.forecast),
+                clean_number(event.previous)
+            )
+            if impact == 'positive':
+                return "إيجابي للدولار الأمريكي"
+            elif impact == 'negative':
+                return "سلبي للدولار الأمريكي"
             return "كما هو متوقع للدولار الأمريكي"
             
         except Exception as e:
@@ -736,39 +1407,52 @@ class FreeArabicNewsBot:
          # Default: no filtering
          return False
     
-    def _is_event_released(self, event: EconomicEvent) -> bool:
-        """Check if economic event has been released based on time and actual data"""
-        try:
-            # If event has actual data, it's definitely released
-            if event.actual and event.actual not in ["", "--", "TBD", None]:
-                return True
-            
-            # If no time specified, consider it not released yet
-            if not event.time or event.time in ["TBD", "All Day", ""]:
-                return False
-            
-            current_time = datetime.now(timezone.utc)
-            current_hour = current_time.hour
-            current_minute = current_time.minute
-            
-            # Parse event time
-            if ':' in event.time:
-                event_hour, event_minute = map(int, event.time.split(':'))
-            else:
-                event_hour = int(event.time) if event.time.isdigit() else 13
-                event_minute = 30
-            
-            # Check if current time has passed the event time (give 5 minutes grace period)
-            if current_hour > event_hour:
-                return True
-            elif current_hour == event_hour and current_minute >= (event_minute + 5):
-                return True
-            
-            return False
-            
-        except Exception as e:
-            logger.error(f"Error checking event release time: {e}")
-            return bool(event.actual)  # Fallback to checking actual data existence
+    def _recover_send_journal(self):
+        """Resolve reservations of dead senders (_pending_channels consults the journal, so no seen-DB sync is needed)"""
+        self.journal.recover(Config.SEND_JOURNAL_STALE_SECONDS, Config.SEND_JOURNAL_RETRY_UNCONFIRMED)
+    
+    def _log_cycle_stats(self):
+        """Per-cycle translation, pipeline and latency stats"""
+        cache_stats = self.translation_cache.get_stats()
+        if cache_stats['memory_hits'] + cache_stats['disk_hits']:
+            logger.info(f"💾 Translation cache: {cache_stats['hit_rate']:.0%} hit rate, "
+                        f"{cache_stats['latency_saved_seconds']:.1f}s translation time saved")
+        
+        glossary_stats = self.glossary.stats
+        if glossary_stats['fast_path_hits'] or glossary_stats['post_edits']:
+            logger.info(f"📖 Glossary: {glossary_stats['fast_path_hits']} headlines translated locally, "
+                        f"{glossary_stats['post_edits']} machine translations post-edited")
+        
+        if self.stats['hedges_started']:
+            logger.info(f"🏁 Hedged translations: {self.stats['hedges_started']} started, "
+                        f"{self.stats['hedge_fallback_wins']} won by Google")
+        for histogram in self.translation_latency.values():
+            if histogram.count:
+                logger.info(f"⏱️ Translation latency {histogram.summary()}")
+        
+        if self.ai_translator and self.ai_translator.client:
+            self._log_groq_budget()
+        
+        self.pipeline.log_stats()
+        for histogram in (self.publish_to_post_latency, self.publish_to_edit_latency):
+            if histogram.count:
+                logger.info(f"⏱️ {histogram.summary()}")
+        if self.stats['digest_messages']:
+            logger.info(f"📰 Digests: {self.stats['digested_articles']} articles in {self.stats['digest_messages']} messages")
+        if self.images:
+            logger.info(f"📸 Images: {self.stats['photos_sent']} photos sent ({self.stats['media_groups']} albums), "
+                        f"{self.stats['image_fallbacks']} sent as text; checks {self.images.stats['checked']} "
+                        f"({self.images.stats['rejected']} rejected), {self.images.stats['hits']} cache hits")
+        if self.stats['quick_posts']:
+            logger.info(f"⚡ Post-then-edit: {self.stats['quick_posts']} headlines posted early, "
+                        f"{self.stats['messages_edited']} edited to the full message")
+        logger.info(f"✅ {self.stats['messages_sent']} messages sent so far, {len(self.in_flight_ids)} articles in flight, "
+                    f"{self.outbox.count()} posts in the outbox")
+        if self.stats['sources_timed_out']:
+            logger.info(f"⏰ {self.stats['sources_timed_out']} source fetches cancelled at the cycle deadline so far")
+        if self.journal.stats['conflicts'] or self.journal.stats['recovered']:
+            logger.info(f"🧾 Send journal: {self.journal.stats['conflicts']} duplicate sends prevented, "
+                        f"{self.journal.stats['recovered']} unfinished sends recovered")
     
     async def check_for_news(self):
         """🚀 ENHANCED: Check for new articles with configurable scraping modes (NEWS ONLY - every 3 minutes)"""
@@ -778,75 +1462,104 @@ class FreeArabicNewsBot:
             # 🚀 ENHANCED: Get new articles based on SCRAPING_MODE configuration
             articles = []
             
+            # ⏰ Every fetch, retry and human-like delay of this cycle shares one deadline
+            self.cycle_deadline = asyncio.get_running_loop().time() + Config.CYCLE_DEADLINE_SECONDS
+            
             # Mode 1: Investing.com only
             if Config.SCRAPING_MODE == 1:
                 logger.info("🏛️ INVESTING.COM ONLY MODE")
-                articles = await self._fetch_investing_articles()
+                articles = await self._fetch_before_deadline("Investing.com", self._fetch_investing_articles)
             
             # Mode 2: CoinDesk only
             elif Config.SCRAPING_MODE == 2:
                 logger.info("🪙 COINDESK ONLY MODE")
-                articles = await self._fetch_coindesk_articles()
+                articles = await self._fetch_before_deadline("CoinDesk", self._fetch_coindesk_articles)
             
-            # Mode 3: Both sources (Investing.com + CoinDesk)
+            # Mode 3: Both sources (Investing.com + CoinDesk), concurrently so a slow one cannot hold up the other
             elif Config.SCRAPING_MODE == 3:
                 logger.info("🌐 BOTH SOURCES MODE")
-                investing_articles = await self._fetch_investing_articles()
-                coindesk_articles = await self._fetch_coindesk_articles()
+                investing_articles, coindesk_articles = await asyncio.gather(
+                    self._fetch_before_deadline("Investing.com", self._fetch_investing_articles),
+                    self._fetch_before_deadline("CoinDesk", self._fetch_coindesk_articles)
+                )
                 articles = investing_articles + coindesk_articles
                 logger.info(f"📊 COMBINED: {len(investing_articles)} from Investing.com + {len(coindesk_articles)} from CoinDesk")
             
             # Mode 4: RSS sources (CoinDesk + Cointelegraph)
             elif Config.SCRAPING_MODE == 4:
                 logger.info("📡 RSS SOURCES MODE (CoinDesk + Cointelegraph)")
-                articles = await self._fetch_rss_articles()
+                articles = await self._fetch_before_deadline("RSS", self._fetch_rss_articles)
             
             # Mode 5: Cointelegraph only (Arabic if enabled) - NEW MODE
             elif Config.SCRAPING_MODE == 5:
                 if Config.ENABLE_ARABIC:
                     logger.info("🇦🇪 COINTELEGRAPH ARABIC ONLY MODE")
-                    articles = await self._fetch_cointelegraph_arabic_articles()
+                    articles = await self._fetch_before_deadline("Arabic Cointelegraph", self._fetch_cointelegraph_arabic_articles)
                 else:
                     logger.info("📰 COINTELEGRAPH ONLY MODE")
-                    articles = await self._fetch_cointelegraph_only_articles()
+                    articles = await self._fetch_before_deadline("Cointelegraph", self._fetch_cointelegraph_only_articles)
             
             else:
                 logger.error(f"❌ Invalid SCRAPING_MODE: {Config.SCRAPING_MODE}. Using default (Cointelegraph only)")
                 if Config.ENABLE_ARABIC:
-                    articles = await self._fetch_cointelegraph_arabic_articles()
+                    articles = await self._fetch_before_deadline("Arabic Cointelegraph", self._fetch_cointelegraph_arabic_articles)
                 else:
-                    articles = await self._fetch_cointelegraph_only_articles()
+                    articles = await self._fetch_before_deadline("Cointelegraph", self._fetch_cointelegraph_only_articles)
             
             if articles:
-                posted_count_before = self.stats['messages_sent']
-                await self.post_articles(articles)
-                posted_count_after = self.stats['messages_sent']
-                new_articles_posted = posted_count_after - posted_count_before
-                
-                logger.info(f"✅ Posted {new_articles_posted} new Arabic articles from {len(articles)} found")
-                
-                # 📊 IMPROVED: Only show newly posted articles (not repeated ones)
-                if new_articles_posted > 0:
-                    logger.info(f"🆕 NEW ARTICLES POSTED:")
-                    # Count how many articles were actually posted and only show those
-                    posted_articles = [a for a in articles if not self.database.is_article_seen(a.article_id)][:new_articles_posted]
-                    for article in posted_articles:
-                        logger.info(f"   🔥 {article.section}: {article.title[:60]}...")
-                else:
-                    logger.info(f"♻️  All {len(articles)} articles were duplicates (already seen)")
+                # 🏭 Hand the batch to the pipeline; translation and posting continue while the next fetch waits
+                await self.pipeline.submit(articles)
+                logger.info(f"📥 Queued {len(articles)} fetched articles for filtering, translation and posting")
             else:
                 logger.info("ℹ️ No new articles found")
+            
+            self._log_cycle_stats()
                 
             # Cleanup database if it gets too large  
             if self.database.get_article_count() > Config.MAX_DATABASE_SIZE:
                 self.database.cleanup_old_articles(Config.MAX_DATABASE_SIZE // 2)
             
+            # Settle reservations of senders that died since the last cycle
+            self._recover_send_journal()
+            
+            # 📤 Retry sends and post-then-edit edits that failed (their outbox entries were kept)
+            self._retry_outbox()
+            
             # Cleanup scraper cache to save memory
             self.scraper.cleanup_cache()
                 
         except Exception as e:
             logger.error(f"💥 Error checking for news: {e}")
 
+    async def _fetch_before_deadline(self, source: str, fetch: Callable[[], Awaitable[List]]) -> List:
+        """⏰ Run one source's fetch under the cycle deadline; a source that misses it is cancelled and fetched again next cycle"""
+        # wait_for rather than asyncio.timeout_at, which needs Python 3.11
+        remaining = max(self.cycle_deadline - asyncio.get_running_loop().time(), 0)
+        try:
+            return await asyncio.wait_for(fetch(), remaining)
+        except asyncio.TimeoutError:
+            self.stats['sources_timed_out'] += 1
+            logger.warning(f"⏰ {source} missed the {Config.CYCLE_DEADLINE_SECONDS:.0f}s cycle deadline, "
+                           f"cancelled (retried next cycle)")
+            return []
+    
+    def _feed_deadline(self) -> Optional[float]:
+        """Loop time at which RSS feeds still loading are dropped (just before the cycle deadline, so finished ones are kept)"""
+        if self.cycle_deadline is None:
+            return None
+        return self.cycle_deadline - FEED_DEADLINE_MARGIN_SECONDS
+    
+    async def _retry_pause(self, attempt: int) -> bool:
+        """Wait before another fetch attempt; False if none are left or the wait would run past the cycle deadline"""
+        if attempt >= Config.MAX_RETRIES - 1:
+            return False
+        if (self.cycle_deadline is not None
+                and asyncio.get_running_loop().time() + Config.FETCH_RETRY_DELAY_SECONDS >= self.cycle_deadline):
+            logger.info("⏰ No time left in this cycle for another attempt, retrying next cycle")
+            return False
+        await asyncio.sleep(Config.FETCH_RETRY_DELAY_SECONDS)
+        return True
+
     async def _fetch_investing_articles(self) -> List:
         """🏛️ Fetch articles from Investing.com with retry logic"""
         articles = []
@@ -854,7 +1567,7 @@ class FreeArabicNewsBot:
             try:
                 # 🎯 USE ENHANCED FEATURES: Breaking news priority + more articles
                 raw_articles = await self.scraper.scrape_investing_news(
-                    max_articles=Config.MAX_ARTICLES_PER_SCRAPE * 2,  # Get more for better selection
+                    max_articles=self._max_articles_per_scrape() * 2,  # Get more for better selection
                     breaking_news_priority=True  # 🔥 Prioritize breaking news
                 )
                 
@@ -870,8 +1583,8 @@ class FreeArabicNewsBot:
                     break
             except Exception as e:
                 logger.error(f"⚠️ Investing.com fetch attempt {attempt + 1} failed: {e}")
-                if attempt < Config.MAX_RETRIES - 1:
-                    await asyncio.sleep(10)
+                if not await self._retry_pause(attempt):
+                    break
         
         return articles
 
@@ -882,7 +1595,7 @@ class FreeArabicNewsBot:
             try:
                 # 🪙 Fetch CoinDesk articles
                 coindesk_articles = await self.scraper.scrape_coindesk_news(
-                    max_articles=Config.MAX_ARTICLES_PER_SCRAPE
+                    max_articles=self._max_articles_per_scrape()
                 )
                 
                 if coindesk_articles:
@@ -892,8 +1605,8 @@ class FreeArabicNewsBot:
                     
             except Exception as e:
                 logger.error(f"⚠️ CoinDesk fetch attempt {attempt + 1} failed: {e}")
-                if attempt < Config.MAX_RETRIES - 1:
-                    await asyncio.sleep(10)
+                if not await self._retry_pause(attempt):
+                    break
         
         return articles
 
@@ -904,7 +1617,8 @@ class FreeArabicNewsBot:
             try:
                 # 📡 Fetch RSS articles from both CoinDesk and Cointelegraph
                 rss_articles = await self.rss_scraper.get_latest_news(
-                    max_articles=Config.MAX_ARTICLES_PER_SCRAPE
+                    max_articles=self._max_articles_per_scrape(),
+                    deadline=self._feed_deadline()
                 )
                 
                 if rss_articles:
@@ -919,7 +1633,9 @@ class FreeArabicNewsBot:
                             'summary': rss_article.summary,
                             'section': rss_article.source.upper(),  # Use source as section
                             'article_id': rss_article.article_id,
-                            'image_url': getattr(rss_article, 'image_url', None)
+                            'image_url': getattr(rss_article, 'image_url', None),
+                            'timestamp': rss_article.timestamp,
+                            'features': rss_article.features
                         })()
                         converted_articles.append(article)
                     
@@ -934,8 +1650,8 @@ class FreeArabicNewsBot:
                     
             except Exception as e:
                 logger.error(f"⚠️ RSS fetch attempt {attempt + 1} failed: {e}")
-                if attempt < Config.MAX_RETRIES - 1:
-                    await asyncio.sleep(10)
+                if not await self._retry_pause(attempt):
+                    break
         
         return articles
 
@@ -947,10 +1663,14 @@ class FreeArabicNewsBot:
                 # 📰 Create RSS scraper with Cointelegraph only sources
                 cointelegraph_scraper = RSSNewsScraper(custom_sources=Config.COINTELEGRAPH_SOURCES)
                 
-                # Fetch Cointelegraph articles only
-                rss_articles = await cointelegraph_scraper.get_latest_news(
-                    max_articles=Config.MAX_ARTICLES_PER_SCRAPE
-                )
+                # Fetch Cointelegraph articles only (session closed even when the deadline cancels us)
+                try:
+                    rss_articles = await cointelegraph_scraper.get_latest_news(
+                        max_articles=self._max_articles_per_scrape(),
+                        deadline=self._feed_deadline()
+                    )
+                finally:
+                    await cointelegraph_scraper.close_session()
                 
                 if rss_articles:
                     # Convert RSS articles to the format expected by the bot
@@ -964,21 +1684,20 @@ class FreeArabicNewsBot:
                             'summary': rss_article.summary,
                             'section': 'COINTELEGRAPH',  # Use consistent section name
                             'article_id': rss_article.article_id,
-                            'image_url': getattr(rss_article, 'image_url', None)
+                            'image_url': getattr(rss_article, 'image_url', None),
+                            'timestamp': rss_article.timestamp,
+                            'features': rss_article.features
                         })()
                         converted_articles.append(article)
                     
                     articles = converted_articles
                     logger.info(f"📰 COINTELEGRAPH SUCCESS: Retrieved {len(articles)} English articles")
-                    await cointelegraph_scraper.close_session()
                     break
                     
-                await cointelegraph_scraper.close_session()
-                    
             except Exception as e:
                 logger.error(f"⚠️ Cointelegraph fetch attempt {attempt + 1} failed: {e}")
-                if attempt < Config.MAX_RETRIES - 1:
-                    await asyncio.sleep(10)
+                if not await self._retry_pause(attempt):
+                    break
         
         return articles
 
@@ -990,10 +1709,14 @@ class FreeArabicNewsBot:
                 # 🇦🇪 Create RSS scraper with Arabic Cointelegraph source
                 arabic_scraper = RSSNewsScraper(custom_sources=Config.COINTELEGRAPH_ARABIC_SOURCES)
                 
-                # Fetch Arabic Cointelegraph articles
-                rss_articles = await arabic_scraper.get_latest_news(
-                    max_articles=Config.MAX_ARTICLES_PER_SCRAPE
-                )
+                # Fetch Arabic Cointelegraph articles (session closed even when the deadline cancels us)
+                try:
+                    rss_articles = await arabic_scraper.get_latest_news(
+                        max_articles=self._max_articles_per_scrape(),
+                        deadline=self._feed_deadline()
+                    )
+                finally:
+                    await arabic_scraper.close_session()
                 
                 if rss_articles:
                     # Convert RSS articles to the format expected by the bot
@@ -1007,45 +1730,40 @@ class FreeArabicNewsBot:
                             'summary': rss_article.summary,
                             'section': 'COINTELEGRAPH_ARABIC',  # Use Arabic section name
                             'article_id': rss_article.article_id,
-                            'image_url': getattr(rss_article, 'image_url', None)
+                            'image_url': getattr(rss_article, 'image_url', None),
+                            'timestamp': rss_article.timestamp,
+                            'features': rss_article.features
                         })()
                         converted_articles.append(article)
                     
                     articles = converted_articles
                     logger.info(f"🇦🇪 COINTELEGRAPH ARABIC SUCCESS: Retrieved {len(articles)} Arabic articles")
-                    await arabic_scraper.close_session()
                     break
                     
-                await arabic_scraper.close_session()
-                    
             except Exception as e:
                 logger.error(f"⚠️ Arabic Cointelegraph fetch attempt {attempt + 1} failed: {e}")
-                if attempt < Config.MAX_RETRIES - 1:
-                    await asyncio.sleep(10)
+                if not await self._retry_pause(attempt):
+                    break
         
         return articles
     
 
-    # DISABLED: Economic calendar task removed per user request
-    async def economic_calendar_task_DISABLED(self):
-        """📊 SEPARATE TASK: Economic calendar checker (every 1 hour 2 minutes) - DISABLED"""
-        return  # Economic calendar disabled
-        while self.running:
-            try:
-                logger.info("📊 ECONOMIC CALENDAR: Checking for economic events...")
-                await self.check_economic_calendar_DISABLED()
-                
-                # Wait 1 hour 2 minutes for next economic calendar check
-                economic_wait = 3720  # 1 hour 2 minutes
-                logger.info(f"📊 ECONOMIC CALENDAR: Waiting {economic_wait} seconds (1h 2m) until next economic calendar check...")
-                await asyncio.sleep(economic_wait)
-                
-            except Exception as e:
-                logger.error(f"💥 Error in economic calendar task: {e}")
-                await asyncio.sleep(60)  # Wait 1 minute before retry
+    async def economic_release_task(self):
+        """📊 SEPARATE TASK: Release-time-aware economic calendar (sleeps until each release)"""
+        self.calendar_scheduler = EconomicReleaseScheduler(
+            self.scraper,
+            on_release=self.post_economic_release,
+            on_upcoming=self.post_economic_announcement,
+            on_scheduled=self.stage_economic_release,
+            on_unscheduled=self.unstage_economic_release
+        )
+        logger.info("📊 ECONOMIC CALENDAR: Release scheduler started")
+        await self.calendar_scheduler.run()
     
     async def run(self):
         """Main run loop"""
+        economic_task = None
+        resume_task = None
         try:
             self.running = True
             logger.info("Starting FREE Arabic Financial News Bot...")
@@ -1061,6 +1779,15 @@ class FreeArabicNewsBot:
             config_summary = Config.get_config_summary()
             logger.info(f"Bot configuration: {config_summary}")
             
+            # 🧾 Settle sends a crashed run left half-done before anything new is sent
+            self._recover_send_journal()
+            
+            # 🏭 Pipeline workers run for the lifetime of the bot
+            self.pipeline.start()
+            
+            # 📤 Posts left in the outbox start draining before any fetch
+            resume_task = self._resume_outbox()
+            
             # Send startup message based on language mode
             if Config.ENABLE_ARABIC:
                 startup_message = (
@@ -1084,9 +1811,9 @@ class FreeArabicNewsBot:
             else:
                 logger.warning("Failed to send startup message - continuing anyway")
             
-            # DISABLED: Economic calendar task removed per user request
-            # economic_task = asyncio.create_task(self.economic_calendar_task())
-            # logger.info("📊 ECONOMIC CALENDAR: Started separate task (1h 2m intervals) - REAL EVENTS ONLY")
+            # Economic calendar runs as a separate task only when enabled (off by default per user request)
+            if Config.ENABLE_ECONOMIC_CALENDAR:
+                economic_task = asyncio.create_task(self.economic_release_task())
             
             # Main loop for NEWS (every 3 minutes as before)
             while self.running:
@@ -1100,9 +1827,6 @@ class FreeArabicNewsBot:
                     
                 except KeyboardInterrupt:
                     logger.info("Bot stopped by user")
-                    # Economic task disabled
-                    # if 'economic_task' in locals():
-                    #     economic_task.cancel()  # Cancel economic task
                     break
                 except Exception as e:
                     logger.error(f"Error in main loop: {e}")
@@ -1113,8 +1837,23 @@ class FreeArabicNewsBot:
             logger.error(f"Fatal error: {e}")
         finally:
             self.running = False
+            if economic_task:
+                economic_task.cancel()  # Cancel economic task
+            if resume_task:
+                resume_task.cancel()
+            if self._outbox_retry_task:
+                self._outbox_retry_task.cancel()
             if self.scraper:
                 await self.scraper.close_session()
+            await self.pipeline.stop()
+            await self.telegram.close()
+            if self.images:
+                await self.images.close()
+            self.translation_cache.close()
+            self.journal.close()
+            self.outbox.close()  # Unsent posts stay on disk for the next start
+            if self.translator:
+                self.translator.close()
             logger.info("Free Arabic bot stopped")
 
 async def main():
@@ -0,0 +1,380 @@
+#!/usr/bin/env python3
+"""
+Glossary-based fast-path translator for templated financial headlines
+Headlines like "Bitcoin price rises to $70,000" or "US jobless claims fall to 220K" are
+translated locally and instantly: longest-match term substitution plus number and
+percentage localization. Anything with a word outside the glossary returns None and
+goes to the LLM. The same glossary post-edits LLM output so curated terms stay consistent.
+"""
+import logging
+import re
+from typing import Dict, Iterable, List, Optional, Set, Tuple, Union
+
+logger = logging.getLogger(__name__)
+
+# Headline vocabulary on top of the curated economic terms (nouns)
+HEADLINE_TERMS = {
+    # Assets
+    'bitcoin': 'البيتكوين', 'btc': 'البيتكوين',
+    'ethereum': 'الإيثريوم', 'eth': 'الإيثريوم',
+    'crypto': 'العملات المشفرة', 'cryptocurrency': 'العملات المشفرة', 'cryptocurrencies': 'العملات المشفرة',
+    'crypto market': 'سوق العملات المشفرة',
+    'bitcoin price': 'سعر البيتكوين', 'btc price': 'سعر البيتكوين',
+    'ethereum price': 'سعر الإيثريوم', 'eth price': 'سعر الإيثريوم',
+    'gold': 'الذهب', 'gold price': 'سعر الذهب', 'gold prices': 'أسعار الذهب',
+    'oil': 'النفط', 'crude oil': 'النفط الخام', 'oil prices': 'أسعار النفط',
+    'dollar': 'الدولار', 'us dollar': 'الدولار الأمريكي', 'euro': 'اليورو', 'yen': 'الين',
+    'stocks': 'الأسهم', 'wall street': 'وول ستريت', 'nasdaq': 'ناسداك', 'dow': 'داو جونز',
+    'treasury yields': 'عوائد سندات الخزانة', 'yields': 'العوائد',
+    'price': 'السعر', 'prices': 'الأسعار',
+
+    # Institutions and policy
+    'fed': 'الاحتياطي الفيدرالي', 'ecb': 'البنك المركزي الأوروبي', 'boe': 'بنك إنجلترا',
+    'boj': 'بنك اليابان', 'opec': 'أوبك',
+    'rates': 'أسعار الفائدة', 'interest rates': 'أسعار الفائدة',
+
+    # Levels and expectations
+    'record high': 'مستوى قياسي', 'all-time high': 'أعلى مستوى على الإطلاق',
+    'expectations': 'التوقعات', 'forecast': 'التوقعات', 'estimates': 'التقديرات',
+    'expected': 'المتوقع', 'jobs': 'الوظائف',
+}
+
+# Verbs as (masculine, feminine) forms, agreeing with the preceding subject
+HEADLINE_VERBS = {
+    'rises': ('يرتفع', 'ترتفع'), 'rise': ('ترتفع', 'ترتفع'), 'rose': ('ارتفع', 'ارتفعت'),
+    'climbs': ('يصعد', 'تصعد'), 'climbed': ('صعد', 'صعدت'),
+    'gains': ('يرتفع', 'ترتفع'), 'gained': ('ارتفع', 'ارتفعت'),
+    'jumps': ('يقفز', 'تقفز'), 'jumped': ('قفز', 'قفزت'),
+    'surges': ('يقفز', 'تقفز'), 'surge': ('تقفز', 'تقفز'), 'surged': ('قفز', 'قفزت'),
+    'soars': ('يحلق', 'تحلق'), 'soared': ('حلق', 'حلقت'),
+    'falls': ('ينخفض', 'تنخفض'), 'fall': ('تنخفض', 'تنخفض'), 'fell': ('انخفض', 'انخفضت'),
+    'drops': ('يتراجع', 'تتراجع'), 'drop': ('تتراجع', 'تتراجع'), 'dropped': ('تراجع', 'تراجعت'),
+    'slips': ('يتراجع', 'تتراجع'), 'slipped': ('تراجع', 'تراجعت'),
+    'declines': ('يتراجع', 'تتراجع'), 'declined': ('تراجع', 'تراجعت'),
+    'slides': ('ينزلق', 'تنزلق'), 'slid': ('انزلق', 'انزلقت'),
+    'tumbles': ('يهوي', 'تهوي'), 'tumbled': ('هوى', 'هوت'),
+    'plunges': ('يهوي', 'تهوي'), 'plunged': ('هوى', 'هوت'),
+    'hits': ('يسجل', 'تسجل'), 'hit': ('سجل', 'سجلت'),
+    'tops': ('يتجاوز', 'تتجاوز'), 'topped': ('تجاوز', 'تجاوزت'),
+    'beats expectations': ('يتجاوز التوقعات', 'تتجاوز التوقعات'),
+    'misses expectations': ('يأتي دون التوقعات', 'تأتي دون التوقعات'),
+    'misses forecast': ('يأتي دون التوقعات', 'تأتي دون التوقعات'),
+    'holds rates': ('يثبت أسعار الفائدة', 'تثبت أسعار الفائدة'),
+    'holds rates steady': ('يثبت أسعار الفائدة', 'تثبت أسعار الفائدة'),
+    'keeps rates unchanged': ('يثبت أسعار الفائدة', 'تثبت أسعار الفائدة'),
+    'leaves rates unchanged': ('يثبت أسعار الفائدة', 'تثبت أسعار الفائدة'),
+    'cuts rates': ('يخفض أسعار الفائدة', 'تخفض أسعار الفائدة'),
+    'raises rates': ('يرفع أسعار الفائدة', 'ترفع أسعار الفائدة'),
+    'hikes rates': ('يرفع أسعار الفائدة', 'ترفع أسعار الفائدة'),
+}
+
+# Function words ('' = dropped); "on", "for" and "as" are left out on purpose ("falls on Fed" is not "على")
+HEADLINE_WORDS = {
+    'to': 'إلى', 'at': 'عند', 'in': 'في', 'from': 'من', 'above': 'فوق', 'below': 'دون',
+    'near': 'قرب', 'after': 'بعد', 'amid': 'وسط', 'vs': 'مقابل', 'versus': 'مقابل',
+    'the': '', 'a': '', 'an': '',
+}
+
+# Prepositions only translated before a number or a price level ("rises to $70,000", "hits record high above $2,400")
+LEVEL_PREPOSITIONS = {'to', 'at', 'from', 'above', 'below', 'near'}
+LEVEL_TERMS = {'record high', 'all-time high'}
+
+# "vs 225K expected" -> "مقابل توقعات عند 225 ألف"; an expectation word after a number is only accepted in this template
+VERSUS_WORDS = {'vs', 'versus'}
+EXPECTATION_TERMS = {'expected', 'expectations', 'forecast', 'estimates'}
+VERSUS_EXPECTED = 'مقابل توقعات عند'
+
+# Countries: "US CPI" becomes "<CPI> في الولايات المتحدة"
+HEADLINE_COUNTRIES = {
+    'us': 'الولايات المتحدة', 'united states': 'الولايات المتحدة', 'uk': 'بريطانيا',
+    'china': 'الصين', 'japan': 'اليابان', 'eurozone': 'منطقة اليورو', 'germany': 'ألمانيا',
+    'canada': 'كندا', 'australia': 'أستراليا',
+}
+
+# Attached to the next word ("and" -> "و")
+CONJUNCTIONS = {'and': 'و'}
+
+# Common LLM spellings normalized to the glossary term (applied when the term's English is in the source)
+ARABIC_VARIANTS = {
+    'البيتكوين': ['بيتكوين', 'البتكوين', 'بتكوين'],
+    'الإيثريوم': ['إيثريوم', 'الايثريوم', 'ايثريوم', 'الإيثيريوم', 'إيثيريوم'],
+    'العملات المشفرة': ['العملات الرقمية', 'العملات الافتراضية'],
+    'مؤشر أسعار المستهلك': ['مؤشر أسعار المستهلكين'],
+    'طلبات إعانة البطالة': ['طلبات البطالة', 'مطالبات البطالة'],
+    'الاحتياطي الفيدرالي': ['الاحتياطي الاتحادي'],
+}
+
+# Broken plurals of non-human nouns take feminine agreement
+FEMININE_HEADS = {'أسعار', 'أسهم', 'أسواق', 'عوائد', 'الأسعار', 'الأسهم', 'الأسواق', 'العوائد'}
+
+PUNCTUATION = {',': '،', ';': '؛', '?': '؟'}
+CURRENCY_SYMBOLS = {'$': 'دولار', '€': 'يورو', '£': 'جنيه إسترليني'}
+MAGNITUDES = {
+    'k': 'ألف', 'thousand': 'ألف',
+    'm': 'مليون', 'mn': 'مليون', 'million': 'مليون',
+    'b': 'مليار', 'bn': 'مليار', 'billion': 'مليار',
+    'tn': 'تريليون', 'trillion': 'تريليون',
+}
+ARABIC_DIGITS = str.maketrans('0123456789%,.', '٠١٢٣٤٥٦٧٨٩٪٬٫')
+
+NUMBER_PATTERN = (r'[$€£]?[+-]?\d[\d,]*(?:\.\d+)?'
+                  r'(?:%|(?:k|mn|m|bn|b|tn)\b|\s(?:thousand|million|billion|trillion)\b)?')
+TOKEN_PATTERN = re.compile(rf"({NUMBER_PATTERN})|([A-Za-z](?:[A-Za-z'&.-]*[A-Za-z])?)|(\S)", re.IGNORECASE)
+NUMBER_PARTS_PATTERN = re.compile(
+    r'^([$€£])?([+-]?)(\d[\d,]*(?:\.\d+)?)\s?(%|[a-z]+)?$', re.IGNORECASE
+)
+ARABIC_LETTER = r'[\u0600-\u06FF]'
+SPACE_BEFORE_PUNCTUATION = re.compile(r'\s+([،؛؟:!.)])')
+
+# Token kinds
+NUMBER, WORD, PUNCT = 'number', 'word', 'punct'
+# Glossary entry kinds
+NOUN, VERB, FUNCTION, COUNTRY, CONJUNCTION = 'noun', 'verb', 'function', 'country', 'conjunction'
+
+GlossaryValue = Union[str, Tuple[str, str]]
+
+
+def tokenize(text: str) -> List[Tuple[str, str]]:
+    """Split a headline into (kind, token) pairs"""
+    tokens = []
+    for number, word, other in TOKEN_PATTERN.findall(text):
+        if number:
+            tokens.append((NUMBER, number))
+        elif word:
+            tokens.append((WORD, word.lower().replace('.', '')))  # "U.S." -> "us"
+        else:
+            tokens.append((PUNCT, other))
+    return tokens
+
+
+def localize_number(token: str, arabic_digits: bool = False) -> str:
+    """"$1.2B" -> "1.2 مليار دولار", "4.1%" -> "4.1%" (Eastern Arabic digits if enabled)"""
+    match = NUMBER_PARTS_PATTERN.match(token.strip())
+    if not match:
+        return token
+    currency, sign, amount, suffix = match.groups()
+    suffix = (suffix or '').lower()
+
+    number = f"{sign}{amount}"
+    if suffix == '%':
+        number += '%'
+    if arabic_digits:
+        number = number.translate(ARABIC_DIGITS)
+
+    parts = [number]
+    if suffix in MAGNITUDES:
+        parts.append(MAGNITUDES[suffix])
+    if currency:
+        parts.append(CURRENCY_SYMBOLS[currency])
+    return ' '.join(parts)
+
+
+def is_feminine(arabic_term: str) -> bool:
+    """Grammatical gender of a term's head noun (for verb agreement)"""
+    head = arabic_term.split()[0] if arabic_term else ''
+    return head in FEMININE_HEADS or head.endswith('ة') or head.endswith('ات')
+
+
+class GlossaryTranslator:
+    """Rule/glossary translator: full translation for covered headlines, post-edit for the rest"""
+
+    def __init__(self, *term_tables: Union[Dict[str, str], Iterable[Tuple[str, str]]], arabic_digits: bool = False):
+        self.arabic_digits = arabic_digits
+        # English phrase (tuple of words) -> (kind, value)
+        self.entries: Dict[Tuple[str, ...], Tuple[str, GlossaryValue]] = {}
+        self.max_phrase_words = 1
+
+        # Curated tables first so they win over the generic headline vocabulary
+        for table in term_tables:
+            self.add_terms(dict(table), NOUN)
+        self.add_terms(HEADLINE_TERMS, NOUN)
+        self.add_terms(HEADLINE_VERBS, VERB)
+        self.add_terms(HEADLINE_WORDS, FUNCTION)
+        self.add_terms(HEADLINE_COUNTRIES, COUNTRY)
+        self.add_terms(CONJUNCTIONS, CONJUNCTION)
+
+        self.stats = {'fast_path_hits': 0, 'fast_path_misses': 0, 'post_edits': 0}
+
+    def add_terms(self, table: Dict[str, GlossaryValue], kind: str = NOUN):
+        """Register terms (existing entries are kept)"""
+        for english, value in table.items():
+            phrase = tuple(word for _, word in tokenize(english))
+            if phrase and phrase not in self.entries:
+                self.entries[phrase] = (kind, value)
+                self.max_phrase_words = max(self.max_phrase_words, len(phrase))
+
+    def _match(self, tokens: List[Tuple[str, str]], start: int) -> Optional[Tuple[int, str, GlossaryValue]]:
+        """Longest glossary phrase starting at a token: (words used, kind, value)"""
+        words = []
+        for kind, token in tokens[start:start + self.max_phrase_words]:
+            if kind != WORD:
+                break
+            words.append(token)
+        for length in range(len(words), 0, -1):
+            entry = self.entries.get(tuple(words[:length]))
+            if entry:
+                return length, entry[0], entry[1]
+        return None
+
+    def _phrase_at(self, tokens: List[Tuple[str, str]], start: int) -> Optional[str]:
+        """English glossary phrase starting at a token, None if there is none"""
+        match = self._match(tokens, start)
+        return ' '.join(word for _, word in tokens[start:start + match[0]]) if match else None
+
+    def _is_level(self, tokens: List[Tuple[str, str]], start: int) -> bool:
+        """True if a number or a price level starts at the token"""
+        if start < len(tokens) and tokens[start][0] == NUMBER:
+            return True
+        return self._phrase_at(tokens, start) in LEVEL_TERMS
+
+    def _is_expectation(self, tokens: List[Tuple[str, str]], start: int) -> bool:
+        """True for "<number> expected" (or forecast/estimates) starting at the token"""
+        return (start < len(tokens) and tokens[start][0] == NUMBER
+                and self._phrase_at(tokens, start + 1) in EXPECTATION_TERMS)
+
+    def translate(self, text: str, record_stats: bool = True) -> Optional[str]:
+        """Arabic translation if every word is in the glossary, None otherwise (use the LLM)"""
+        tokens = tokenize(text)
+        output: List[str] = []
+        feminine_subject = False
+        prefix = ''
+        content_terms = 0
+        index = 0
+
+        while index < len(tokens):
+            kind, token = tokens[index]
+            if kind == NUMBER:
+                output.append(prefix + localize_number(token, self.arabic_digits))
+                prefix = ''
+                index += 1
+                continue
+            if kind == PUNCT:
+                output.append(PUNCTUATION.get(token, token))
+                index += 1
+                continue
+
+            match = self._match(tokens, index)
+            if not match:
+                if record_stats:
+                    self.stats['fast_path_misses'] += 1
+                return None
+            length, entry_kind, value = match
+            phrase = ' '.join(word for _, word in tokens[index:index + length])
+            previous_kind = tokens[index - 1][0] if index else None
+            index += length
+
+            if phrase in VERSUS_WORDS and self._is_expectation(tokens, index):
+                output.append(f"{prefix}{VERSUS_EXPECTED} {localize_number(tokens[index][1], self.arabic_digits)}")
+                prefix = ''
+                index += 1 + self._match(tokens, index + 1)[0]
+                continue
+            if ((phrase in LEVEL_PREPOSITIONS and not self._is_level(tokens, index))
+                    or (phrase in EXPECTATION_TERMS and previous_kind == NUMBER)):
+                # Word-by-word would be wrong here; leave it to the LLM
+                if record_stats:
+                    self.stats['fast_path_misses'] += 1
+                return None
+
+            if entry_kind == CONJUNCTION:
+                prefix = value
+                continue
+            if entry_kind == FUNCTION:
+                if value:
+                    output.append(prefix + value)
+                    prefix = ''
+                continue
+
+            content_terms += 1
+            if entry_kind == COUNTRY:
+                following = self._match(tokens, index)
+                if following and following[1] == NOUN:
+                    # "US CPI" -> "مؤشر أسعار المستهلك في الولايات المتحدة"
+                    index += following[0]
+                    output.append(f"{prefix}{following[2]} في {value}")
+                    feminine_subject = is_feminine(following[2])
+                else:
+                    output.append(prefix + value)
+                    feminine_subject = True  # Country names take feminine agreement
+            elif entry_kind == VERB:
+                output.append(prefix + value[1 if feminine_subject else 0])
+            else:
+                output.append(prefix + value)
+                feminine_subject = is_feminine(value)
+            prefix = ''
+
+        if not content_terms:
+            if record_stats:
+                self.stats['fast_path_misses'] += 1
+            return None
+
+        if record_stats:
+            self.stats['fast_path_hits'] += 1
+        translation = ' '.join(part for part in output if part)
+        return SPACE_BEFORE_PUNCTUATION.sub(r'\1', translation)
+
+    def _source_terms(self, text: str) -> Set[str]:
+        """Arabic noun terms whose English phrase appears in the source"""
+        tokens = tokenize(text)
+        terms = set()
+        index = 0
+        while index < len(tokens):
+            match = self._match(tokens, index)
+            if match:
+                length, kind, value = match
+                if kind == NOUN:
+                    terms.add(value)
+                index += length
+            else:
+                index += 1
+        return terms
+
+    def post_edit(self, source: str, translation: str) -> str:
+        """Enforce glossary terms on a machine translation of source"""
+        if not translation:
+            return translation
+        edited = translation
+
+        # English glossary terms the model left untranslated
+        if re.search(r'[A-Za-z]', edited):
+            for phrase, (kind, value) in sorted(self.entries.items(), key=lambda item: -len(' '.join(item[0]))):
+                english = ' '.join(phrase)
+                if kind != NOUN or len(english) < 3:
+                    continue
+                edited = re.sub(rf'(?<![A-Za-z]){re.escape(english)}(?![A-Za-z])', value, edited, flags=re.IGNORECASE)
+
+        # Variant spellings of terms present in the source
+        for term in self._source_terms(source):
+            for variant in ARABIC_VARIANTS.get(term, ()):
+                edited = re.sub(rf'(?<!{ARABIC_LETTER}){re.escape(variant)}(?!{ARABIC_LETTER})', term, edited)
+
+        if self.arabic_digits:
+            edited = re.sub(r'\d[\d,]*(?:\.\d+)?%?', lambda match: match.group(0).translate(ARABIC_DIGITS), edited)
+
+        if edited != translation:
+            self.stats['post_edits'] += 1
+        return edited
+
+
+async def test_glossary_translator():
+    """Test the glossary translator on templated and free-form headlines"""
+    from investing_scraper import ARABIC_EVENT_PATTERNS
+    glossary = GlossaryTranslator(ARABIC_EVENT_PATTERNS)
+
+    headlines = [
+        "Bitcoin price rises to $70,000",
+        "US jobless claims fall to 220K vs 225K expected",
+        "Fed holds rates steady",
+        "Gold hits record high above $2,400",
+        "Oil falls on Fed",  # Ambiguous preposition: goes to the LLM
+        "Tesla shares plunge on weak deliveries",  # Free-form: goes to the LLM
+    ]
+    for headline in headlines:
+        print(f"{headline}\n  -> {glossary.translate(headline)}")
+
+    print(glossary.post_edit("Bitcoin ETF inflows", "تدفقات صناديق بيتكوين المتداولة"))
+    print(f"Stats: {glossary.stats}")
+
+
+if __name__ == "__main__":
+    import asyncio
+    asyncio.run(test_glossary_translator())
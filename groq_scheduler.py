@@ -0,0 +1,265 @@
+#!/usr/bin/env python3
+"""
+Client-side Groq request scheduler
+Keeps AI calls under the requests-per-minute and tokens-per-minute limits instead of
+discovering them through 429s, serving breaking news before routine headlines
+
+Budgets come from our own sliding 60s window (estimated tokens, corrected with the
+usage Groq reports) and from the x-ratelimit-* response headers when present.
+"""
+import asyncio
+import heapq
+import itertools
+import logging
+import re
+import time
+from collections import deque
+from typing import Deque, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Lower value = served first
+PRIORITY_BREAKING = 0
+PRIORITY_NORMAL = 1
+PRIORITY_BACKGROUND = 2
+
+WINDOW_SECONDS = 60.0
+RATE_WINDOW_SECONDS = 3600.0  # Longer window for the daily-quota forecast
+
+# Rough tokens per character (English ~4 chars/token, Arabic output is denser)
+CHARS_PER_TOKEN = 3.5
+
+DURATION_PART_PATTERN = re.compile(r'(\d+(?:\.\d+)?)(ms|h|m|s)')
+DURATION_UNITS = {'h': 3600.0, 'm': 60.0, 's': 1.0, 'ms': 0.001}
+
+
+def estimate_tokens(*texts: str, completion_tokens: int = 0) -> int:
+    """Estimated tokens for a request: prompt characters plus the expected completion"""
+    prompt_chars = sum(len(text) for text in texts if text)
+    return int(prompt_chars / CHARS_PER_TOKEN) + completion_tokens
+
+
+def parse_reset_duration(value: Optional[str]) -> Optional[float]:
+    """Seconds from a Groq reset header ('7.66s', '2m59.56s', '120ms' or plain seconds)"""
+    if not value:
+        return None
+    value = value.strip()
+    try:
+        return float(value)
+    except ValueError:
+        pass
+    parts = DURATION_PART_PATTERN.findall(value)
+    if not parts:
+        return None
+    return sum(float(amount) * DURATION_UNITS[unit] for amount, unit in parts)
+
+
+class GroqRequestScheduler:
+    """Priority queue in front of Groq that waits for RPM/TPM budget before each call"""
+
+    def __init__(self, requests_per_minute: int = 30, tokens_per_minute: int = 6000):
+        self.requests_per_minute = requests_per_minute
+        self.tokens_per_minute = tokens_per_minute
+
+        # (sent_at, tokens) for calls in the last WINDOW_SECONDS
+        self.window: Deque[Tuple[float, int]] = deque()
+        # Send times for the last RATE_WINDOW_SECONDS (request rate for forecasts)
+        self.history: Deque[float] = deque()
+
+        # Latest server view from x-ratelimit-* headers: remaining, reset deadline (monotonic)
+        self.server: Dict[str, Optional[float]] = {
+            'remaining_requests': None,
+            'requests_reset_at': None,
+            'remaining_tokens': None,
+            'tokens_reset_at': None,
+        }
+        self.blocked_until = 0.0  # Set from retry-after on 429
+
+        self._waiters: List[Tuple[int, int]] = []  # Heap of (priority, sequence)
+        self._sequence = itertools.count()
+        self._condition: Optional[asyncio.Condition] = None
+
+        self.stats = {
+            'requests': 0,
+            'tokens_estimated': 0,
+            'tokens_used': 0,
+            'throttled': 0,
+            'wait_seconds': 0.0,
+            'gave_up': 0,
+            'rate_limited': 0,
+        }
+
+    def _get_condition(self) -> asyncio.Condition:
+        """Condition bound to the running loop (created lazily)"""
+        if self._condition is None:
+            self._condition = asyncio.Condition()
+        return self._condition
+
+    def _prune(self, now: float):
+        """Drop calls that left the sliding windows"""
+        while self.window and now - self.window[0][0] >= WINDOW_SECONDS:
+            self.window.popleft()
+        while self.history and now - self.history[0] >= RATE_WINDOW_SECONDS:
+            self.history.popleft()
+
+    def _window_tokens(self) -> int:
+        """Tokens spent in the current minute window"""
+        return sum(tokens for _, tokens in self.window)
+
+    def _delay_for(self, tokens: int, now: float) -> float:
+        """Seconds until a call of this size fits every known budget (0 = send now)"""
+        self._prune(now)
+        delays = [self.blocked_until - now]
+
+        # Our own sliding window
+        if len(self.window) >= self.requests_per_minute:
+            delays.append(self.window[0][0] + WINDOW_SECONDS - now)
+        # A single oversized call is allowed into an empty window rather than waiting forever
+        if self.window and self._window_tokens() + tokens > self.tokens_per_minute:
+            spent = self._window_tokens()
+            for sent_at, used in self.window:
+                spent -= used
+                if spent + tokens <= self.tokens_per_minute:
+                    delays.append(sent_at + WINDOW_SECONDS - now)
+                    break
+
+        # Server-reported budgets
+        remaining_requests = self.server['remaining_requests']
+        if remaining_requests is not None and remaining_requests < 1 and self.server['requests_reset_at']:
+            delays.append(self.server['requests_reset_at'] - now)
+        remaining_tokens = self.server['remaining_tokens']
+        if remaining_tokens is not None and remaining_tokens < tokens and self.server['tokens_reset_at']:
+            delays.append(self.server['tokens_reset_at'] - now)
+
+        return max(delays)
+
+    async def acquire(self, tokens: int, priority: int = PRIORITY_NORMAL,
+                      max_wait: Optional[float] = None) -> bool:
+        """
+        Wait for budget to send a call of ~tokens, in priority order
+        Returns False (without sending) if the wait would exceed max_wait
+        """
+        condition = self._get_condition()
+        entry = (priority, next(self._sequence))
+        started = time.monotonic()
+
+        async with condition:
+            heapq.heappush(self._waiters, entry)
+            try:
+                while True:
+                    now = time.monotonic()
+                    timeout = None
+                    if self._waiters[0] == entry:
+                        delay = self._delay_for(tokens, now)
+                        if delay <= 0:
+                            self._commit(tokens, now)
+                            waited = now - started
+                            if waited > 0.05:
+                                self.stats['throttled'] += 1
+                                self.stats['wait_seconds'] += waited
+                            return True
+                        timeout = delay
+                        if max_wait is not None and now - started + delay > max_wait:
+                            self.stats['gave_up'] += 1
+                            logger.warning(f"⏳ Groq budget frees up in {delay:.1f}s, beyond the {max_wait:.0f}s limit")
+                            return False
+                    elif max_wait is not None:
+                        timeout = max_wait - (now - started)
+                        if timeout <= 0:
+                            self.stats['gave_up'] += 1
+                            return False
+                    try:
+                        await asyncio.wait_for(condition.wait(), timeout)
+                    except asyncio.TimeoutError:
+                        pass
+            finally:
+                self._waiters.remove(entry)
+                heapq.heapify(self._waiters)
+                condition.notify_all()
+
+    def _commit(self, tokens: int, now: float):
+        """Book a call that is about to be sent"""
+        self.window.append((now, tokens))
+        self.history.append(now)
+        self.stats['requests'] += 1
+        self.stats['tokens_estimated'] += tokens
+        for key in ('remaining_requests', 'remaining_tokens'):
+            if self.server[key] is not None:
+                self.server[key] -= 1 if key == 'remaining_requests' else tokens
+
+    def record_response(self, headers, estimated_tokens: int, used_tokens: Optional[int] = None):
+        """Update budgets from a response's headers and the usage it reported"""
+        now = time.monotonic()
+        if used_tokens is not None:
+            self.stats['tokens_used'] += used_tokens
+            # Replace the estimate of this call (the newest entry of that size) with the real usage
+            for index in range(len(self.window) - 1, -1, -1):
+                if self.window[index][1] == estimated_tokens:
+                    self.window[index] = (self.window[index][0], used_tokens)
+                    break
+
+        if not headers:
+            return
+        for kind in ('requests', 'tokens'):
+            remaining = headers.get(f'x-ratelimit-remaining-{kind}')
+            reset = parse_reset_duration(headers.get(f'x-ratelimit-reset-{kind}'))
+            try:
+                if remaining is not None:
+                    self.server[f'remaining_{kind}'] = float(remaining)
+            except ValueError:
+                continue
+            if reset is not None:
+                self.server[f'{kind}_reset_at'] = now + reset
+
+    def record_rate_limited(self, retry_after: Optional[str] = None):
+        """A 429 got through: pause every call until Groq says to retry"""
+        self.stats['rate_limited'] += 1
+        delay = parse_reset_duration(retry_after) or WINDOW_SECONDS / self.requests_per_minute
+        self.blocked_until = max(self.blocked_until, time.monotonic() + delay)
+        logger.warning(f"🚦 Groq rate limit hit, pausing AI calls for {delay:.1f}s")
+
+    def forecast(self) -> Dict[str, Optional[float]]:
+        """
+        Seconds until each quota runs out at the current pace (None = not before it resets)
+        requests: server-reported request quota (daily on Groq) at the last hour's request rate
+        tokens: this minute's token budget at the current minute's spend rate
+        """
+        now = time.monotonic()
+        self._prune(now)
+        result: Dict[str, Optional[float]] = {'requests': None, 'tokens': None}
+
+        remaining_requests = self.server['remaining_requests']
+        reset_at = self.server['requests_reset_at']
+        if remaining_requests is not None and self.history:
+            elapsed = max(now - self.history[0], WINDOW_SECONDS)
+            rate = len(self.history) / elapsed
+            seconds = max(remaining_requests, 0) / rate
+            if reset_at is None or now + seconds < reset_at:
+                result['requests'] = seconds
+
+        if self.window:
+            elapsed = max(now - self.window[0][0], 1.0)
+            token_rate = self._window_tokens() / elapsed
+            remaining_tokens = self.tokens_per_minute - self._window_tokens()
+            if self.server['remaining_tokens'] is not None:
+                remaining_tokens = min(remaining_tokens, self.server['remaining_tokens'])
+            seconds = max(remaining_tokens, 0) / token_rate if token_rate else None
+            window_reset = self.window[0][0] + WINDOW_SECONDS - now
+            if seconds is not None and seconds < window_reset:
+                result['tokens'] = seconds
+
+        return result
+
+    def get_stats(self) -> Dict[str, object]:
+        """Usage, throttling and exhaustion forecasts for logging"""
+        now = time.monotonic()
+        self._prune(now)
+        return {
+            **self.stats,
+            'window_requests': len(self.window),
+            'window_tokens': self._window_tokens(),
+            'queued': len(self._waiters),
+            'server_remaining_requests': self.server['remaining_requests'],
+            'server_remaining_tokens': self.server['remaining_tokens'],
+            'forecast_exhaustion_seconds': self.forecast(),
+        }
@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+"""
+Image validation cache
+Candidate image URLs are checked concurrently with a HEAD request (status, type, size)
+before they are handed to sendPhoto; results are cached by URL so a feed's recurring
+images are checked once and a broken URL costs one HEAD instead of a failed post
+"""
+import asyncio
+import logging
+import time
+from collections import OrderedDict
+from typing import Dict, Iterable, Optional, Tuple
+
+import aiohttp
+
+logger = logging.getLogger(__name__)
+
+# Types Telegram renders as photos, and its size limit for photos sent by URL
+PHOTO_CONTENT_TYPES = ('image/jpeg', 'image/jpg', 'image/png', 'image/webp', 'image/gif')
+MAX_PHOTO_BYTES = 5 * 1024 * 1024
+
+
+class ImageCache:
+    """Concurrent image URL validator with a TTL'd LRU of results"""
+
+    def __init__(self, size: int = 1000, ttl_seconds: float = 6 * 3600, timeout: float = 3.0,
+                 concurrency: int = 8):
+        self.size = size
+        self.ttl_seconds = ttl_seconds
+        self.timeout = timeout
+        self.semaphore = asyncio.Semaphore(concurrency)
+
+        # url -> (valid, checked_at)
+        self.results: "OrderedDict[str, Tuple[bool, float]]" = OrderedDict()
+        self.pending: Dict[str, asyncio.Task] = {}
+        self.session: Optional[aiohttp.ClientSession] = None
+
+        self.stats = {
+            'hits': 0,
+            'checked': 0,
+            'valid': 0,
+            'rejected': 0,
+        }
+
+    async def _get_session(self) -> aiohttp.ClientSession:
+        """Pooled session for all checks (created on first use)"""
+        if self.session is None or self.session.closed:
+            self.session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=20, keepalive_timeout=60),
+                timeout=aiohttp.ClientTimeout(total=self.timeout),
+                headers={'User-Agent': 'Mozilla/5.0 (compatible; NewsBot/1.0)'}
+            )
+        return self.session
+
+    def _cached(self, url: str) -> Optional[bool]:
+        """Cached verdict for a URL, or None if unknown or expired"""
+        entry = self.results.get(url)
+        if entry is None:
+            return None
+        valid, checked_at = entry
+        if time.time() - checked_at >= self.ttl_seconds:
+            del self.results[url]
+            return None
+        self.results.move_to_end(url)
+        return valid
+
+    def _remember(self, url: str, valid: bool):
+        """Store a verdict, evicting the least recently used one"""
+        self.results[url] = (valid, time.time())
+        self.results.move_to_end(url)
+        if len(self.results) > self.size:
+            self.results.popitem(last=False)
+
+    async def _check(self, url: str) -> bool:
+        """One HEAD request: 200, a photo content type and within Telegram's size limit"""
+        async with self.semaphore:
+            try:
+                session = await self._get_session()
+                async with session.head(url, allow_redirects=True) as response:
+                    if response.status in (403, 405):
+                        # Some CDNs refuse HEAD; a one-byte ranged GET answers the same questions
+                        async with session.get(url, headers={'Range': 'bytes=0-0'}) as ranged:
+                            return self._acceptable(ranged)
+                    return self._acceptable(response)
+            except (aiohttp.ClientError, asyncio.TimeoutError, ValueError) as e:
+                logger.debug(f"📸 Image check failed for {url}: {e}")
+                return False
+
+    @staticmethod
+    def _acceptable(response: aiohttp.ClientResponse) -> bool:
+        """True if the response describes an image Telegram will accept by URL"""
+        if response.status not in (200, 206):
+            return False
+        content_type = response.headers.get('Content-Type', '').split(';')[0].strip().lower()
+        if content_type not in PHOTO_CONTENT_TYPES:
+            return False
+        if response.status == 206:
+            # Content-Range: bytes 0-0/<total>
+            total = response.headers.get('Content-Range', '').rpartition('/')[2]
+        else:
+            total = response.headers.get('Content-Length', '')
+        return not total.isdigit() or int(total) <= MAX_PHOTO_BYTES
+
+    async def _validate_uncached(self, url: str) -> bool:
+        """Run a check and record its verdict"""
+        try:
+            valid = await self._check(url)
+        finally:
+            self.pending.pop(url, None)
+        self.stats['checked'] += 1
+        self.stats['valid' if valid else 'rejected'] += 1
+        self._remember(url, valid)
+        return valid
+
+    def prefetch(self, url: Optional[str]):
+        """Start checking a URL in the background (no-op if cached or already in flight)"""
+        if not url or url in self.pending or self._cached(url) is not None:
+            return
+        self.pending[url] = asyncio.create_task(self._validate_uncached(url))
+
+    async def validate(self, url: Optional[str]) -> Optional[str]:
+        """The URL if it is a usable photo, else None (callers fall back to text)"""
+        if not url:
+            return None
+        valid = self._cached(url)
+        if valid is not None:
+            self.stats['hits'] += 1
+            return url if valid else None
+        self.prefetch(url)
+        task = self.pending.get(url)
+        valid = await asyncio.shield(task) if task else bool(self._cached(url))
+        return url if valid else None
+
+    async def validate_many(self, urls: Iterable[Optional[str]]) -> Dict[str, Optional[str]]:
+        """Validate URLs concurrently; url -> usable URL or None"""
+        unique = list(dict.fromkeys(url for url in urls if url))
+        results = await asyncio.gather(*(self.validate(url) for url in unique))
+        return dict(zip(unique, results))
+
+    def reject(self, url: str):
+        """Record a URL Telegram refused despite passing the check"""
+        self._remember(url, False)
+        self.stats['rejected'] += 1
+
+    async def close(self):
+        """Cancel checks in flight and close the session"""
+        for task in self.pending.values():
+            task.cancel()
+        await asyncio.gather(*self.pending.values(), return_exceptions=True)
+        self.pending.clear()
+        if self.session and not self.session.closed:
+            await self.session.close()
@@ -21,7 +21,7 @@ import random
 import time
 from datetime import datetime, timezone, timedelta
 from typing import List, Dict, Optional, Any
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from bs4 import BeautifulSoup
 import hashlib
 import re
@@ -37,12 +37,118 @@ from urllib3.util.retry import Retry
 import urllib3
 import feedparser
 
+from publish_time import publish_time_parser, now_timestamp
+from economic_event_store import EconomicEventStore, EventChange
+from keyword_matcher import keyword_matcher
+from article_features import ArticleFeatures, extract_features
+from article_priority import breaking_score
+
 # Suppress SSL warnings for stealth mode
 urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
 warnings.filterwarnings('ignore', message='Unverified HTTPS request')
 
 logger = logging.getLogger(__name__)
 
+# Content keywords per section, checked in order ('crypto*' also matches 'cryptocurrency')
+SECTION_CONTENT_KEYWORDS = {
+    'CRYPTOCURRENCY': ['bitcoin', 'crypto*', 'ethereum'],
+    'ECONOMIC-INDICATORS': ['fed', 'jobs', 'unemployment', 'inflation', 'gdp'],
+    'STOCK-MARKET': ['stock', 'shares', 'earnings', 'nasdaq', 'dow'],
+    'FOREX': ['dollar', 'yen', 'euro', 'forex', 'currency'],
+    'COMMODITIES': ['gold', 'oil', 'commodity', 'crude'],
+}
+
+# BLITZ: Breaking news detection and prioritization
+BREAKING_INDICATORS = [
+    'breaking', 'urgent', 'alert', 'just in', 'live', 'now', 'latest',
+    'fed', 'federal reserve', 'crisis', 'crash', 'surge', 'soars', 'plunges',
+    'bitcoin', 'crypto*', 'ethereum', 'inflation', 'jobs', 'unemployment',
+    'earnings', 'market', 'dow', 'nasdaq', 'sp500', 'tesla', 'apple',
+    'oil', 'gold', 'dollar', 'euro', 'yen', 'pound', 'rate', 'cut', 'hike',
+    'emergency', 'stimulus', 'bailout', 'recession', 'recovery', 'gdp'
+]
+BREAKING_HIGH_PRIORITY = ['fed', 'bitcoin', 'crash', 'surge']
+BREAKING_URGENT = ['breaking', 'urgent', 'just in']
+BLITZ_INCLUDE_KEYWORDS = ['market', 'economic', 'stock', 'commodity', 'forex', 'crypto*', 'bitcoin', 'ethereum', 'blockchain']
+
+# ✅ REQUIRED: Financial market keywords for investing.com relevance
+RELEVANCE_SECTION_KEYWORDS = {
+    'headlines': ['news', 'breaking', 'market', 'economy', 'finance', 'business'],
+    'economic_indicators': ['fed', 'federal reserve', 'inflation', 'unemployment', 'jobs', 'gdp', 'cpi', 'pmi', 'rates'],
+    'stock_market': ['stock', 'shares', 'dow', 'nasdaq', 'sp500', 'earnings', 'ipo', 'dividend'],
+    'commodities': ['gold', 'oil', 'silver', 'copper', 'gas', 'wheat', 'corn', 'commodity'],
+    'forex': ['dollar', 'euro', 'yen', 'pound', 'currency', 'forex', 'exchange', 'usd', 'eur', 'gbp'],
+    'cryptocurrency': ['bitcoin', 'crypto*', 'ethereum', 'blockchain', 'btc', 'eth', 'defi', 'nft']
+}
+# 🔥 PRIORITY: High-impact financial keywords
+RELEVANCE_HIGH_PRIORITY = [
+    'fed', 'federal reserve', 'interest rate', 'inflation', 'bitcoin', 'crypto*',
+    'market crash', 'market surge', 'breaking', 'urgent', 'economy', 'recession',
+    'earnings', 'revenue', 'profit', 'ipo', 'merger', 'acquisition'
+]
+
+# Financial keywords with scoring weights for RSS feed entries
+FEED_KEYWORD_SCORES = {
+    # High priority (crypto/fintech)
+    'bitcoin': 3, 'ethereum': 3, 'crypto*': 3, 'blockchain': 3, 'defi': 3,
+    'fed': 3, 'federal reserve': 3, 'interest rate': 3, 'inflation': 3,
+    # Medium priority (markets)
+    'dollar': 2, 'market': 2, 'trading': 2, 'stock': 2, 'forex': 2,
+    'unemployment': 2, 'jobs': 2, 'gdp': 2, 'economy': 2,
+    # Lower priority (general finance)
+    'finance': 1, 'investment': 1, 'business': 1, 'earnings': 1,
+}
+
+# 🚫 Insider trading detection (boring director buy/sell articles)
+INSIDER_PERSON_KEYWORDS = ['director', 'ceo', 'cfo', 'cio', 'evp', 'vp', 'president']
+INSIDER_ACTION_KEYWORDS = ['buys', 'sells', 'purchases', 'sells shares', 'buys shares']
+INSIDER_AMOUNT_KEYWORDS = ['stock', 'shares']
+INSIDER_PATTERNS = [
+    re.compile(r'\w+\s+(director|ceo|cfo|cio|evp|vp)\s+\w+\s+(buys|sells)'),
+    re.compile(r'\w+\s+(buys|sells)\s+\$[\d,]+\s+in\s+\w+\s+(stock|shares)'),
+    re.compile(r'insider\s+(trading|buys|sells)'),
+]
+
+# Content keywords used when fixing article sections
+FIX_SECTION_FOREX_KEYWORDS = ['dollar', 'euro', 'yen', 'currency', 'exchange', 'forex']
+FIX_SECTION_CRYPTO_KEYWORDS = ['bitcoin', 'crypto*', 'ethereum', 'blockchain']
+FIX_SECTION_GENERAL_FOREX_KEYWORDS = ['dollar', 'forex', 'currency', 'exchange']
+
+# 🔍 Arabic event names: more specific patterns first, then general ones
+ARABIC_EVENT_PATTERNS = [
+    ('mi inflation gauge', 'مؤشر التضخم الشهري الأسترالي'),
+    ('inflation gauge', 'مؤشر التضخم'),
+    ('unemployment rate', 'معدل البطالة'),
+    ('non farm payrolls', 'فرص العمل الأمريكية'),
+    ('nonfarm payrolls', 'فرص العمل الأمريكية'),
+    ('jobless claims', 'طلبات إعانة البطالة'),
+    ('core cpi', 'مؤشر أسعار المستهلك الأساسي'),
+    ('cpi', 'مؤشر أسعار المستهلك'),
+    ('retail sales', 'مبيعات التجزئة'),
+    ('interest rate decision', 'قرار أسعار الفائدة'),
+    ('manufacturing pmi', 'مؤشر مديري المشتريات الصناعي'),
+    ('services pmi', 'مؤشر مديري المشتريات الخدمي'),
+    ('chicago pmi', 'مؤشر مديري المشتريات من شيكاغو'),
+    ('ism manufacturing', 'مؤشر مديري المشتريات الصناعي'),
+]
+
+for _section, _keywords in SECTION_CONTENT_KEYWORDS.items():
+    keyword_matcher.add_keywords(f'section:{_section}', _keywords)
+for _section, _keywords in RELEVANCE_SECTION_KEYWORDS.items():
+    keyword_matcher.add_keywords(f'investing:{_section}', _keywords)
+keyword_matcher.add_keywords('investing:high_priority', RELEVANCE_HIGH_PRIORITY)
+keyword_matcher.add_keywords('breaking:indicator', BREAKING_INDICATORS)
+keyword_matcher.add_keywords('breaking:high_priority', BREAKING_HIGH_PRIORITY)
+keyword_matcher.add_keywords('breaking:urgent', BREAKING_URGENT)
+keyword_matcher.add_keywords('blitz:include', BLITZ_INCLUDE_KEYWORDS)
+keyword_matcher.add_keywords('feed:scored', FEED_KEYWORD_SCORES)
+keyword_matcher.add_keywords('insider:person', INSIDER_PERSON_KEYWORDS)
+keyword_matcher.add_keywords('insider:action', INSIDER_ACTION_KEYWORDS)
+keyword_matcher.add_keywords('insider:amount', INSIDER_AMOUNT_KEYWORDS)
+keyword_matcher.add_keywords('fix:economy_forex', FIX_SECTION_FOREX_KEYWORDS)
+keyword_matcher.add_keywords('fix:crypto', FIX_SECTION_CRYPTO_KEYWORDS)
+keyword_matcher.add_keywords('fix:forex', FIX_SECTION_GENERAL_FOREX_KEYWORDS)
+
 @dataclass
 class NewsArticle:
     """Represents a news article from investing.com"""
@@ -53,11 +159,19 @@ class NewsArticle:
     section: str  # Breaking News, Currencies, Commodities, etc.
     article_id: str
     image_url: Optional[str] = None  # NEW: Image URL from RSS enclosure
+    timestamp: int = 0  # Publish time as UTC epoch seconds (0 = unknown)
+    features: Optional[ArticleFeatures] = field(default=None, repr=False, compare=False)
     
     def __post_init__(self):
         if not self.article_id:
             content = f"{self.title}_{self.link}"
             self.article_id = hashlib.md5(content.encode()).hexdigest()[:12]
+        # Parse the publish date once at ingest so ordering/freshness are integer compares
+        if not self.timestamp:
+            self.timestamp = publish_time_parser.parse(self.published, self.section)
+        # Derive text features once so filters and formatters never rescan the text
+        if self.features is None:
+            self.features = extract_features(self.title, self.summary, self.link, self.timestamp)
 
 @dataclass
 class EconomicEvent:
@@ -71,10 +185,11 @@ class EconomicEvent:
     forecast: Optional[str] = None
     previous: Optional[str] = None
     currency: str = "USD"
+    event_date: str = ""  # YYYY-MM-DD of the calendar page the event came from
     
     def __post_init__(self):
-        # Generate unique ID for event
-        content = f"{self.time}_{self.country}_{self.event_name}"
+        # Generate unique ID for event (date included so recurring releases don't collide)
+        content = f"{self.event_date}_{self.time}_{self.country}_{self.event_name}"
         self.event_id = hashlib.md5(content.encode()).hexdigest()[:12]
 
 class InvestingNewsScraper:
@@ -87,7 +202,11 @@ class InvestingNewsScraper:
         self.base_url = "https://www.investing.com"
         self.session = None
         self.seen_articles = set()
-        self.seen_events = set()
+        
+        # Persistent economic calendar store - scrapes are diffed against it
+        from config_free import Config
+        self.event_store = EconomicEventStore(Config.ECONOMIC_EVENTS_FILE)
+        self.calendar_validators = {}  # url -> ETag / Last-Modified for conditional GETs
         
         # Initialize realistic user agent generator
         try:
@@ -677,7 +796,8 @@ class InvestingNewsScraper:
                         summary=summary,
                         section='CRYPTOCURRENCY',
                         article_id=hashlib.md5(f"{title}_{link}".encode()).hexdigest()[:12],
-                        image_url=image_url  # Include image URL
+                        image_url=image_url,  # Include image URL
+                        timestamp=publish_time_parser.parse_entry(entry, 'coindesk')
                     )
                     
                     articles.append(article)
@@ -687,8 +807,8 @@ class InvestingNewsScraper:
                     logger.error(f"💥 COINDESK: Error parsing entry: {e}")
                     continue
             
-            # Sort articles by published date (oldest first) - user requested this order
-            articles.sort(key=lambda x: x.published, reverse=False)
+            # Sort articles by publish time (oldest first) - user requested this order
+            articles.sort(key=lambda x: x.timestamp)
             
             logger.info(f"✅ COINDESK: Successfully parsed {len(articles)} articles with images and descriptions")
             return articles
@@ -776,8 +896,8 @@ class InvestingNewsScraper:
         logger.info(f"🏆 PROFESSIONAL RSS: Fetched {total_fetched} articles from {len(rss_feeds)} feeds")
         
         if all_articles:
-            # Sort by published date (oldest first) - user requested this order
-            all_articles.sort(key=lambda x: x.published, reverse=False)
+            # Sort by publish time (oldest first) - user requested this order
+            all_articles.sort(key=lambda x: x.timestamp)
             
             # Apply deduplication
             unique_articles = self._simple_deduplicate(all_articles)
@@ -853,7 +973,8 @@ class InvestingNewsScraper:
                                     summary=summary[:300] + "..." if len(summary) > 300 else summary,
                                     section=article_section,
                                     article_id="",
-                                    image_url=image_url
+                                    image_url=image_url,
+                                    timestamp=publish_time_parser.parse_entry(entry, section)
                                 )
                                 
                                 articles.append(article)
@@ -877,8 +998,6 @@ class InvestingNewsScraper:
     
     def _detect_article_section(self, link: str, title: str, summary: str) -> str:
         """🎯 Smart section detection from URL and content"""
-        content = f"{link} {title} {summary}".lower()
-        
         # Detect from URL path
         if 'stock-market' in link or 'equities' in link:
             return 'STOCK-MARKET'
@@ -894,16 +1013,10 @@ class InvestingNewsScraper:
             return 'EARNINGS'
         
         # Detect from content
-        if any(word in content for word in ['bitcoin', 'crypto', 'ethereum']):
-            return 'CRYPTOCURRENCY'
-        elif any(word in content for word in ['fed', 'jobs', 'unemployment', 'inflation', 'gdp']):
-            return 'ECONOMIC-INDICATORS'  
-        elif any(word in content for word in ['stock', 'shares', 'earnings', 'nasdaq', 'dow']):
-            return 'STOCK-MARKET'
-        elif any(word in content for word in ['dollar', 'yen', 'euro', 'forex', 'currency']):
-            return 'FOREX'
-        elif any(word in content for word in ['gold', 'oil', 'commodity', 'crude']):
-            return 'COMMODITIES'
+        matches = keyword_matcher.scan(link, title, summary)
+        for section in SECTION_CONTENT_KEYWORDS:
+            if matches.has(f'section:{section}'):
+                return section
         
         return 'BREAKING-NEWS'  # Default
 
@@ -1034,15 +1147,15 @@ class InvestingNewsScraper:
                                 summary=summary[:200] + "..." if len(summary) > 200 else summary,
                                 section=section_names.get(feed_name, f"BLITZ-{feed_name.upper()}"),
                                 article_id="",
-                                image_url=image_url  # NEW: Include image URL
+                                image_url=image_url,  # NEW: Include image URL
+                                timestamp=now_timestamp()
                             )
                             
                             # ENHANCED: Include ALL required sections + breaking news
-                            content = f"{title} {summary}"
                             # ENHANCED: Include articles from ALL feeds including external sources
                             if (self._is_breaking_news(article) or 
                                 feed_name in ['headlines', 'economic_indicators', 'stock_market', 'commodities', 'forex', 'cryptocurrency', 'marketwatch', 'cointelegraph', 'breaking', 'economy'] or
-                                any(keyword in content.lower() for keyword in ['market', 'economic', 'stock', 'commodity', 'forex', 'crypto', 'bitcoin', 'ethereum', 'blockchain'])):
+                                article.features.has('blitz:include')):
                                 articles.append(article)
                                 logger.info(f"⚡ {section_names.get(feed_name, feed_name.upper())}: {title[:50]}...")
                             
@@ -1063,40 +1176,10 @@ class InvestingNewsScraper:
 
     def _is_breaking_news(self, article: NewsArticle) -> bool:
         """BLITZ: Identify breaking news articles"""
-        content = f"{article.title} {article.summary}".lower()
-        
-        breaking_indicators = [
-            'breaking', 'urgent', 'alert', 'just in', 'live', 'now', 'latest',
-            'fed', 'federal reserve', 'crisis', 'crash', 'surge', 'soars', 'plunges',
-            'bitcoin', 'crypto', 'ethereum', 'inflation', 'jobs', 'unemployment',
-            'earnings', 'market', 'dow', 'nasdaq', 'sp500', 'tesla', 'apple',
-            'oil', 'gold', 'dollar', 'euro', 'yen', 'pound', 'rate', 'cut', 'hike',
-            'emergency', 'stimulus', 'bailout', 'recession', 'recovery', 'gdp'
-        ]
-        
-        score = sum(1 for indicator in breaking_indicators if indicator in content)
-        return score >= 1 or 'BREAKING' in article.section
+        return article.features.has('breaking:indicator') or 'BREAKING' in article.section
 
     def _prioritize_breaking_news(self, articles: List[NewsArticle]) -> List[NewsArticle]:
         """BLITZ: Sort articles by breaking news priority"""
-        def breaking_score(article):
-            score = 0
-            content = f"{article.title} {article.summary}".lower()
-            
-            # High priority keywords
-            if any(word in content for word in ['fed', 'bitcoin', 'crash', 'surge']):
-                score += 10
-            
-            # Breaking indicators
-            if any(word in content for word in ['breaking', 'urgent', 'just in']):
-                score += 5
-                
-            # Recent time bonus
-            if 'BREAKING' in article.section:
-                score += 3
-                
-            return score
-        
         return sorted(articles, key=breaking_score, reverse=True)
     
     async def _hardcore_investing_scraping(self, max_articles: int) -> List[NewsArticle]:
@@ -1995,38 +2078,15 @@ class InvestingNewsScraper:
     
     def _is_relevant_investing_article(self, article: NewsArticle) -> bool:
         """🎯 STRICT: Financial markets ONLY - NO world news, politics, wars, sports"""
-        content = f"{article.title} {article.summary}".lower()
-        
-        # ✅ REQUIRED: Financial market keywords
-        section_keywords = {
-            'headlines': ['news', 'breaking', 'market', 'economy', 'finance', 'business'],
-            'economic_indicators': ['fed', 'federal reserve', 'inflation', 'unemployment', 'jobs', 'gdp', 'cpi', 'pmi', 'rates'],
-            'stock_market': ['stock', 'shares', 'dow', 'nasdaq', 'sp500', 'earnings', 'ipo', 'dividend'],
-            'commodities': ['gold', 'oil', 'silver', 'copper', 'gas', 'wheat', 'corn', 'commodity'],
-            'forex': ['dollar', 'euro', 'yen', 'pound', 'currency', 'forex', 'exchange', 'usd', 'eur', 'gbp'],
-            'cryptocurrency': ['bitcoin', 'crypto', 'ethereum', 'blockchain', 'btc', 'eth', 'defi', 'nft']
-        }
-        
-        # 🔥 PRIORITY: High-impact financial keywords
-        high_priority = [
-            'fed', 'federal reserve', 'interest rate', 'inflation', 'bitcoin', 'crypto', 
-            'market crash', 'market surge', 'breaking', 'urgent', 'economy', 'recession',
-            'earnings', 'revenue', 'profit', 'ipo', 'merger', 'acquisition'
-        ]
+        matches = article.features.matches
         
         # Calculate financial relevance score
-        score = 0
-        
         # High priority gets maximum score
-        for keyword in high_priority:
-            if keyword in content:
-                score += 3
+        score = 3 * matches.count('investing:high_priority')
         
         # Section-specific keywords
-        for section, keywords in section_keywords.items():
-            for keyword in keywords:
-                if keyword in content:
-                    score += 1
+        for section in RELEVANCE_SECTION_KEYWORDS:
+            score += matches.count(f'investing:{section}')
         
         # Always include if from financial sections
         section_indicators = ['headlines', 'economic', 'stock', 'commodities', 'forex', 'crypto']
@@ -2135,7 +2195,8 @@ class InvestingNewsScraper:
                                         published=published,
                                         summary=summary[:200] + "..." if len(summary) > 200 else summary,
                                         section=f"Investing.com {feed_name.split('_')[1].title()}",
-                                        article_id=""
+                                        article_id="",
+                                        timestamp=publish_time_parser.parse_entry(entry, feed_name)
                                     )
                                     
                                     # ENHANCED: Better section tagging and relevance
@@ -2245,18 +2306,6 @@ class InvestingNewsScraper:
         """PROFESSIONAL: Process RSS feed entries with advanced filtering"""
         articles = []
         
-        # Financial keywords with scoring weights
-        keyword_scores = {
-            # High priority (crypto/fintech)
-            'bitcoin': 3, 'ethereum': 3, 'crypto': 3, 'blockchain': 3, 'defi': 3,
-            'fed': 3, 'federal reserve': 3, 'interest rate': 3, 'inflation': 3,
-            # Medium priority (markets)
-            'dollar': 2, 'market': 2, 'trading': 2, 'stock': 2, 'forex': 2,
-            'unemployment': 2, 'jobs': 2, 'gdp': 2, 'economy': 2,
-            # Lower priority (general finance)
-            'finance': 1, 'investment': 1, 'business': 1, 'earnings': 1,
-        }
-        
         processed_count = 0
         for entry in entries:
             if processed_count >= max_entries:
@@ -2274,12 +2323,7 @@ class InvestingNewsScraper:
                         continue
                     
                 # PROFESSIONAL: Advanced relevance scoring
-                content = f"{title} {summary}".lower()
-                relevance_score = 0
-                
-                for keyword, weight in keyword_scores.items():
-                    if keyword in content:
-                        relevance_score += weight
+                relevance_score = keyword_matcher.scan(title, summary).score(FEED_KEYWORD_SCORES)
                 
                 # Skip low-relevance articles
                 if relevance_score < 1:
@@ -2301,13 +2345,14 @@ class InvestingNewsScraper:
                     published=published,
                     summary=summary[:300] + "..." if len(summary) > 300 else summary,
                     section=f"{source_name.replace('_', ' ').title()} (Score: {relevance_score})",
-                    article_id=""
+                    article_id="",
+                    timestamp=publish_time_parser.parse_entry(entry, source_name)
                 )
                 
-                # Check for duplicates
-                if article.article_id not in self.seen_articles:
+                # Check for duplicates (canonical ID: tracked and re-shared links of one story match)
+                if article.features.canonical_id not in self.seen_articles:
                     articles.append(article)
-                    self.seen_articles.add(article.article_id)
+                    self.seen_articles.add(article.features.canonical_id)
                     processed_count += 1
                 
             except Exception as e:
@@ -2350,6 +2395,30 @@ class InvestingNewsScraper:
             # Return empty list instead of fake data
             return []
     
+    async def scrape_economic_calendar_changes(self) -> List[EventChange]:
+        """
+        Scrape the economic calendar and return only what changed since the last scrape
+        (new events, released actuals, forecast/previous revisions)
+        """
+        events = await self.scrape_economic_calendar()
+        if not events:
+            return []
+        return self.event_store.apply(events)
+    
+    async def poll_calendar_changes(self) -> List[EventChange]:
+        """
+        ⚡ Lightweight calendar poll for release time: one conditional GET, no fallback
+        methods or delays. Returns [] when the page is unchanged (HTTP 304) or unavailable.
+        """
+        content = await self._fetch_calendar_conditional("https://www.investing.com/economic-calendar/")
+        if not content:
+            return []
+        
+        events = await self._parse_calendar_events(content)
+        if not events:
+            return []
+        return self.event_store.apply(events)
+    
     async def _scrape_real_calendar(self) -> List[EconomicEvent]:
         """REAL DATA: Scrape actual economic calendar from investing.com/economic-calendar"""
         logger.info("🎯 SCRAPING REAL DATA: Getting actual economic events from investing.com/economic-calendar")
@@ -2449,26 +2518,8 @@ class InvestingNewsScraper:
         """Convert English economic event name to Arabic"""
         event_lower = event_name.lower()
         
-        # 🔍 ENHANCED: More specific patterns first, then general ones
-        specific_patterns = [
-            ('mi inflation gauge', 'مؤشر التضخم الشهري الأسترالي'),
-            ('inflation gauge', 'مؤشر التضخم'),
-            ('unemployment rate', 'معدل البطالة'),
-            ('non farm payrolls', 'فرص العمل الأمريكية'),
-            ('nonfarm payrolls', 'فرص العمل الأمريكية'),
-            ('jobless claims', 'طلبات إعانة البطالة'),
-            ('core cpi', 'مؤشر أسعار المستهلك الأساسي'),
-            ('cpi', 'مؤشر أسعار المستهلك'),
-            ('retail sales', 'مبيعات التجزئة'),
-            ('interest rate decision', 'قرار أسعار الفائدة'),
-            ('manufacturing pmi', 'مؤشر مديري المشتريات الصناعي'),
-            ('services pmi', 'مؤشر مديري المشتريات الخدمي'),
-            ('chicago pmi', 'مؤشر مديري المشتريات من شيكاغو'),
-            ('ism manufacturing', 'مؤشر مديري المشتريات الصناعي'),
-        ]
-        
         # Check specific patterns first
-        for pattern, translation in specific_patterns:
+        for pattern, translation in ARABIC_EVENT_PATTERNS:
             if pattern in event_lower:
                 return translation
         
@@ -2507,10 +2558,8 @@ class InvestingNewsScraper:
             articles_list = list(self.seen_articles)
             self.seen_articles = set(articles_list[-100:])
             
-        if len(self.seen_events) > 100:
-            # Keep only last 50 events  
-            events_list = list(self.seen_events)
-            self.seen_events = set(events_list[-50:])
+        # Drop calendar events nobody has touched for a few days
+        self.event_store.cleanup_old_events()
             
         logger.info("🧹 Cleaned up memory cache")
 
@@ -2631,6 +2680,40 @@ class InvestingNewsScraper:
             logger.error(f"💥 Error in calendar data fetch: {e}")
             return None
 
+    async def _fetch_calendar_conditional(self, url: str) -> Optional[str]:
+        """Fetch calendar with If-None-Match / If-Modified-Since, returning None on 304"""
+        try:
+            await self.create_session()
+            
+            headers = {
+                'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
+                'Accept-Language': 'en-US,en;q=0.9',
+                'Accept-Encoding': 'gzip, deflate, br',
+            }
+            validators = self.calendar_validators.get(url, {})
+            if validators.get('etag'):
+                headers['If-None-Match'] = validators['etag']
+            if validators.get('last_modified'):
+                headers['If-Modified-Since'] = validators['last_modified']
+            
+            async with self.session.get(url, headers=headers, timeout=10) as response:
+                if response.status == 304:
+                    logger.debug("📅 Calendar unchanged (304)")
+                    return None
+                if response.status != 200:
+                    logger.debug(f"📅 Conditional calendar fetch failed: HTTP {response.status}")
+                    return None
+                
+                self.calendar_validators[url] = {
+                    'etag': response.headers.get('ETag'),
+                    'last_modified': response.headers.get('Last-Modified'),
+                }
+                return await response.text()
+                
+        except Exception as e:
+            logger.debug(f"Conditional calendar fetch error: {e}")
+            return None
+
     async def _fetch_calendar_aiohttp(self, url: str, headers: Dict[str, str]) -> Optional[str]:
         """Fetch calendar using aiohttp"""
         try:
@@ -2723,7 +2806,8 @@ class InvestingNewsScraper:
             current_time = datetime.now(timezone.utc)
             current_date = current_time.strftime('%Y-%m-%d')
             
-            for row in event_rows[:15]:  # Limit to 15 events
+            # All rows are parsed - the event store diff keeps downstream work to the deltas
+            for row in event_rows:
                 try:
                     event = await self._parse_single_event(row, current_date)
                     if event and self._is_important_event(event):
@@ -2825,7 +2909,8 @@ class InvestingNewsScraper:
                 actual=actual,
                 forecast=forecast,
                 previous=previous,
-                currency="USD" if country.upper() in ['US', 'USA', 'UNITED STATES'] else "USD"
+                currency="USD" if country.upper() in ['US', 'USA', 'UNITED STATES'] else "USD",
+                event_date=current_date
             )
             
             return event
@@ -2864,32 +2949,20 @@ class InvestingNewsScraper:
     def _is_insider_trading_news(self, title: str) -> bool:
         """🚫 Filter out boring insider trading news"""
         title_lower = title.lower()
-        
-        # Insider trading keywords
-        insider_keywords = [
-            'director', 'ceo', 'cfo', 'cio', 'evp', 'vp', 'president',
-            'buys', 'sells', 'purchases', 'acquires', 'disposes',
-            'insider', 'trading', 'shares', 'stock', 'holdings'
-        ]
+        matches = keyword_matcher.scan_text(title_lower)
         
         # Check if it's about someone buying/selling shares
-        has_person = any(word in title_lower for word in ['director', 'ceo', 'cfo', 'cio', 'evp', 'vp', 'president'])
-        has_action = any(word in title_lower for word in ['buys', 'sells', 'purchases', 'sells shares', 'buys shares'])
-        has_amount = '$' in title and any(word in title_lower for word in ['stock', 'shares'])
+        has_person = matches.has('insider:person')
+        has_action = matches.has('insider:action')
+        has_amount = '$' in title and matches.has('insider:amount')
         
         # If it has person + action + money amount, it's likely insider trading
         if has_person and has_action and has_amount:
             return True
             
         # Common patterns
-        insider_patterns = [
-            r'\w+\s+(director|ceo|cfo|cio|evp|vp)\s+\w+\s+(buys|sells)',
-            r'\w+\s+(buys|sells)\s+\$[\d,]+\s+in\s+\w+\s+(stock|shares)',
-            r'insider\s+(trading|buys|sells)',
-        ]
-        
-        for pattern in insider_patterns:
-            if re.search(pattern, title_lower):
+        for pattern in INSIDER_PATTERNS:
+            if pattern.search(title_lower):
                 return True
         
         return False
@@ -3019,8 +3092,7 @@ class InvestingNewsScraper:
                 article.section = 'CRYPTO-BLITZ'
             elif 'economy-news' in article.link:
                 # SMART: Check if it's actually forex content
-                content = f"{article.title} {article.summary}".lower()
-                if any(keyword in content for keyword in ['dollar', 'euro', 'yen', 'currency', 'exchange', 'forex']):
+                if article.features.has('fix:economy_forex'):
                     article.section = 'FOREX-BLITZ'
                 else:
                     article.section = 'ECONOMIC-BLITZ'  # Economy is part of economic indicators
@@ -3033,15 +3105,13 @@ class InvestingNewsScraper:
             
             # SMART: Advanced content analysis for general articles
             elif not article.section or 'BLITZ' not in article.section:
-                content = f"{article.title} {article.summary}".lower()
-                if any(keyword in content for keyword in ['bitcoin', 'crypto', 'ethereum', 'blockchain']):
+                matches = article.features.matches
+                if matches.has('fix:crypto'):
                     article.section = 'CRYPTO-BLITZ'
-                elif any(keyword in content for keyword in ['dollar', 'forex', 'currency', 'exchange']):
+                elif matches.has('fix:forex'):
                     article.section = 'FOREX-BLITZ'
-                elif any(keyword in content for keyword in ['stock', 'market', 'dow', 'nasdaq']):
-                    article.section = 'HEADLINES-BLITZ'
                 else:
-                    article.section = 'HEADLINES-BLITZ'  # Default to headlines
+                    article.section = 'HEADLINES-BLITZ'  # Stock/market and general articles go to headlines
             
             # Keep existing section if no match
             
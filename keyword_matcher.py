@@ -0,0 +1,280 @@
+#!/usr/bin/env python3
+"""
+Shared keyword matching engine for relevance, section, flag and sentiment scans
+One Aho-Corasick pass over an article's text finds every keyword from every table
+
+Keyword tables register themselves under a label (e.g. 'sentiment:positive').
+Matches respect word boundaries for ASCII keywords, so 'up' no longer fires
+inside 'update'. A keyword ending in '*' matches as a prefix ('crypto*' also
+matches 'cryptocurrency'). Non-ASCII keywords (Arabic) match as plain substrings
+because Arabic attaches prefixes like 'ال' directly to the word.
+"""
+import json
+import logging
+import os
+import sys
+import time
+from collections import OrderedDict, deque
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+PREFIX_MARKER = '*'
+
+# Inflections accepted after a whole-word keyword ('gain' -> 'gains', 'surge' -> 'surged')
+# Short keywords only take the plural so 'us' never matches 'used'
+PLURAL_SUFFIXES = ('s',)
+INFLECTION_SUFFIXES = ('s', 'es', 'ed', 'd', 'ing')
+MIN_INFLECTED_LENGTH = 4
+
+MATCH_CACHE_SIZE = 512
+
+
+def _is_word_char(char: str) -> bool:
+    """ASCII letters and digits form words for boundary checks"""
+    return char.isascii() and char.isalnum()
+
+
+class KeywordMatches:
+    """Match vector for one text: which keywords matched, grouped by label"""
+
+    __slots__ = ('keywords', 'labels')
+
+    def __init__(self):
+        self.keywords: Set[str] = set()
+        self.labels: Dict[str, Set[str]] = {}
+
+    def has(self, label: str) -> bool:
+        """True if any keyword of the label matched"""
+        return label in self.labels
+
+    def count(self, label: str) -> int:
+        """Number of distinct keywords of the label that matched"""
+        return len(self.labels.get(label, ()))
+
+    def get(self, label: str) -> Set[str]:
+        """Matched keywords of the label"""
+        return self.labels.get(label, set())
+
+    def score(self, weights: Dict[str, int]) -> int:
+        """Sum of weights of matched keywords"""
+        return sum(weights.get(keyword, 0) for keyword in self.keywords)
+
+    def __contains__(self, keyword: str) -> bool:
+        return keyword in self.keywords
+
+
+class KeywordMatcher:
+    """Aho-Corasick automaton built from all registered keyword tables"""
+
+    def __init__(self, cache_size: int = MATCH_CACHE_SIZE):
+        # pattern (lowercased, without marker) -> [(keyword as registered, label, is_prefix)]
+        self.patterns: Dict[str, List[Tuple[str, str, bool]]] = {}
+        self.cache_size = cache_size
+        self._cache: "OrderedDict[str, KeywordMatches]" = OrderedDict()
+        self._built = False
+
+        # Automaton tables
+        self._goto: List[Dict[str, int]] = []
+        self._fail: List[int] = []
+        self._output: List[List[str]] = []
+
+        self.stats = {'scans': 0, 'cache_hits': 0, 'builds': 0}
+
+    def add_keywords(self, label: str, keywords: Iterable[str]):
+        """Register a keyword table under a label (safe to call again with the same table)"""
+        for keyword in keywords:
+            is_prefix = keyword.endswith(PREFIX_MARKER)
+            pattern = keyword.rstrip(PREFIX_MARKER).lower()
+            if not pattern:
+                continue
+            entry = (keyword, label, is_prefix)
+            entries = self.patterns.setdefault(pattern, [])
+            if entry not in entries:
+                entries.append(entry)
+                self._built = False
+
+    def build(self):
+        """Compile the automaton (called lazily by scan after new keywords are added)"""
+        goto: List[Dict[str, int]] = [{}]
+        output: List[List[str]] = [[]]
+
+        for pattern in self.patterns:
+            node = 0
+            for char in pattern:
+                next_node = goto[node].get(char)
+                if next_node is None:
+                    goto.append({})
+                    output.append([])
+                    next_node = len(goto) - 1
+                    goto[node][char] = next_node
+                node = next_node
+            output[node].append(pattern)
+
+        # Breadth-first failure links, merging outputs along the failure chain
+        fail = [0] * len(goto)
+        queue = deque(goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for char, child in goto[node].items():
+                queue.append(child)
+                state = fail[node]
+                while state and char not in goto[state]:
+                    state = fail[state]
+                fail[child] = goto[state].get(char, 0)
+                output[child].extend(output[fail[child]])
+
+        self._goto, self._fail, self._output = goto, fail, output
+        self._cache.clear()
+        self._built = True
+        self.stats['builds'] += 1
+        logger.debug(f"🔎 Keyword matcher built: {len(self.patterns)} keywords, {len(goto)} states")
+
+    def scan(self, *parts: str) -> KeywordMatches:
+        """Single pass over the text (parts are joined with spaces) returning its match vector"""
+        return self.scan_text(' '.join(part for part in parts if part).lower())
+
+    def scan_text(self, text: str) -> KeywordMatches:
+        """Match vector for text that is already lowercased"""
+        cached = self._cache.get(text)
+        if cached is not None:
+            self._cache.move_to_end(text)
+            self.stats['cache_hits'] += 1
+            return cached
+
+        if not self._built:
+            self.build()
+
+        self.stats['scans'] += 1
+        matches = KeywordMatches()
+        goto, fail, output = self._goto, self._fail, self._output
+        node = 0
+
+        for index, char in enumerate(text):
+            while node and char not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(char, 0)
+            for pattern in output[node]:
+                self._record(matches, text, pattern, index + 1 - len(pattern), index + 1)
+
+        self._cache[text] = matches
+        if len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+        return matches
+
+    def _record(self, matches: KeywordMatches, text: str, pattern: str, start: int, end: int):
+        """Add a raw automaton hit to the match vector if it sits on word boundaries"""
+        if _is_word_char(pattern[0]) and start > 0 and _is_word_char(text[start - 1]):
+            return
+
+        whole_word = None  # Computed once, only if some entry needs it
+        for keyword, label, is_prefix in self.patterns[pattern]:
+            if not is_prefix and _is_word_char(pattern[-1]):
+                if whole_word is None:
+                    whole_word = self._ends_word(text, pattern, end)
+                if not whole_word:
+                    continue
+            matches.keywords.add(keyword)
+            matches.labels.setdefault(label, set()).add(keyword)
+
+    @staticmethod
+    def _ends_word(text: str, pattern: str, end: int) -> bool:
+        """True if the match ends a word, allowing simple English inflections"""
+        if end == len(text) or not _is_word_char(text[end]):
+            return True
+        suffixes = INFLECTION_SUFFIXES if len(pattern) >= MIN_INFLECTED_LENGTH else PLURAL_SUFFIXES
+        for suffix in suffixes:
+            suffix_end = end + len(suffix)
+            if text.startswith(suffix, end) and (suffix_end == len(text) or not _is_word_char(text[suffix_end])):
+                return True
+        return False
+
+    def get_labels(self) -> Set[str]:
+        """All registered labels"""
+        return {label for entries in self.patterns.values() for _, label, _ in entries}
+
+
+# Global matcher shared by the scrapers, bot and formatter
+keyword_matcher = KeywordMatcher()
+
+
+def _loop_scan(tables: Dict[str, List[str]], text: str) -> Dict[str, int]:
+    """Old-style scan: one `keyword in content` loop per table"""
+    content = text.lower()
+    return {
+        label: sum(1 for keyword in keywords if keyword.rstrip(PREFIX_MARKER).lower() in content)
+        for label, keywords in tables.items()
+    }
+
+
+def load_headlines(path: str) -> List[str]:
+    """Load recorded headlines from an article database JSON or a text file (one per line)"""
+    if not os.path.exists(path):
+        return []
+    with open(path, 'r', encoding='utf-8') as f:
+        if path.endswith('.json'):
+            data = json.load(f)
+            return [meta.get('title', '') for meta in data.get('article_metadata', {}).values() if meta.get('title')]
+        return [line.strip() for line in f if line.strip()]
+
+
+def benchmark_keyword_matcher(headlines: List[str], total: int = 10000, matcher: Optional[KeywordMatcher] = None):
+    """Compare one automaton pass per headline against the per-table keyword loops"""
+    matcher = matcher or keyword_matcher
+    tables: Dict[str, List[str]] = {}
+    for entries in matcher.patterns.values():
+        for keyword, label, _ in entries:
+            tables.setdefault(label, []).append(keyword)
+
+    # Repeat recorded headlines up to the sample size, varied so the match cache does not help
+    sample = [f"{headlines[i % len(headlines)]} #{i}" for i in range(total)]
+
+    start = time.perf_counter()
+    for headline in sample:
+        _loop_scan(tables, headline)
+    loop_seconds = time.perf_counter() - start
+
+    matcher.cache_size = 0
+    start = time.perf_counter()
+    for headline in sample:
+        matcher.scan(headline)
+    automaton_seconds = time.perf_counter() - start
+    matcher.cache_size = MATCH_CACHE_SIZE
+
+    print(f"📊 {total} headlines, {len(tables)} keyword tables, {len(matcher.patterns)} keywords")
+    print(f"🐢 Keyword loops:  {loop_seconds * 1000:.1f} ms ({loop_seconds / total * 1e6:.1f} µs/headline)")
+    print(f"⚡ Aho-Corasick:   {automaton_seconds * 1000:.1f} ms ({automaton_seconds / total * 1e6:.1f} µs/headline)")
+    if automaton_seconds:
+        print(f"🚀 Speedup: {loop_seconds / automaton_seconds:.1f}x")
+
+
+SAMPLE_HEADLINES = [
+    "Bitcoin surges past $70,000 as ETF inflows hit record high",
+    "Fed holds interest rates steady, signals two cuts this year",
+    "US unemployment rate rises to 4.1% as payrolls miss forecast",
+    "Oil prices drop after OPEC+ agrees to boost output",
+    "Ethereum update delays Dencun upgrade, ETH falls 5%",
+    "Dollar weakens against yen after Japan inflation data",
+    "Tesla shares plunge on weak deliveries; Nasdaq futures slip",
+    "Gold hits all-time high amid recession fears",
+    "Coinbase and Binance face new SEC lawsuit over staking",
+    "China GDP growth beats expectations, copper rallies",
+]
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+
+    # Importing the consumers registers their keyword tables
+    for module in ('free_arabic_bot', 'investing_scraper', 'crypto_arabic_formatter'):
+        try:
+            __import__(module)
+        except ImportError as e:
+            print(f"⚠️ Skipping {module} tables: {e}")
+
+    # Running as a script, so the consumers registered with the imported module's matcher
+    from keyword_matcher import keyword_matcher as shared_matcher
+
+    headlines_file = sys.argv[1] if len(sys.argv) > 1 else 'production_seen_articles.json'
+    recorded = load_headlines(headlines_file)
+    benchmark_keyword_matcher(recorded + SAMPLE_HEADLINES, matcher=shared_matcher)
@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+"""
+Fixed-bucket latency histograms
+Cheap enough to record every provider call; percentiles back the hedging threshold
+"""
+import bisect
+import logging
+from typing import Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Log-spaced bucket upper bounds in seconds (last bucket is open-ended)
+DEFAULT_BUCKETS = [0.1, 0.2, 0.3, 0.5, 0.75, 1.0, 1.5, 2.0, 3.0, 4.0, 5.0, 7.5, 10.0, 15.0, 20.0, 30.0, 60.0]
+
+
+class LatencyHistogram:
+    """Bucketed latency distribution for one provider"""
+
+    def __init__(self, name: str, buckets: Optional[List[float]] = None):
+        self.name = name
+        self.buckets = sorted(buckets or DEFAULT_BUCKETS)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.count = 0
+        self.total_seconds = 0.0
+        self.max_seconds = 0.0
+
+    def record(self, seconds: float):
+        """Add one observed latency"""
+        self.counts[bisect.bisect_left(self.buckets, seconds)] += 1
+        self.count += 1
+        self.total_seconds += seconds
+        self.max_seconds = max(self.max_seconds, seconds)
+
+    def percentile(self, quantile: float) -> Optional[float]:
+        """Upper bound of the bucket holding the quantile (None without samples)"""
+        if not self.count:
+            return None
+        target = quantile * self.count
+        seen = 0
+        for index, bucket_count in enumerate(self.counts):
+            seen += bucket_count
+            if seen >= target and bucket_count:
+                return self.buckets[index] if index < len(self.buckets) else self.max_seconds
+        return self.max_seconds
+
+    def mean(self) -> float:
+        """Average latency"""
+        return self.total_seconds / self.count if self.count else 0.0
+
+    def get_stats(self) -> Dict[str, float]:
+        """Summary for logging"""
+        return {
+            'count': self.count,
+            'mean': self.mean(),
+            'p50': self.percentile(0.5) or 0.0,
+            'p90': self.percentile(0.9) or 0.0,
+            'p99': self.percentile(0.99) or 0.0,
+            'max': self.max_seconds,
+        }
+
+    def summary(self) -> str:
+        """One-line summary"""
+        stats = self.get_stats()
+        return (f"{self.name}: n={stats['count']} mean={stats['mean']:.2f}s "
+                f"p50≤{stats['p50']:.2f}s p90≤{stats['p90']:.2f}s p99≤{stats['p99']:.2f}s max={stats['max']:.2f}s")
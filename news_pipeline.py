@@ -0,0 +1,207 @@
+#!/usr/bin/env python3
+"""
+Staged asyncio pipeline: fetch → filter → translate → format → send
+Stages are joined by bounded queues, so a slow stage applies backpressure upstream
+instead of letting work pile up. Each stage has its own worker count and can take
+micro-batches of whatever is waiting in its queue. Time spent waiting in each queue
+and processing in each stage goes into latency histograms.
+"""
+import asyncio
+import itertools
+import logging
+import time
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from latency_histogram import LatencyHistogram
+
+logger = logging.getLogger(__name__)
+
+# Buckets for end-to-end latencies (seconds to hours)
+END_TO_END_BUCKETS = [1, 2, 5, 10, 20, 30, 60, 120, 300, 600, 900, 1800, 3600, 7200, 14400]
+
+
+@dataclass
+class PipelineItem:
+    """One unit of work moving through the stages"""
+    payload: Any
+    created_at: float = field(default_factory=time.monotonic)    # When it entered the pipeline
+    enqueued_at: float = field(default_factory=time.monotonic)   # When it entered its current queue
+    values: Dict[str, Any] = field(default_factory=dict)         # Results attached by stages
+
+    def derive(self, payload: Any) -> 'PipelineItem':
+        """New item for a payload split out of this one (keeps the pipeline entry time)"""
+        return PipelineItem(payload, created_at=self.created_at)
+
+
+# A stage handler gets a micro-batch of items and returns the items to pass on (fewer = dropped)
+StageHandler = Callable[[List[PipelineItem]], Awaitable[List[PipelineItem]]]
+# Heap key for a priority stage (lower = taken first)
+PriorityKey = Callable[[PipelineItem], float]
+# Called with a batch lost to a handler error, so per-item state held elsewhere can be released
+DropHook = Callable[[List[PipelineItem]], None]
+
+
+class PipelineStage:
+    """Bounded input queue (FIFO, or a heap when given a priority key) plus a pool of workers running one handler"""
+
+    def __init__(self, name: str, handler: StageHandler, workers: int = 1, queue_size: int = 10,
+                 batch_size: int = 1, priority: Optional[PriorityKey] = None, on_drop: Optional[DropHook] = None):
+        self.name = name
+        self.handler = handler
+        self.on_drop = on_drop
+        self.workers = workers
+        self.queue_size = queue_size
+        self.batch_size = batch_size
+        self.priority = priority
+        self.queue: Optional[asyncio.Queue] = None
+        self._sequence = itertools.count()  # FIFO among equal keys
+
+        self.wait_latency = LatencyHistogram(f"{name} queue wait")
+        self.processing_latency = LatencyHistogram(f"{name} processing")
+        self.stats = {'in': 0, 'out': 0, 'errors': 0, 'busy_workers': 0}
+
+    def create_queue(self):
+        """Create the input queue (needs a running event loop)"""
+        self.queue = asyncio.PriorityQueue(self.queue_size) if self.priority else asyncio.Queue(self.queue_size)
+
+    async def put(self, item: PipelineItem):
+        """Enqueue an item (waits while the queue is full)"""
+        item.enqueued_at = time.monotonic()
+        if self.priority:
+            await self.queue.put((self.priority(item), next(self._sequence), item))
+        else:
+            await self.queue.put(item)
+
+    def _unwrap(self, entry) -> PipelineItem:
+        return entry[-1] if self.priority else entry
+
+    async def next_batch(self) -> List[PipelineItem]:
+        """Wait for one item, then take whatever else is already queued up to batch_size (best first)"""
+        batch = [self._unwrap(await self.queue.get())]
+        while len(batch) < self.batch_size:
+            try:
+                batch.append(self._unwrap(self.queue.get_nowait()))
+            except asyncio.QueueEmpty:
+                break
+        return batch
+
+
+class NewsPipeline:
+    """Chain of stages connected by bounded queues"""
+
+    def __init__(self, name: str = "news"):
+        self.name = name
+        self.stages: List[PipelineStage] = []
+        self.tasks: List[asyncio.Task] = []
+        self.end_to_end = LatencyHistogram(f"{name} pipeline", END_TO_END_BUCKETS)
+
+    def add_stage(self, name: str, handler: StageHandler, workers: int = 1, queue_size: int = 10,
+                  batch_size: int = 1, priority: Optional[PriorityKey] = None,
+                  on_drop: Optional[DropHook] = None) -> 'NewsPipeline':
+        """
+        Append a stage (call before start); with a priority key its queue hands out the lowest key first,
+        on_drop gets the batch whenever the handler fails
+        """
+        self.stages.append(PipelineStage(name, handler, workers, queue_size, batch_size, priority, on_drop))
+        return self
+
+    def start(self):
+        """Create the queues and worker tasks (needs a running event loop)"""
+        if self.tasks:
+            return
+        for stage in self.stages:
+            stage.create_queue()
+        for index, stage in enumerate(self.stages):
+            for worker in range(stage.workers):
+                self.tasks.append(asyncio.create_task(self._run_worker(index), name=f"{stage.name}-{worker}"))
+        logger.info("🏭 Pipeline started: " + " → ".join(f"{stage.name}×{stage.workers}" for stage in self.stages))
+
+    async def submit(self, payload: Any):
+        """Feed the first stage (waits while its queue is full)"""
+        await self.stages[0].put(PipelineItem(payload))
+
+    async def submit_to(self, stage_name: str, item: PipelineItem):
+        """Feed an already-processed item straight into a named stage (e.g. resumed work)"""
+        stage = next(stage for stage in self.stages if stage.name == stage_name)
+        await stage.put(item)
+
+    def backlog(self, after: str) -> int:
+        """Items waiting in the queues of every stage after the named one"""
+        names = [stage.name for stage in self.stages]
+        return sum(stage.queue.qsize() for stage in self.stages[names.index(after) + 1:] if stage.queue)
+
+    async def _run_worker(self, index: int):
+        """Pull micro-batches, run the handler, pass results downstream"""
+        stage = self.stages[index]
+        downstream = self.stages[index + 1] if index + 1 < len(self.stages) else None
+
+        while True:
+            batch = await stage.next_batch()
+            stage.stats['busy_workers'] += 1
+            try:
+                started = time.monotonic()
+                for item in batch:
+                    stage.wait_latency.record(started - item.enqueued_at)
+                stage.stats['in'] += len(batch)
+
+                try:
+                    outputs = await stage.handler(batch)
+                except asyncio.CancelledError:
+                    raise
+                except Exception as e:
+                    stage.stats['errors'] += 1
+                    logger.error(f"💥 Pipeline stage {stage.name} failed on {len(batch)} items: {e}")
+                    outputs = []
+                    if stage.on_drop:
+                        try:
+                            stage.on_drop(batch)
+                        except Exception as drop_error:
+                            logger.error(f"💥 Pipeline stage {stage.name} drop hook failed: {drop_error}")
+
+                stage.processing_latency.record(time.monotonic() - started)
+                stage.stats['out'] += len(outputs)
+
+                for item in outputs:
+                    if downstream:
+                        await downstream.put(item)  # Backpressure: waits while downstream is full
+                    else:
+                        self.end_to_end.record(time.monotonic() - item.created_at)
+            finally:
+                stage.stats['busy_workers'] -= 1
+                for _ in batch:
+                    stage.queue.task_done()
+
+    async def join(self):
+        """Wait until everything submitted so far has left the last stage"""
+        for stage in self.stages:
+            await stage.queue.join()
+
+    def get_stats(self) -> Dict[str, Dict[str, Any]]:
+        """Per-stage throughput, queue depth and latency"""
+        stats = {}
+        for stage in self.stages:
+            stats[stage.name] = {
+                **stage.stats,
+                'queued': stage.queue.qsize() if stage.queue else 0,
+                'wait_p90': stage.wait_latency.percentile(0.9) or 0.0,
+                'processing_p90': stage.processing_latency.percentile(0.9) or 0.0,
+            }
+        return stats
+
+    def log_stats(self):
+        """One log line per stage"""
+        for name, stage_stats in self.get_stats().items():
+            logger.info(f"🏭 {name}: {stage_stats['in']} in / {stage_stats['out']} out, "
+                        f"{stage_stats['queued']} queued, {stage_stats['busy_workers']} busy, "
+                        f"wait p90≤{stage_stats['wait_p90']:.2f}s, processing p90≤{stage_stats['processing_p90']:.2f}s"
+                        + (f", {stage_stats['errors']} errors" if stage_stats['errors'] else ""))
+        if self.end_to_end.count:
+            logger.info(f"⏱️ {self.end_to_end.summary()}")
+
+    async def stop(self):
+        """Cancel all workers (queued items are dropped)"""
+        for task in self.tasks:
+            task.cancel()
+        await asyncio.gather(*self.tasks, return_exceptions=True)
+        self.tasks.clear()
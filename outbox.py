@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+"""
+Durable outbox
+Fully formatted messages are written to SQLite before they are handed to the sender and
+removed once the send is settled, so a restart resumes sending straight from disk instead
+of refetching, refiltering and retranslating the batch it lost
+"""
+import logging
+import sqlite3
+import time
+from dataclasses import dataclass, field
+from typing import Any, List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class OutboxArticle:
+    """The article fields the send stage needs, rebuilt from the outbox"""
+    article_id: str
+    title: str
+    link: str = ''
+    published: str = ''
+    timestamp: int = 0
+    section: str = ''
+    image_url: Optional[str] = None
+    summary: str = ''
+    features: Any = field(default=None, repr=False, compare=False)
+
+
+@dataclass
+class OutboxEntry:
+    """One formatted message waiting for one channel"""
+    article: OutboxArticle
+    channel: str                              # Channel name in the registry
+    text: str                                 # Formatted message
+    headline: str = ''                        # Channel-language headline (for digests)
+    quick_message_id: Optional[int] = None    # Post-then-edit: message to edit instead of sending
+    created_at: float = field(default_factory=time.time)
+
+
+COLUMNS = ('article_id', 'channel', 'text', 'headline', 'quick_message_id', 'created_at',
+           'title', 'link', 'published', 'timestamp', 'section', 'image_url')
+
+
+class Outbox:
+    """SQLite-backed queue of formatted messages, in insertion order"""
+
+    def __init__(self, db_file: str = "outbox.db", max_age_seconds: float = 6 * 3600):
+        self.db_file = db_file
+        self.max_age_seconds = max_age_seconds  # Older entries are stale news, dropped on load
+        self.connection: Optional[sqlite3.Connection] = None
+        self._open_database()
+
+    def _open_database(self):
+        """Open (and create) the outbox; without it messages only live in memory (old behavior)"""
+        try:
+            self.connection = sqlite3.connect(self.db_file, timeout=10)
+            self.connection.execute("PRAGMA journal_mode=WAL")
+            self.connection.execute(
+                "CREATE TABLE IF NOT EXISTS outbox ("
+                "id INTEGER PRIMARY KEY AUTOINCREMENT, article_id TEXT NOT NULL, channel TEXT NOT NULL, "
+                "text TEXT NOT NULL, headline TEXT, quick_message_id INTEGER, created_at REAL NOT NULL, "
+                "title TEXT, link TEXT, published TEXT, timestamp INTEGER, section TEXT, image_url TEXT, "
+                "UNIQUE (article_id, channel))"
+            )
+            self.connection.commit()
+        except sqlite3.Error as e:
+            logger.error(f"Error opening outbox, queued posts will not survive restarts: {e}")
+            self.connection = None
+
+    def put(self, entries: List[OutboxEntry]):
+        """Persist entries in one transaction (a re-queued article replaces its old entry)"""
+        if not self.connection or not entries:
+            return
+        rows = [(entry.article.article_id, entry.channel, entry.text, entry.headline, entry.quick_message_id,
+                 entry.created_at, entry.article.title, entry.article.link, entry.article.published,
+                 entry.article.timestamp, entry.article.section, entry.article.image_url)
+                for entry in entries]
+        try:
+            with self.connection:
+                self.connection.executemany(
+                    f"INSERT OR REPLACE INTO outbox ({', '.join(COLUMNS)}) "
+                    f"VALUES ({', '.join('?' for _ in COLUMNS)})", rows
+                )
+        except sqlite3.Error as e:
+            logger.error(f"Outbox write failed: {e}")
+
+    def remove(self, article_id: str, channel: Optional[str] = None):
+        """Drop an article's entry for one settled channel (default: all of its entries)"""
+        if not self.connection:
+            return
+        try:
+            with self.connection:
+                if channel is None:
+                    self.connection.execute("DELETE FROM outbox WHERE article_id = ?", (article_id,))
+                else:
+                    self.connection.execute("DELETE FROM outbox WHERE article_id = ? AND channel = ?",
+                                            (article_id, channel))
+        except sqlite3.Error as e:
+            logger.error(f"Outbox delete failed: {e}")
+
+    def load(self) -> List[OutboxEntry]:
+        """All pending entries, oldest first (stale ones are discarded)"""
+        if not self.connection:
+            return []
+        try:
+            with self.connection:
+                expired = self.connection.execute(
+                    "DELETE FROM outbox WHERE created_at < ?", (time.time() - self.max_age_seconds,)
+                ).rowcount
+            rows = self.connection.execute(f"SELECT {', '.join(COLUMNS)} FROM outbox ORDER BY id").fetchall()
+        except sqlite3.Error as e:
+            logger.error(f"Outbox read failed: {e}")
+            return []
+        if expired:
+            logger.info(f"📤 Outbox: dropped {expired} entries older than {self.max_age_seconds / 3600:.0f}h")
+
+        entries = []
+        for (article_id, channel, text, headline, quick_message_id, created_at,
+             title, link, published, timestamp, section, image_url) in rows:
+            article = OutboxArticle(article_id, title or '', link or '', published or '',
+                                    timestamp or 0, section or '', image_url)
+            entries.append(OutboxEntry(article, channel, text, headline or '', quick_message_id, created_at))
+        return entries
+
+    def count(self) -> int:
+        """Entries waiting"""
+        if not self.connection:
+            return 0
+        try:
+            return self.connection.execute("SELECT COUNT(*) FROM outbox").fetchone()[0]
+        except sqlite3.Error:
+            return 0
+
+    def close(self):
+        """Close the outbox"""
+        if self.connection:
+            self.connection.close()
+            self.connection = None
@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+Publish timestamp parsing for news articles
+Turns feed date strings into epoch seconds once, at ingest time
+"""
+import calendar
+import logging
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+# Sentinel formats handled by dedicated parsers instead of strptime
+RFC2822 = 'rfc2822'
+ISO8601 = 'iso8601'
+
+# Candidate formats tried in order when a source has no cached format yet
+DATE_FORMATS = [
+    RFC2822,                          # "Sat, 02 Aug 2025 16:43:51 +0000" (CoinDesk, Cointelegraph)
+    ISO8601,                          # "2025-08-02T16:43:51+00:00"
+    '%Y-%m-%d %H:%M:%S %z',
+    '%Y-%m-%d %H:%M:%S',
+    '%Y-%m-%d %H:%M',
+    '%a, %d %b %Y %H:%M:%S %Z',
+    '%a, %d %b %Y %H:%M:%S',          # Fallback without timezone
+]
+
+
+class PublishTimeParser:
+    """Parse publish dates to epoch seconds with a per-source format cache"""
+
+    def __init__(self):
+        # source name -> last format that parsed successfully for it
+        self.source_formats: Dict[str, str] = {}
+
+    def parse(self, published: Optional[str], source: str = "", parsed_struct=None) -> int:
+        """
+        Return the publish time as UTC epoch seconds, or 0 if unknown
+        parsed_struct is feedparser's *_parsed value (UTC struct_time) and wins when present
+        """
+        if parsed_struct:
+            try:
+                return calendar.timegm(parsed_struct)
+            except (TypeError, ValueError, OverflowError):
+                pass
+
+        if not published or not isinstance(published, str):
+            return 0
+
+        published = published.strip()
+
+        # Fast path: the format this source used last time
+        cached_format = self.source_formats.get(source)
+        if cached_format:
+            timestamp = self._parse_with_format(published, cached_format)
+            if timestamp:
+                return timestamp
+
+        # Slow path: detect the format and remember it for this source
+        for fmt in DATE_FORMATS:
+            if fmt == cached_format:
+                continue
+            timestamp = self._parse_with_format(published, fmt)
+            if timestamp:
+                self.source_formats[source] = fmt
+                logger.debug(f"🕒 {source or 'unknown'}: detected date format {fmt}")
+                return timestamp
+
+        logger.debug(f"🕒 {source or 'unknown'}: could not parse date '{published}'")
+        return 0
+
+    def parse_entry(self, entry, source: str = "") -> int:
+        """Return the publish time of a feedparser entry, preferring its *_parsed fields"""
+        for field in ('published', 'updated'):
+            parsed_struct = getattr(entry, f'{field}_parsed', None)
+            if parsed_struct:
+                timestamp = self.parse(None, source, parsed_struct)
+                if timestamp:
+                    return timestamp
+
+        published = getattr(entry, 'published', None) or getattr(entry, 'updated', None)
+        return self.parse(published, source)
+
+    def _parse_with_format(self, published: str, fmt: str) -> int:
+        """Parse a date string with one format, returning 0 on mismatch"""
+        try:
+            if fmt == RFC2822:
+                parsed = parsedate_to_datetime(published)
+            elif fmt == ISO8601:
+                parsed = datetime.fromisoformat(published.replace('Z', '+00:00'))
+            else:
+                parsed = datetime.strptime(published, fmt)
+        except (TypeError, ValueError, IndexError):
+            return 0
+
+        if parsed is None:
+            return 0
+
+        # Dates without timezone info are treated as UTC
+        if parsed.tzinfo is None:
+            parsed = parsed.replace(tzinfo=timezone.utc)
+
+        return int(parsed.timestamp())
+
+
+def now_timestamp() -> int:
+    """Current UTC epoch seconds"""
+    return int(time.time())
+
+
+# Global parser instance shared by all scrapers
+publish_time_parser = PublishTimeParser()
@@ -0,0 +1,234 @@
+#!/usr/bin/env python3
+"""
+Lightweight learned relevance classifier
+Logistic regression over hashed word n-grams, trained offline from our posted history
+
+Train:  python relevance_model.py [seen_articles.json] [rejected_articles.json|txt]
+The bot loads the saved model and scores each cycle's candidates in one batch.
+NumPy is optional: with it a batch is one sparse matrix-vector product, without
+it the same weights are applied with plain Python loops.
+"""
+import json
+import logging
+import math
+import os
+import random
+import re
+import sys
+import zlib
+from datetime import datetime, timezone
+from typing import Dict, List, Optional, Sequence, Tuple
+
+try:
+    import numpy as np
+except ImportError:  # Pure-Python scoring fallback
+    np = None
+
+logger = logging.getLogger(__name__)
+
+TOKEN_PATTERN = re.compile(r'\w+')
+
+DEFAULT_N_FEATURES = 2 ** 18
+DEFAULT_NGRAM_MAX = 2
+
+# Hashed sparse row: (feature indices, values)
+SparseRow = Tuple[List[int], List[float]]
+
+
+class HashedNgramVectorizer:
+    """Map text to a sparse vector of hashed word n-gram counts (signed hashing trick)"""
+
+    def __init__(self, n_features: int = DEFAULT_N_FEATURES, ngram_max: int = DEFAULT_NGRAM_MAX):
+        self.n_features = n_features
+        self.ngram_max = ngram_max
+
+    def transform_one(self, text: str) -> SparseRow:
+        """Sparse row for one text, L2-normalized"""
+        tokens = TOKEN_PATTERN.findall(text.lower())
+        counts: Dict[int, float] = {}
+
+        for n in range(1, self.ngram_max + 1):
+            for start in range(len(tokens) - n + 1):
+                gram = ' '.join(tokens[start:start + n])
+                # crc32 is stable across processes, unlike hash()
+                hashed = zlib.crc32(gram.encode('utf-8'))
+                index = hashed % self.n_features
+                sign = 1.0 if hashed & 0x80000000 else -1.0
+                counts[index] = counts.get(index, 0.0) + sign
+
+        norm = math.sqrt(sum(value * value for value in counts.values())) or 1.0
+        indices = list(counts)
+        return indices, [counts[index] / norm for index in indices]
+
+    def transform(self, texts: Sequence[str]) -> List[SparseRow]:
+        """Sparse rows for a batch of texts"""
+        return [self.transform_one(text) for text in texts]
+
+
+class RelevanceClassifier:
+    """Binary logistic regression over hashed n-grams (1 = worth posting)"""
+
+    def __init__(self, n_features: int = DEFAULT_N_FEATURES, ngram_max: int = DEFAULT_NGRAM_MAX,
+                 threshold: float = 0.5):
+        self.vectorizer = HashedNgramVectorizer(n_features, ngram_max)
+        self.threshold = threshold
+        self.bias = 0.0
+        self.weights = self._zeros(n_features)
+        self.metadata: Dict[str, object] = {}
+
+    @staticmethod
+    def _zeros(size: int):
+        """Weight vector (NumPy array when available)"""
+        return np.zeros(size, dtype=np.float32) if np is not None else [0.0] * size
+
+    @staticmethod
+    def _sigmoid(value: float) -> float:
+        """Numerically stable logistic function"""
+        if value >= 0:
+            return 1.0 / (1.0 + math.exp(-value))
+        exp_value = math.exp(value)
+        return exp_value / (1.0 + exp_value)
+
+    def train(self, texts: Sequence[str], labels: Sequence[int], epochs: int = 10,
+              learning_rate: float = 0.5, l2: float = 1e-5, seed: int = 42):
+        """Fit with class-balanced SGD on the logistic loss"""
+        rows = self.vectorizer.transform(texts)
+        positives = sum(1 for label in labels if label)
+        negatives = len(labels) - positives
+        if not positives or not negatives:
+            raise ValueError("Training needs both posted (positive) and rejected (negative) examples")
+
+        # Balance classes so a handful of rejects still matter
+        class_weight = {1: len(labels) / (2.0 * positives), 0: len(labels) / (2.0 * negatives)}
+        order = list(range(len(rows)))
+        rng = random.Random(seed)
+
+        for epoch in range(epochs):
+            rng.shuffle(order)
+            rate = learning_rate / (1 + epoch)
+            total_loss = 0.0
+            for sample in order:
+                indices, values = rows[sample]
+                label = labels[sample]
+                margin = self.bias + sum(self.weights[index] * value for index, value in zip(indices, values))
+                probability = self._sigmoid(margin)
+                total_loss -= class_weight[label] * math.log(max(probability if label else 1 - probability, 1e-12))
+
+                gradient = class_weight[label] * (probability - label)
+                for index, value in zip(indices, values):
+                    self.weights[index] -= rate * (gradient * value + l2 * self.weights[index])
+                self.bias -= rate * gradient
+            logger.debug(f"🧠 Epoch {epoch + 1}/{epochs}: loss {total_loss / len(rows):.4f}")
+
+        self.metadata = {
+            'trained_at': datetime.now(timezone.utc).isoformat(),
+            'positives': positives,
+            'negatives': negatives,
+        }
+
+    def predict_proba(self, texts: Sequence[str]) -> List[float]:
+        """Relevance probability for a batch of texts"""
+        if not texts:
+            return []
+        rows = self.vectorizer.transform(texts)
+
+        if np is not None:
+            # One sparse matrix-vector product: gather weights for all nonzeros, sum per row
+            lengths = [len(indices) for indices, _ in rows]
+            indices = np.fromiter((index for row in rows for index in row[0]), dtype=np.int64, count=sum(lengths))
+            values = np.fromiter((value for row in rows for value in row[1]), dtype=np.float32, count=sum(lengths))
+            row_ids = np.repeat(np.arange(len(rows)), lengths)
+            margins = np.bincount(row_ids, weights=self.weights[indices] * values, minlength=len(rows)) + self.bias
+            return (1.0 / (1.0 + np.exp(-margins))).tolist()
+
+        return [
+            self._sigmoid(self.bias + sum(self.weights[index] * value for index, value in zip(indices, values)))
+            for indices, values in rows
+        ]
+
+    def predict(self, texts: Sequence[str]) -> List[bool]:
+        """Relevance decision for a batch of texts"""
+        return [probability >= self.threshold for probability in self.predict_proba(texts)]
+
+    def save(self, path: str):
+        """Save nonzero weights as JSON (small and readable without NumPy)"""
+        data = {
+            'n_features': self.vectorizer.n_features,
+            'ngram_max': self.vectorizer.ngram_max,
+            'threshold': self.threshold,
+            'bias': self.bias,
+            'weights': {str(index): float(weight) for index, weight in enumerate(self.weights) if weight},
+            'metadata': self.metadata,
+        }
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f)
+        os.replace(tmp_path, path)
+        logger.info(f"💾 Saved relevance model to {path} ({len(data['weights'])} nonzero weights)")
+
+    @classmethod
+    def load(cls, path: str, threshold: Optional[float] = None) -> 'RelevanceClassifier':
+        """Load a saved model, optionally overriding its decision threshold"""
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        model = cls(data['n_features'], data['ngram_max'],
+                    threshold if threshold is not None else data.get('threshold', 0.5))
+        model.bias = data['bias']
+        for index, weight in data['weights'].items():
+            model.weights[int(index)] = weight
+        model.metadata = data.get('metadata', {})
+        return model
+
+
+def load_titles(path: str) -> List[str]:
+    """Titles from an article database JSON, a JSON list, or a text file (one per line)"""
+    if not path or not os.path.exists(path):
+        return []
+    with open(path, 'r', encoding='utf-8') as f:
+        if not path.endswith('.json'):
+            return [line.strip() for line in f if line.strip()]
+        data = json.load(f)
+    if isinstance(data, dict):
+        return [meta.get('title', '') for meta in data.get('article_metadata', {}).values() if meta.get('title')]
+    return [item.get('title', '') if isinstance(item, dict) else str(item) for item in data if item]
+
+
+def load_training_data(seen_file: str, rejects_file: str) -> Tuple[List[str], List[int]]:
+    """Posted history as positives, labeled rejects as negatives"""
+    positives = load_titles(seen_file)
+    negatives = load_titles(rejects_file)
+    logger.info(f"📚 Training data: {len(positives)} posted, {len(negatives)} rejected")
+    return positives + negatives, [1] * len(positives) + [0] * len(negatives)
+
+
+def load_relevance_model(path: str, threshold: Optional[float] = None) -> Optional[RelevanceClassifier]:
+    """Load the trained model if one exists, None otherwise"""
+    if not os.path.exists(path):
+        logger.info("🧠 No relevance model found, keyword filters only")
+        return None
+    try:
+        model = RelevanceClassifier.load(path, threshold)
+        logger.info(f"🧠 Relevance model loaded (threshold {model.threshold}, "
+                    f"{'NumPy' if np is not None else 'pure Python'} scoring)")
+        return model
+    except Exception as e:
+        logger.error(f"Error loading relevance model: {e}")
+        return None
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    from config_free import Config
+
+    seen_file = sys.argv[1] if len(sys.argv) > 1 else Config.DATABASE_FILE
+    rejects_file = sys.argv[2] if len(sys.argv) > 2 else Config.RELEVANCE_REJECTS_FILE
+
+    texts, labels = load_training_data(seen_file, rejects_file)
+    classifier = RelevanceClassifier(threshold=Config.RELEVANCE_THRESHOLD)
+    classifier.train(texts, labels)
+
+    predictions = classifier.predict(texts)
+    accuracy = sum(1 for predicted, label in zip(predictions, labels) if predicted == bool(label)) / len(labels)
+    print(f"📊 Training accuracy: {accuracy:.1%} on {len(labels)} examples")
+
+    classifier.save(Config.RELEVANCE_MODEL_FILE)
@@ -4,12 +4,16 @@ Much more reliable than HTML scraping as RSS feeds are designed for machine cons
 """
 import feedparser
 import asyncio
+import heapq
 import aiohttp
 import logging
 from datetime import datetime, timezone
 from typing import List, Dict, Optional
 import hashlib
-from dataclasses import dataclass
+import re
+from dataclasses import dataclass, field
+from publish_time import publish_time_parser
+from article_features import ArticleFeatures, extract_features
 try:
     from config_free import Config
 except ImportError:
@@ -17,6 +21,27 @@ except ImportError:
 
 logger = logging.getLogger(__name__)
 
+# <img src="..."> in entry HTML (last-resort image source)
+IMG_SRC_PATTERN = re.compile(r'<img[^>]+src=["\']([^"\']+)["\']', re.IGNORECASE)
+
+# Source priority (lower = more important), used as the merge tie-breaker
+PRIORITY_SOURCES = [
+    'investing_economic',    # Economic data (highest priority)
+    'investing_rss',        # General investing news
+    'marketwatch',          # Real-time headlines
+    'coindesk',             # Crypto news
+    'cointelegraph',        # Crypto news
+    'investing_crypto',     # Crypto news
+    'investing_forex',      # Forex news
+    'yahoo_finance_crypto', # Yahoo Finance
+    'backup_benzinga_crypto', # Backup sources
+    'backup_decrypt',
+    'backup_the_block',
+    'backup_crypto_news'
+]
+SOURCE_PRIORITY = {source: index for index, source in enumerate(PRIORITY_SOURCES)}
+DEFAULT_SOURCE_PRIORITY = 999
+
 @dataclass
 class RSSNewsArticle:
     """Represents a single news article from RSS feed"""
@@ -27,11 +52,19 @@ class RSSNewsArticle:
     source: str
     article_id: str
     image_url: Optional[str] = None  # NEW: Image URL support
+    timestamp: int = 0  # Publish time as UTC epoch seconds (0 = unknown)
+    features: Optional[ArticleFeatures] = field(default=None, repr=False, compare=False)
     
     def __post_init__(self):
         # Generate unique ID based on title and link
         content = f"{self.title}_{self.link}"
         self.article_id = hashlib.md5(content.encode()).hexdigest()[:12]
+        # Parse the publish date once at ingest
+        if not self.timestamp:
+            self.timestamp = publish_time_parser.parse(self.published, self.source)
+        # Derive text features once at ingest
+        if self.features is None:
+            self.features = extract_features(self.title, self.summary, self.link, self.timestamp)
 
 class RSSNewsScraper:
     """RSS-based news scraper for multiple financial news sources"""
@@ -140,6 +173,7 @@ class RSSNewsScraper:
                         published = entry.updated
                     elif hasattr(entry, 'pubDate'):
                         published = entry.pubDate
+                    timestamp = publish_time_parser.parse_entry(entry, source_name)
                     
                     # Extract image URL from various sources
                     image_url = self._extract_image_from_entry(entry, source_name)
@@ -161,13 +195,14 @@ class RSSNewsScraper:
                         summary=summary,
                         source=source_name,
                         article_id="",  # Will be generated in __post_init__
-                        image_url=image_url  # Include image URL
+                        image_url=image_url,  # Include image URL
+                        timestamp=timestamp
                     )
                     
-                    # Check for duplicates
-                    if article.article_id not in self.seen_articles:
+                    # Check for duplicates (canonical ID: tracked and re-shared links of one story match)
+                    if article.features.canonical_id not in self.seen_articles:
                         articles.append(article)
-                        self.seen_articles.add(article.article_id)
+                        self.seen_articles.add(article.features.canonical_id)
                         logger.debug(f"✅ {source_name}: Parsed article: {title[:50]}... (Image: {'Yes' if image_url else 'No'}, Desc: {'Yes' if summary else 'No'})")
                     
                 except Exception as e:
@@ -181,19 +216,42 @@ class RSSNewsScraper:
             logger.error(f"Error parsing RSS content from {source_name}: {e}")
             return []
     
-    async def get_latest_news(self, max_articles: int = None) -> List[RSSNewsArticle]:
-        """Get latest news from all configured sources"""
+    async def _gather_until(self, coroutines, deadline: Optional[float] = None) -> list:
+        """
+        Run feed fetches concurrently; results (or exceptions) in order
+        Fetches still running at `deadline` (event loop time) are cancelled and yield TimeoutError
+        """
+        tasks = [asyncio.create_task(coroutine) for coroutine in coroutines]
+        if not tasks:
+            return []
+        try:
+            timeout = None if deadline is None else max(deadline - asyncio.get_running_loop().time(), 0)
+            await asyncio.wait(tasks, timeout=timeout)
+        finally:
+            # Deadline passed, or the caller was cancelled: slow feeds are retried next cycle
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+        
+        results = []
+        for task in tasks:
+            if task.cancelled():
+                results.append(asyncio.TimeoutError("missed the cycle deadline"))
+            else:
+                results.append(task.exception() or task.result())
+        return results
+    
+    async def get_latest_news(self, max_articles: int = None, deadline: Optional[float] = None) -> List[RSSNewsArticle]:
+        """Get latest news from all configured sources (feeds not done by `deadline` are skipped)"""
         max_articles = max_articles or Config.MAX_ARTICLES_PER_SCRAPE
-        all_articles = []
+        feed_streams = []  # One list of articles per feed, merged at the end
         
         try:
-            # Fetch from all sources concurrently
-            tasks = []
-            for source_name, url in self.sources.items():
-                tasks.append(self.fetch_rss_feed(url, source_name))
-            
-            # Wait for all feeds to be fetched
-            results = await asyncio.gather(*tasks, return_exceptions=True)
+            # Fetch from all sources concurrently, until the deadline
+            results = await self._gather_until(
+                (self.fetch_rss_feed(url, source_name) for source_name, url in self.sources.items()), deadline
+            )
             
             # Process results and track success/failure
             successful_sources = []
@@ -206,7 +264,7 @@ class RSSNewsScraper:
                     logger.error(f"❌ {source_name}: Exception - {result}")
                     failed_sources.append(source_name)
                 elif result:  # Got new articles
-                    all_articles.extend(result)
+                    feed_streams.append(result)
                     successful_sources.append(f"{source_name}({len(result)})")
                 else:  # No new articles (not a failure)
                     no_new_articles_sources.append(source_name)
@@ -220,14 +278,13 @@ class RSSNewsScraper:
                 logger.warning(f"❌ Actually failed sources: {', '.join(failed_sources)}")
             
             # If no new articles and we have backup sources, try them
-            if not all_articles and self.backup_sources:
+            if not feed_streams and self.backup_sources:
                 logger.info("No new articles from main sources, trying backup sources...")
                 
-                backup_tasks = []
-                for source_name, url in self.backup_sources.items():
-                    backup_tasks.append(self.fetch_rss_feed(url, f"backup_{source_name}"))
-                
-                backup_results = await asyncio.gather(*backup_tasks, return_exceptions=True)
+                backup_results = await self._gather_until(
+                    (self.fetch_rss_feed(url, f"backup_{source_name}") for source_name, url in self.backup_sources.items()),
+                    deadline
+                )
                 
                 backup_successful = []
                 for i, result in enumerate(backup_results):
@@ -235,41 +292,17 @@ class RSSNewsScraper:
                     if isinstance(result, Exception):
                         logger.error(f"❌ {source_name}: Exception - {result}")
                     elif result:
-                        all_articles.extend(result)
+                        feed_streams.append(result)
                         backup_successful.append(f"{source_name}({len(result)})")
                 
                 if backup_successful:
                     logger.info(f"✅ Backup sources with articles: {', '.join(backup_successful)}")
             
-            # Sort by source priority and limit results
-            # Prioritize certain sources (updated list with working feeds)
-            priority_sources = [
-                'investing_economic',    # Economic data (highest priority)
-                'investing_rss',        # General investing news
-                'marketwatch',          # Real-time headlines
-                'coindesk',             # Crypto news
-                'cointelegraph',        # Crypto news
-                'investing_crypto',     # Crypto news
-                'investing_forex',      # Forex news
-                'yahoo_finance_crypto', # Yahoo Finance
-                'backup_benzinga_crypto', # Backup sources
-                'backup_decrypt',
-                'backup_the_block',
-                'backup_crypto_news'
-            ]
+            # Merge per-feed streams (newest first, source priority breaks ties)
+            limited_articles = self._merge_feed_streams(feed_streams, max_articles)
             
-            def get_source_priority(article):
-                try:
-                    return priority_sources.index(article.source)
-                except ValueError:
-                    return 999
-            
-            all_articles.sort(key=get_source_priority)
-            
-            # Limit results
-            limited_articles = all_articles[:max_articles]
-            
-            total_sources = len(self.sources) + (len(self.backup_sources) if len(all_articles) > len([a for a in all_articles if not a.source.startswith('backup_')]) else 0)
+            used_backup = any(stream[0].source.startswith('backup_') for stream in feed_streams)
+            total_sources = len(self.sources) + (len(self.backup_sources) if used_backup else 0)
             logger.info(f"Retrieved {len(limited_articles)} articles from {total_sources} sources")
             return limited_articles
             
@@ -277,6 +310,32 @@ class RSSNewsScraper:
             logger.error(f"Error getting latest news: {e}")
             return []
     
+    def _merge_feed_streams(self, feed_streams: List[List[RSSNewsArticle]], max_articles: int) -> List[RSSNewsArticle]:
+        """K-way merge of per-feed article lists, stopping after max_articles"""
+        def merge_key(article):
+            # Newest first; unknown publish times (0) sort after everything dated
+            return (-article.timestamp, SOURCE_PRIORITY.get(article.source, DEFAULT_SOURCE_PRIORITY))
+        
+        heap = []
+        for feed_index, stream in enumerate(feed_streams):
+            # Feeds are usually already newest-first, so this sort is close to linear
+            stream.sort(key=merge_key)
+            if stream:
+                heap.append((merge_key(stream[0]), feed_index, 0))
+        heapq.heapify(heap)
+        
+        merged = []
+        while heap and len(merged) < max_articles:
+            _, feed_index, position = heapq.heappop(heap)
+            stream = feed_streams[feed_index]
+            merged.append(stream[position])
+            
+            next_position = position + 1
+            if next_position < len(stream):
+                heapq.heappush(heap, (merge_key(stream[next_position]), feed_index, next_position))
+        
+        return merged
+    
     def reset_seen_articles(self):
         """Reset the seen articles cache"""
         self.seen_articles.clear()
@@ -353,9 +412,9 @@ class RSSNewsScraper:
             
             # Method 3: Extract from content/summary (fallback)
             content_fields = ['content', 'summary', 'description']
-            for field in content_fields:
-                if hasattr(entry, field):
-                    field_content = getattr(entry, field)
+            for field_name in content_fields:
+                if hasattr(entry, field_name):
+                    field_content = getattr(entry, field_name)
                     if isinstance(field_content, list) and field_content:
                         field_content = field_content[0].get('value', '')
                     elif isinstance(field_content, str):
@@ -363,12 +422,12 @@ class RSSNewsScraper:
                     else:
                         continue
                     
-                    # Extract img src from HTML content
-                    import re
-                    img_match = re.search(r'<img[^>]+src=["\']([^"\']+)["\']', str(field_content), re.IGNORECASE)
+                    # Extract img src from HTML content (cheap substring test before the regex)
+                    field_content = str(field_content)
+                    img_match = IMG_SRC_PATTERN.search(field_content) if '<img' in field_content.lower() else None
                     if img_match:
                         img_url = img_match.group(1)
-                        logger.debug(f"📸 {source_name}: Found image in {field}: {img_url}")
+                        logger.debug(f"📸 {source_name}: Found image in {field_name}: {img_url}")
                         return img_url
             
             logger.debug(f"📸 {source_name}: No image found")
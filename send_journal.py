@@ -0,0 +1,197 @@
+#!/usr/bin/env python3
+"""
+Two-phase send journal
+Every post is reserved in SQLite before it is sent and settled as sent (with message_id)
+or failed afterwards. Reservation is one atomic upsert, so concurrent senders - tasks or
+processes sharing the file - never post the same article twice, and a restart can tell
+unfinished sends apart from ones that never started.
+"""
+import logging
+import os
+import socket
+import sqlite3
+import time
+from typing import Any, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+RESERVED = 'reserved'
+SENT = 'sent'
+FAILED = 'failed'
+
+
+def process_owner() -> str:
+    """Owner tag for reservations made by this process"""
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+def owner_alive(owner: str) -> Optional[bool]:
+    """True/False for a process on this host, None if it cannot be checked (other host)"""
+    host, _, pid = (owner or '').rpartition(':')
+    if host != socket.gethostname() or not pid.isdigit():
+        return None
+    try:
+        os.kill(int(pid), 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True  # Exists, owned by another user
+    return True
+
+
+class SendJournal:
+    """SQLite journal of sends: reserved → sent / failed"""
+
+    def __init__(self, db_file: str = "send_journal.db", retention_seconds: float = 7 * 24 * 3600):
+        self.db_file = db_file
+        self.retention_seconds = retention_seconds
+        self.owner = process_owner()
+        self.connection: Optional[sqlite3.Connection] = None
+
+        self.stats = {
+            'reserved': 0,
+            'conflicts': 0,
+            'sent': 0,
+            'failed': 0,
+            'recovered': 0,
+        }
+
+        self._open_database()
+
+    def _open_database(self):
+        """Open (and create) the journal; without it every reservation succeeds (old behavior)"""
+        try:
+            self.connection = sqlite3.connect(self.db_file, timeout=10)
+            self.connection.execute("PRAGMA journal_mode=WAL")  # Readers never block the writing sender
+            self.connection.execute(
+                "CREATE TABLE IF NOT EXISTS sends ("
+                "key TEXT PRIMARY KEY, chat_id TEXT NOT NULL, state TEXT NOT NULL, message_id INTEGER, "
+                "owner TEXT, attempts INTEGER NOT NULL DEFAULT 1, updated_at REAL NOT NULL, error TEXT)"
+            )
+            self.connection.commit()
+            self.cleanup()
+        except sqlite3.Error as e:
+            logger.error(f"Error opening send journal, duplicate protection disabled: {e}")
+            self.connection = None
+
+    def reserve(self, key: str, chat_id: str) -> bool:
+        """
+        Atomically claim a send: True if this caller may send, False if it is
+        already reserved by someone or sent (failed sends can be reclaimed)
+        """
+        if not self.connection:
+            return True
+        try:
+            cursor = self.connection.execute(
+                "INSERT INTO sends (key, chat_id, state, owner, attempts, updated_at) VALUES (?, ?, ?, ?, 1, ?) "
+                "ON CONFLICT(key) DO UPDATE SET state = excluded.state, owner = excluded.owner, "
+                "attempts = sends.attempts + 1, updated_at = excluded.updated_at, error = NULL "
+                "WHERE sends.state = ?",
+                (key, str(chat_id), RESERVED, self.owner, time.time(), FAILED)
+            )
+            self.connection.commit()
+        except sqlite3.Error as e:
+            logger.error(f"Send journal reservation failed for {key}: {e}")
+            return False
+        if cursor.rowcount == 1:
+            self.stats['reserved'] += 1
+            return True
+        self.stats['conflicts'] += 1
+        return False
+
+    def _settle(self, key: str, state: str, message_id: Optional[int] = None, error: Optional[str] = None):
+        """Move our own reservation to its final state"""
+        if not self.connection:
+            return
+        try:
+            self.connection.execute(
+                "UPDATE sends SET state = ?, message_id = ?, error = ?, updated_at = ? "
+                "WHERE key = ? AND state = ? AND owner = ?",
+                (state, message_id, error, time.time(), key, RESERVED, self.owner)
+            )
+            self.connection.commit()
+            self.stats[state] += 1
+        except sqlite3.Error as e:
+            logger.error(f"Send journal update failed for {key}: {e}")
+
+    def mark_sent(self, key: str, message_id: Optional[int] = None):
+        """Reservation delivered"""
+        self._settle(key, SENT, message_id)
+
+    def mark_failed(self, key: str, error: str = ''):
+        """Reservation not delivered (may be reserved again later)"""
+        self._settle(key, FAILED, error=error or None)
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Journal entry for a key, or None"""
+        if not self.connection:
+            return None
+        try:
+            row = self.connection.execute(
+                "SELECT state, message_id, owner, attempts, updated_at FROM sends WHERE key = ?", (key,)
+            ).fetchone()
+        except sqlite3.Error:
+            return None
+        if not row:
+            return None
+        return dict(zip(('state', 'message_id', 'owner', 'attempts', 'updated_at'), row))
+
+    def is_claimed(self, key: str) -> bool:
+        """True if the key is sent or currently reserved by a sender"""
+        entry = self.get(key)
+        return bool(entry) and entry['state'] in (RESERVED, SENT)
+
+    def recover(self, stale_seconds: float = 600, retry_unconfirmed: bool = False) -> int:
+        """
+        Resolve reservations left by senders that died mid-send
+        A reservation is abandoned if its process is gone (same host) or it is older than
+        stale_seconds. Whether it reached Telegram is unknown: by default it counts as sent
+        (never repost); retry_unconfirmed marks it failed so it is sent again.
+        """
+        if not self.connection:
+            return 0
+        now = time.time()
+        resolved_state = FAILED if retry_unconfirmed else SENT
+        recovered = 0
+        try:
+            rows = self.connection.execute(
+                "SELECT key, owner, updated_at FROM sends WHERE state = ? AND owner != ?",
+                (RESERVED, self.owner)
+            ).fetchall()
+            for key, owner, updated_at in rows:
+                alive = owner_alive(owner)
+                if alive or (alive is None and now - updated_at < stale_seconds):
+                    continue
+                cursor = self.connection.execute(
+                    "UPDATE sends SET state = ?, error = ?, updated_at = ? WHERE key = ? AND state = ? AND owner = ?",
+                    (resolved_state, 'recovered: delivery unconfirmed', now, key, RESERVED, owner)
+                )
+                recovered += cursor.rowcount
+            self.connection.commit()
+        except sqlite3.Error as e:
+            logger.error(f"Send journal recovery failed: {e}")
+            return 0
+
+        if recovered:
+            self.stats['recovered'] += recovered
+            action = "queued for resend" if retry_unconfirmed else "treated as sent"
+            logger.warning(f"🧾 Send journal: {recovered} unfinished sends from a previous run {action}")
+        return recovered
+
+    def cleanup(self):
+        """Drop settled entries older than the retention period"""
+        if not self.connection:
+            return
+        cutoff = time.time() - self.retention_seconds
+        cursor = self.connection.execute(
+            "DELETE FROM sends WHERE state != ? AND updated_at < ?", (RESERVED, cutoff)
+        )
+        self.connection.commit()
+        if cursor.rowcount:
+            logger.info(f"Cleaned up send journal, removed {cursor.rowcount} old entries")
+
+    def close(self):
+        """Close the journal"""
+        if self.connection:
+            self.connection.close()
+            self.connection = None
@@ -75,7 +75,7 @@ TELEGRAM_CHANNEL_ID={channel_id}
 # Bot Settings
 SCRAPE_INTERVAL_SECONDS=180
 MAX_ARTICLES_PER_SCRAPE=5
-MESSAGE_DELAY_SECONDS=3
+TELEGRAM_CHAT_MESSAGES_PER_MINUTE=20
 LOG_LEVEL=INFO
 ENVIRONMENT=enhanced_crypto
 """
@@ -0,0 +1,324 @@
+#!/usr/bin/env python3
+"""
+Rate-aware Telegram sender
+Each chat gets its own queue and worker; token buckets enforce Telegram's per-chat and
+global limits, 429s are retried after exactly `parameters.retry_after` (up to a total
+wait per call, after which the call fails instead of holding its chat forever), and every
+request goes through one pooled aiohttp session
+"""
+import asyncio
+import logging
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+
+import aiohttp
+
+logger = logging.getLogger(__name__)
+
+TELEGRAM_API_URL = "https://api.telegram.org/bot{token}/{method}"
+TELEGRAM_MESSAGE_LIMIT = 4096  # Characters per text message
+TELEGRAM_CAPTION_LIMIT = 1024  # Characters per photo caption
+MEDIA_GROUP_LIMIT = 10         # Photos per sendMediaGroup album
+
+# Telegram limits: ~30 messages/s overall, 20 messages/minute per group or channel
+DEFAULT_GLOBAL_RATE = 30.0
+DEFAULT_CHAT_RATE = 20 / 60
+# Total flood-control wait one call may accumulate before it is given up
+DEFAULT_MAX_FLOOD_WAIT = 300.0
+
+# Bad Request descriptions meaning Telegram could not use a photo URL (the text itself is fine)
+PHOTO_REJECTED_DESCRIPTIONS = ('wrong file identifier', 'failed to get http url content')
+
+
+class TokenBucket:
+    """Token bucket: `rate` tokens per second, bursts up to `capacity`"""
+
+    def __init__(self, rate: float, capacity: float = 1.0):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+        self.blocked_until = 0.0
+
+    def _refill(self, now: float):
+        """Add tokens earned since the last update"""
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def delay(self) -> float:
+        """Seconds until a token is available (0 = now)"""
+        now = time.monotonic()
+        self._refill(now)
+        wait = max(self.blocked_until - now, 0.0)
+        if self.tokens < 1:
+            wait = max(wait, (1 - self.tokens) / self.rate)
+        return wait
+
+    async def acquire(self):
+        """Wait for and take one token"""
+        while True:
+            wait = self.delay()
+            if wait <= 0:
+                self.tokens -= 1
+                return
+            await asyncio.sleep(wait)
+
+    def block(self, seconds: float):
+        """Hand out no tokens for the next `seconds` (server-imposed pause)"""
+        self.blocked_until = max(self.blocked_until, time.monotonic() + seconds)
+        self.tokens = 0
+
+
+@dataclass
+class TelegramError:
+    """Why a call failed: the API's error code and description (code 0 = network error)"""
+    error_code: int
+    description: str = ''
+
+    def is_photo_rejected(self) -> bool:
+        """True if Telegram refused the photo URL itself, so the same post as text would go through"""
+        description = self.description.lower()
+        return self.error_code == 400 and any(text in description for text in PHOTO_REJECTED_DESCRIPTIONS)
+
+
+@dataclass
+class SendRequest:
+    """One queued Bot API call"""
+    method: str
+    payload: Dict[str, Any]
+    future: asyncio.Future = field(repr=False)
+    queued_at: float = field(default_factory=time.monotonic)
+    error: Optional[TelegramError] = None  # Set when the call fails
+
+
+class TelegramSender:
+    """Queued Bot API sender with per-chat workers and shared global rate limit"""
+
+    def __init__(self, bot_token: str, chat_rate: float = DEFAULT_CHAT_RATE, chat_burst: float = 1.0,
+                 global_rate: float = DEFAULT_GLOBAL_RATE, max_retries: int = 3, timeout: float = 10.0,
+                 max_flood_wait: float = DEFAULT_MAX_FLOOD_WAIT):
+        self.bot_token = bot_token
+        self.chat_rate = chat_rate
+        self.chat_burst = chat_burst
+        self.max_retries = max_retries
+        self.timeout = timeout
+        self.max_flood_wait = max_flood_wait
+
+        self.global_bucket = TokenBucket(global_rate, global_rate)
+        self.chat_buckets: Dict[str, TokenBucket] = {}
+        self.queues: Dict[str, asyncio.Queue] = {}
+        self.workers: Dict[str, asyncio.Task] = {}
+        self.session: Optional[aiohttp.ClientSession] = None
+
+        self.stats = {
+            'sent': 0,
+            'failed': 0,
+            'rate_limited': 0,
+            'retry_after_seconds': 0,
+            'queue_wait_seconds': 0.0,
+        }
+
+    async def _get_session(self) -> aiohttp.ClientSession:
+        """Pooled session shared by every request (created on first use)"""
+        if self.session is None or self.session.closed:
+            self.session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=10, keepalive_timeout=60),
+                timeout=aiohttp.ClientTimeout(total=self.timeout)
+            )
+        return self.session
+
+    def submit(self, method: str, payload: Dict[str, Any]) -> asyncio.Future:
+        """Queue a call; the future resolves to the API result, or None if it failed"""
+        return self._enqueue(method, payload).future
+
+    def _enqueue(self, method: str, payload: Dict[str, Any]) -> SendRequest:
+        """Queue a call (starting its chat's worker if needed)"""
+        chat_id = str(payload.get('chat_id', ''))
+        loop = asyncio.get_running_loop()
+        request = SendRequest(method, payload, loop.create_future())
+
+        if chat_id not in self.queues:
+            self.queues[chat_id] = asyncio.Queue()
+            self.chat_buckets[chat_id] = TokenBucket(self.chat_rate, self.chat_burst)
+        worker = self.workers.get(chat_id)
+        if worker is None or worker.done():
+            self.workers[chat_id] = asyncio.create_task(self._chat_worker(chat_id))
+
+        self.queues[chat_id].put_nowait(request)
+        return request
+
+    async def call(self, method: str, payload: Dict[str, Any]) -> Optional[Any]:
+        """Queue a call and wait for its result"""
+        return await self.submit(method, payload)
+
+    async def call_with_error(self, method: str, payload: Dict[str, Any]) -> Tuple[Optional[Any], Optional[TelegramError]]:
+        """Queue a call and wait for (result, None), or (None, why it failed)"""
+        request = self._enqueue(method, payload)
+        result = await request.future
+        if result is None:
+            return None, request.error or TelegramError(0, 'send failed')
+        return result, None
+
+    @staticmethod
+    def _message_call(chat_id: str, text: str, image_url: Optional[str] = None) -> Tuple[str, Dict[str, Any]]:
+        """Method and payload of a text message, or of a photo with caption when image_url is given"""
+        if image_url:
+            return 'sendPhoto', {
+                'chat_id': chat_id,
+                'photo': image_url,
+                'caption': text,
+                'parse_mode': 'HTML'
+            }
+        return 'sendMessage', {
+            'chat_id': chat_id,
+            'text': text,
+            'parse_mode': 'HTML',
+            'disable_web_page_preview': True
+        }
+
+    @staticmethod
+    def _media_group_call(chat_id: str, photos: List[Tuple[str, str]]) -> Tuple[str, Dict[str, Any]]:
+        """Method and payload of one album of (image_url, caption) photos"""
+        return 'sendMediaGroup', {
+            'chat_id': chat_id,
+            'media': [{'type': 'photo', 'media': image_url, 'caption': caption, 'parse_mode': 'HTML'}
+                      for image_url, caption in photos[:MEDIA_GROUP_LIMIT]]
+        }
+
+    def submit_message(self, chat_id: str, text: str, image_url: Optional[str] = None) -> asyncio.Future:
+        """Queue a text message, or a photo with caption when image_url is given"""
+        return self.submit(*self._message_call(chat_id, text, image_url))
+
+    async def send_message_with_error(self, chat_id: str, text: str,
+                                      image_url: Optional[str] = None) -> Tuple[Optional[Any], Optional[TelegramError]]:
+        """Send a message and wait for (sent Message, None), or (None, why it failed)"""
+        return await self.call_with_error(*self._message_call(chat_id, text, image_url))
+
+    def submit_media_group(self, chat_id: str, photos: List[Tuple[str, str]]) -> asyncio.Future:
+        """Queue one album of (image_url, caption) photos; resolves to the list of sent Messages"""
+        return self.submit(*self._media_group_call(chat_id, photos))
+
+    async def send_media_group_with_error(self, chat_id: str, photos: List[Tuple[str, str]]
+                                          ) -> Tuple[Optional[Any], Optional[TelegramError]]:
+        """Send one album and wait for (sent Messages, None), or (None, why it failed)"""
+        return await self.call_with_error(*self._media_group_call(chat_id, photos))
+
+    def submit_edit(self, chat_id: str, message_id: int, text: str, is_caption: bool = False) -> asyncio.Future:
+        """Queue an edit of a sent message's text (or of a photo's caption)"""
+        if is_caption:
+            return self.submit('editMessageCaption', {
+                'chat_id': chat_id,
+                'message_id': message_id,
+                'caption': text,
+                'parse_mode': 'HTML'
+            })
+        return self.submit('editMessageText', {
+            'chat_id': chat_id,
+            'message_id': message_id,
+            'text': text,
+            'parse_mode': 'HTML',
+            'disable_web_page_preview': True
+        })
+
+    async def send_message(self, chat_id: str, text: str, image_url: Optional[str] = None) -> Optional[Any]:
+        """Send a message and wait for the sent Message (None on failure)"""
+        return await self.submit_message(chat_id, text, image_url)
+
+    async def _chat_worker(self, chat_id: str):
+        """Drain one chat's queue at the fastest rate its bucket and the global bucket allow"""
+        queue = self.queues[chat_id]
+        bucket = self.chat_buckets[chat_id]
+        while True:
+            request = await queue.get()
+            try:
+                if request.future.done():
+                    continue  # Caller gave up
+                result = await self._send_with_retries(request, bucket)
+                if not request.future.done():
+                    request.future.set_result(result)
+            except asyncio.CancelledError:
+                if not request.future.done():
+                    request.future.cancel()
+                raise
+            except Exception as e:
+                logger.error(f"Telegram sender error: {e}")
+                if not request.future.done():
+                    request.future.set_result(None)
+            finally:
+                queue.task_done()
+
+    async def _send_with_retries(self, request: SendRequest, bucket: TokenBucket) -> Optional[Any]:
+        """One API call with rate limiting, exact retry_after handling and network retries"""
+        url = TELEGRAM_API_URL.format(token=self.bot_token, method=request.method)
+        attempt = 0
+        flood_wait = 0.0  # retry_after seconds this call has already waited
+
+        while True:
+            await bucket.acquire()
+            await self.global_bucket.acquire()
+            if attempt == 0 and not flood_wait:  # Queue wait is counted once, not again after each retry
+                self.stats['queue_wait_seconds'] += time.monotonic() - request.queued_at
+
+            try:
+                session = await self._get_session()
+                async with session.post(url, json=request.payload) as response:
+                    data = await response.json(content_type=None)
+            except (aiohttp.ClientError, asyncio.TimeoutError, ValueError) as e:
+                attempt += 1
+                if attempt > self.max_retries:
+                    logger.error(f"Network error sending {request.method}, giving up: {e}")
+                    self.stats['failed'] += 1
+                    request.error = TelegramError(0, str(e))
+                    return None
+                backoff = 2 ** attempt
+                logger.warning(f"Network error sending {request.method} (attempt {attempt}), retrying in {backoff}s: {e}")
+                await asyncio.sleep(backoff)
+                continue
+
+            if data.get('ok'):
+                self.stats['sent'] += 1
+                return data.get('result')
+
+            retry_after = (data.get('parameters') or {}).get('retry_after')
+            if data.get('error_code') == 429 and retry_after:
+                # Flood control: pause this chat for exactly as long as Telegram asks
+                self.stats['rate_limited'] += 1
+                self.stats['retry_after_seconds'] += retry_after
+                bucket.block(retry_after)  # Later calls to this chat respect the pause either way
+                if flood_wait + retry_after > self.max_flood_wait:
+                    logger.error(f"🚦 Telegram flood control for chat {request.payload.get('chat_id')}: "
+                                 f"{request.method} would wait {flood_wait + retry_after:.0f}s in total, giving up")
+                    self.stats['failed'] += 1
+                    request.error = TelegramError(429, data.get('description') or '')
+                    return None
+                flood_wait += retry_after
+                logger.warning(f"🚦 Telegram flood control for chat {request.payload.get('chat_id')}, "
+                               f"retrying in {retry_after}s")
+                continue
+
+            if data.get('error_code', 0) >= 500 and attempt < self.max_retries:
+                attempt += 1
+                await asyncio.sleep(2 ** attempt)
+                continue
+
+            logger.error(f"Telegram API error ({request.method}): {data.get('description')}")
+            self.stats['failed'] += 1
+            request.error = TelegramError(data.get('error_code', 0), data.get('description') or '')
+            return None
+
+    def pending(self, chat_id: Optional[str] = None) -> int:
+        """Calls still queued for one chat (default: across all chats)"""
+        if chat_id is not None:
+            queue = self.queues.get(str(chat_id))
+            return queue.qsize() if queue else 0
+        return sum(queue.qsize() for queue in self.queues.values())
+
+    async def close(self):
+        """Stop the workers and close the pooled session"""
+        for worker in self.workers.values():
+            worker.cancel()
+        await asyncio.gather(*self.workers.values(), return_exceptions=True)
+        self.workers.clear()
+        if self.session and not self.session.closed:
+            await self.session.close()
@@ -0,0 +1,42 @@
+from types import SimpleNamespace
+
+from article_features import canonical_article_id, canonical_link, get_features
+
+
+def test_canonical_link_drops_tracking_and_www():
+    assert canonical_link("https://www.Example.com/news/story/?utm_source=x&id=7&fbclid=abc") == (
+        "example.com/news/story?id=7")
+    assert canonical_article_id("A", "https://example.com/a?utm_medium=rss") == (
+        canonical_article_id("B", "http://www.example.com/a/"))
+
+
+def test_canonical_id_falls_back_to_the_title():
+    assert canonical_article_id("Gold  rises!", "") == canonical_article_id("gold rises", "")
+
+
+def test_features_are_cached_on_the_article():
+    article = SimpleNamespace(title="Bitcoin rises", summary="Crypto rally", link='', timestamp=0)
+    features = get_features(article)
+    assert article.features is features
+    assert get_features(article) is features
+    assert features.text == "bitcoin rises crypto rally"
+
+
+def test_features_follow_changed_text():
+    article = SimpleNamespace(title="Bitcoin rises", summary='', link='', timestamp=0)
+    assert not get_features(article).is_arabic()
+
+    article.title = "البيتكوين يرتفع"
+    assert get_features(article).is_arabic()
+    assert get_features(article).text == "البيتكوين يرتفع"
+
+
+def test_title_language_is_tracked_separately():
+    english_title = SimpleNamespace(title="Gold rises", summary="الذهب يرتفع بقوة في التداولات الآسيوية اليوم",
+                                    link='', timestamp=0)
+    arabic_title = SimpleNamespace(title="الذهب يرتفع", summary="Gold rose sharply in Asian trading today on a weaker dollar",
+                                   link='', timestamp=0)
+
+    assert not get_features(english_title).is_title_arabic()
+    assert get_features(arabic_title).is_title_arabic()
+    assert not get_features(arabic_title).is_arabic()
@@ -0,0 +1,57 @@
+import time
+from types import SimpleNamespace
+
+import investing_scraper  # noqa: F401  (registers the breaking-news keyword classes)
+from article_priority import priority_score, rank_key
+
+NOW = 1_700_000_000.0
+
+
+def make_article(title, section, minutes_old):
+    return SimpleNamespace(title=title, summary='', link='', section=section,
+                           timestamp=int(NOW - minutes_old * 60))
+
+
+# (article, minutes it has been queued)
+QUEUED = [
+    (make_article('Breaking: Fed cuts rates', 'BREAKING NEWS', 30), 0),
+    (make_article('Gold edges higher', 'COMMODITIES', 2), 1),
+    (make_article('Crypto market update', 'CRYPTO', 90), 25),
+    (make_article('Stocks open flat', 'STOCK MARKETS', 5), 12),
+    (make_article('Weekly outlook', 'HEADLINES', 240), 60),
+]
+
+
+def test_rank_key_orders_like_priority_score_at_any_later_time():
+    keys = {article.title: rank_key(article, NOW - waited * 60) for article, waited in QUEUED}
+    by_key = sorted(keys, key=keys.get)
+
+    for minutes_later in (0, 5, 30, 120):
+        now = NOW + minutes_later * 60
+        scores = {article.title: priority_score(article, now - (NOW - waited * 60), now)
+                  for article, waited in QUEUED}
+        assert by_key == sorted(scores, key=scores.get, reverse=True)
+
+
+
+def test_future_timestamp_gets_no_extra_freshness():
+    now = time.time()
+    breaking = SimpleNamespace(title='Breaking: Fed cuts rates', summary='', link='', section='BREAKING NEWS',
+                               timestamp=int(now - 60))
+    future = SimpleNamespace(title='Crypto market update', summary='', link='', section='CRYPTO',
+                             timestamp=int(now + 3 * 3600))  # Feed stamped in the wrong timezone
+    current = SimpleNamespace(title='Crypto market update', summary='', link='', section='CRYPTO',
+                              timestamp=int(now))
+
+    assert rank_key(breaking, now) < rank_key(future, now)
+    # Ranked as if published when it was queued
+    assert abs(rank_key(future, now) - rank_key(current, now)) < 0.01
+
+
+def test_aging_lets_a_routine_item_overtake_a_breaking_one():
+    breaking = make_article('Breaking: Fed cuts rates', 'BREAKING NEWS', 0)
+    routine = make_article('Stocks open flat', 'STOCK MARKETS', 0)
+
+    assert rank_key(breaking, NOW) < rank_key(routine, NOW)
+    # Queued an hour earlier, the routine item is now worth more
+    assert rank_key(routine, NOW - 3600) < rank_key(breaking, NOW)
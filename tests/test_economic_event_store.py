@@ -0,0 +1,68 @@
+from economic_event_store import (EVENT_ACTUAL_RELEASED, EVENT_ACTUAL_REVISED, EVENT_FORECAST_REVISED,
+                                  EVENT_NEW, EconomicEventStore)
+from investing_scraper import EconomicEvent
+
+
+def make_event(actual=None, forecast='3.1%', previous='3.0%'):
+    return EconomicEvent(time='12:30', country='US', event_name='CPI y/y', event_name_arabic='مؤشر أسعار المستهلك',
+                         importance='High', actual=actual, forecast=forecast, previous=previous,
+                         event_date='2024-05-15')
+
+
+def change_types(changes):
+    return [change.change_type for change in changes]
+
+
+def test_new_event_then_no_changes(tmp_path):
+    store = EconomicEventStore(str(tmp_path / 'events.json'))
+    assert change_types(store.apply([make_event()])) == [EVENT_NEW]
+    assert store.apply([make_event()]) == []
+
+
+def test_blank_cell_is_not_a_revision(tmp_path):
+    store = EconomicEventStore(str(tmp_path / 'events.json'))
+    store.apply([make_event()])
+    assert store.apply([make_event(forecast='--')]) == []
+
+    changes = store.apply([make_event(forecast='3.2%')])
+    assert change_types(changes) == [EVENT_FORECAST_REVISED]
+    assert (changes[0].old_value, changes[0].new_value) == ('3.1%', '3.2%')
+
+
+def test_released_actual_repeats_until_acknowledged(tmp_path):
+    store = EconomicEventStore(str(tmp_path / 'events.json'))
+    store.apply([make_event()])
+
+    changes = store.apply([make_event(actual='3.4%')])
+    assert change_types(changes) == [EVENT_ACTUAL_RELEASED]
+    # Not delivered yet: the next scrape reports it again
+    assert change_types(store.apply([make_event(actual='3.4%')])) == [EVENT_ACTUAL_RELEASED]
+
+    store.acknowledge(changes[0])
+    assert store.apply([make_event(actual='3.4%')]) == []
+
+
+def test_revised_actual_after_acknowledge(tmp_path):
+    store = EconomicEventStore(str(tmp_path / 'events.json'))
+    store.apply([make_event()])
+    store.acknowledge(store.apply([make_event(actual='3.4%')])[0])
+
+    changes = store.apply([make_event(actual='3.5%')])
+    assert change_types(changes) == [EVENT_ACTUAL_REVISED]
+    assert (changes[0].old_value, changes[0].new_value) == ('3.4%', '3.5%')
+
+
+def test_event_first_seen_after_release(tmp_path):
+    store = EconomicEventStore(str(tmp_path / 'events.json'))
+    assert change_types(store.apply([make_event(actual='3.4%')])) == [EVENT_NEW, EVENT_ACTUAL_RELEASED]
+
+
+def test_acknowledged_actual_survives_reload(tmp_path):
+    path = str(tmp_path / 'events.json')
+    store = EconomicEventStore(path)
+    store.apply([make_event()])
+    store.acknowledge(store.apply([make_event(actual='3.4%')])[0])
+
+    reloaded = EconomicEventStore(path)
+    assert reloaded.get_event(make_event().event_id)['actual'] == '3.4%'
+    assert reloaded.apply([make_event(actual='3.4%')]) == []
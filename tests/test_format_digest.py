@@ -0,0 +1,31 @@
+from crypto_arabic_formatter import CryptoArabicFormatter
+from telegram_sender import TELEGRAM_MESSAGE_LIMIT
+
+
+def test_digest_splits_at_the_telegram_limit_and_keeps_order():
+    headlines = [(f"Headline {index:03d} " + 'x' * 250, f"https://example.com/{index}") for index in range(60)]
+    messages = CryptoArabicFormatter().format_digest(headlines)
+
+    assert len(messages) > 1
+    assert all(len(message) <= TELEGRAM_MESSAGE_LIMIT for message, _ in messages)
+    assert sum(count for _, count in messages) == len(headlines)
+
+    text = ''.join(message for message, _ in messages)
+    positions = [text.index(f"Headline {index:03d}") for index in range(len(headlines))]
+    assert positions == sorted(positions)
+
+
+def test_digest_fits_in_one_message_and_escapes_html():
+    messages = CryptoArabicFormatter().format_digest([("S&P <500> rises", "https://example.com/?a=1&b=2"),
+                                                      ("No link", '')])
+
+    assert len(messages) == 1
+    message, count = messages[0]
+    assert count == 2
+    assert 'S&amp;P &lt;500&gt; rises' in message
+    assert 'href="https://example.com/?a=1&amp;b=2"' in message
+    assert '▪️ No link\n' in message
+
+
+def test_digest_of_nothing_is_empty():
+    assert CryptoArabicFormatter().format_digest([]) == []
@@ -0,0 +1,43 @@
+import pytest
+
+from glossary_translator import GlossaryTranslator, localize_number
+from investing_scraper import ARABIC_EVENT_PATTERNS
+
+
+@pytest.fixture(scope='module')
+def glossary():
+    return GlossaryTranslator(ARABIC_EVENT_PATTERNS)
+
+
+def test_templated_headlines(glossary):
+    assert glossary.translate("Bitcoin price rises to $70,000") == "سعر البيتكوين يرتفع إلى 70,000 دولار"
+    assert glossary.translate("Gold hits record high above $2,400") == "الذهب يسجل مستوى قياسي فوق 2,400 دولار"
+    assert glossary.translate("Fed holds rates steady") == "الاحتياطي الفيدرالي يثبت أسعار الفائدة"
+
+
+def test_versus_expected_template(glossary):
+    assert glossary.translate("US jobless claims fall to 220K vs 225K expected") == (
+        "طلبات إعانة البطالة في الولايات المتحدة تنخفض إلى 220 ألف مقابل توقعات عند 225 ألف")
+
+
+@pytest.mark.parametrize('headline', [
+    "Oil falls on Fed",               # "on" means "because of" here
+    "Oil prices fall to Fed",         # Level preposition without a level
+    "Bitcoin price rises at Fed",
+    "Gold rises for third day",
+    "US CPI rises 3.2%, 3.1% expected",  # Expectation outside the vs template
+    "Tesla shares plunge on weak deliveries",
+])
+def test_ambiguous_headlines_go_to_the_llm(glossary, headline):
+    assert glossary.translate(headline) is None
+
+
+def test_localize_number():
+    assert localize_number("$1.2B") == "1.2 مليار دولار"
+    assert localize_number("4.1%") == "4.1%"
+    assert localize_number("4.1%", arabic_digits=True) == "٤٫١٪"
+
+
+def test_post_edit_normalizes_term_spellings(glossary):
+    assert glossary.post_edit("Bitcoin ETF inflows", "تدفقات صناديق بيتكوين المتداولة") == (
+        "تدفقات صناديق البيتكوين المتداولة")
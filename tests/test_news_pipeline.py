@@ -0,0 +1,86 @@
+import asyncio
+
+from news_pipeline import NewsPipeline, PipelineItem
+
+
+def test_items_flow_through_stages_in_order():
+    async def scenario():
+        results = []
+
+        async def double(items):
+            for item in items:
+                item.values['value'] = item.payload * 2
+            return items
+
+        async def collect(items):
+            results.extend(item.values['value'] for item in items)
+            return items
+
+        pipeline = NewsPipeline().add_stage('double', double).add_stage('collect', collect)
+        pipeline.start()
+        for value in range(5):
+            await pipeline.submit(value)
+        await pipeline.join()
+        await pipeline.stop()
+        return results
+
+    assert asyncio.run(scenario()) == [0, 2, 4, 6, 8]
+
+
+def test_failed_batch_goes_to_the_drop_hook():
+    async def scenario():
+        dropped = []
+
+        async def explode(items):
+            raise RuntimeError("boom")
+
+        pipeline = NewsPipeline().add_stage('explode', explode, on_drop=dropped.extend)
+        pipeline.start()
+        await pipeline.submit('a1')
+        await pipeline.join()
+        await pipeline.stop()
+        return [item.payload for item in dropped], pipeline.stages[0].stats['errors']
+
+    assert asyncio.run(scenario()) == (['a1'], 1)
+
+
+def test_priority_stage_takes_the_lowest_key_first():
+    async def scenario():
+        taken = []
+
+        async def record(items):
+            taken.extend(item.payload for item in items)
+            return items
+
+        pipeline = NewsPipeline().add_stage('send', record, priority=lambda item: item.payload)
+        pipeline.start()
+        # Queued before the worker first runs
+        for value in (3, 1, 2):
+            await pipeline.submit(value)
+        await pipeline.join()
+        await pipeline.stop()
+        return taken
+
+    assert asyncio.run(scenario()) == [1, 2, 3]
+
+
+def test_backlog_counts_only_later_stages():
+    async def scenario():
+        async def passthrough(items):
+            return items
+
+        pipeline = (NewsPipeline()
+                    .add_stage('filter', passthrough)
+                    .add_stage('format', passthrough)
+                    .add_stage('send', passthrough))
+        pipeline.start()
+        await pipeline.submit('queued for filter')
+        await pipeline.submit_to('format', PipelineItem('queued for format'))
+        await pipeline.submit_to('send', PipelineItem('queued for send'))
+        # Workers have not run yet
+        backlog = (pipeline.backlog(after='filter'), pipeline.backlog(after='format'), pipeline.backlog(after='send'))
+        await pipeline.join()
+        await pipeline.stop()
+        return backlog
+
+    assert asyncio.run(scenario()) == (2, 1, 0)
@@ -0,0 +1,58 @@
+import time
+
+from outbox import Outbox, OutboxArticle, OutboxEntry
+
+
+def make_entry(article_id, channel='main', created_at=None, **article_fields):
+    article = OutboxArticle(article_id, f"Title {article_id}", **article_fields)
+    entry = OutboxEntry(article, channel, f"<b>{article_id}</b>", headline=f"Headline {article_id}")
+    if created_at is not None:
+        entry.created_at = created_at
+    return entry
+
+
+def test_entries_survive_reopen_in_insertion_order(tmp_path):
+    path = str(tmp_path / 'outbox.db')
+    outbox = Outbox(path)
+    outbox.put([make_entry('a1', link='https://example.com/a1', timestamp=123, image_url='https://example.com/a1.jpg'),
+                make_entry('a2')])
+    outbox.put([make_entry('a3')])
+    outbox.close()
+
+    entries = Outbox(path).load()
+    assert [entry.article.article_id for entry in entries] == ['a1', 'a2', 'a3']
+    first = entries[0]
+    assert (first.channel, first.text, first.headline) == ('main', '<b>a1</b>', 'Headline a1')
+    assert (first.article.link, first.article.timestamp, first.article.image_url) == (
+        'https://example.com/a1', 123, 'https://example.com/a1.jpg')
+
+
+def test_requeued_article_replaces_its_entry(tmp_path):
+    outbox = Outbox(str(tmp_path / 'outbox.db'))
+    outbox.put([make_entry('a1')])
+    requeued = make_entry('a1')
+    requeued.quick_message_id = 77
+    outbox.put([requeued])
+
+    entries = outbox.load()
+    assert len(entries) == 1
+    assert entries[0].quick_message_id == 77
+
+
+def test_stale_entries_are_dropped_on_load(tmp_path):
+    outbox = Outbox(str(tmp_path / 'outbox.db'), max_age_seconds=3600)
+    outbox.put([make_entry('old', created_at=time.time() - 7200), make_entry('new')])
+
+    assert [entry.article.article_id for entry in outbox.load()] == ['new']
+    assert outbox.count() == 1
+
+
+def test_remove_one_channel_or_all(tmp_path):
+    outbox = Outbox(str(tmp_path / 'outbox.db'))
+    outbox.put([make_entry('a1', 'main'), make_entry('a1', 'english'), make_entry('a2', 'main')])
+
+    outbox.remove('a1', 'english')
+    assert [(entry.article.article_id, entry.channel) for entry in outbox.load()] == [('a1', 'main'), ('a2', 'main')]
+
+    outbox.remove('a1')
+    assert [(entry.article.article_id, entry.channel) for entry in outbox.load()] == [('a2', 'main')]
@@ -0,0 +1,35 @@
+from rss_scraper import RSSNewsArticle, RSSNewsScraper
+
+
+def make_article(title, source, timestamp):
+    return RSSNewsArticle(title=title, link=f"https://example.com/{title}", published='', summary='',
+                          source=source, article_id='', timestamp=timestamp)
+
+
+def test_merge_is_newest_first_across_feeds():
+    streams = [
+        [make_article('a1', 'coindesk', 300), make_article('a2', 'coindesk', 100)],
+        [make_article('b1', 'marketwatch', 400), make_article('b2', 'marketwatch', 200)],
+    ]
+    merged = RSSNewsScraper(custom_sources={})._merge_feed_streams(streams, 10)
+    assert [article.title for article in merged] == ['b1', 'a1', 'b2', 'a2']
+
+
+def test_merge_breaks_ties_by_source_priority_and_puts_undated_last():
+    streams = [
+        [make_article('crypto', 'coindesk', 100), make_article('undated', 'coindesk', 0)],
+        [make_article('economic', 'investing_economic', 100)],
+        [make_article('unknown', 'some_blog', 100)],
+    ]
+    merged = RSSNewsScraper(custom_sources={})._merge_feed_streams(streams, 10)
+    assert [article.title for article in merged] == ['economic', 'crypto', 'unknown', 'undated']
+
+
+def test_merge_sorts_unordered_feeds_and_stops_at_max_articles():
+    streams = [
+        [make_article('old', 'coindesk', 100), make_article('new', 'coindesk', 500)],
+        [make_article('mid', 'marketwatch', 300)],
+        [],
+    ]
+    merged = RSSNewsScraper(custom_sources={})._merge_feed_streams(streams, 2)
+    assert [article.title for article in merged] == ['new', 'mid']
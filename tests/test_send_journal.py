@@ -0,0 +1,84 @@
+import socket
+import subprocess
+import sys
+import time
+
+from send_journal import FAILED, RESERVED, SENT, SendJournal
+
+
+def make_journal(tmp_path, name='journal.db'):
+    return SendJournal(str(tmp_path / name))
+
+
+def dead_owner() -> str:
+    """Owner tag of a process on this host that has exited"""
+    process = subprocess.Popen([sys.executable, '-c', 'pass'])
+    process.wait()
+    return f"{socket.gethostname()}:{process.pid}"
+
+
+def insert_reservation(journal, key, owner, updated_at):
+    journal.connection.execute(
+        "INSERT INTO sends (key, chat_id, state, owner, updated_at) VALUES (?, ?, ?, ?, ?)",
+        (key, '-100', RESERVED, owner, updated_at)
+    )
+    journal.connection.commit()
+
+
+def test_reserve_is_exclusive_until_settled(tmp_path):
+    journal = make_journal(tmp_path)
+    assert journal.reserve('main:a1', '-100')
+    assert not journal.reserve('main:a1', '-100')
+    assert journal.is_claimed('main:a1')
+
+    journal.mark_sent('main:a1', 42)
+    assert journal.get('main:a1')['state'] == SENT
+    assert journal.get('main:a1')['message_id'] == 42
+    assert not journal.reserve('main:a1', '-100')
+    assert journal.stats['conflicts'] == 2
+
+
+def test_failed_send_can_be_reserved_again(tmp_path):
+    journal = make_journal(tmp_path)
+    journal.reserve('main:a1', '-100')
+    journal.mark_failed('main:a1', 'timeout')
+    assert journal.get('main:a1')['state'] == FAILED
+    assert not journal.is_claimed('main:a1')
+
+    assert journal.reserve('main:a1', '-100')
+    assert journal.get('main:a1')['attempts'] == 2
+
+
+def test_reservations_are_shared_between_journals_on_one_file(tmp_path):
+    first = make_journal(tmp_path)
+    second = make_journal(tmp_path)
+    assert first.reserve('main:a1', '-100')
+    assert not second.reserve('main:a1', '-100')
+
+
+def test_recover_resolves_abandoned_reservations(tmp_path):
+    journal = make_journal(tmp_path)
+    insert_reservation(journal, 'main:dead', dead_owner(), time.time())
+    insert_reservation(journal, 'main:stale', 'other-host:1', time.time() - 3600)
+    insert_reservation(journal, 'main:fresh', 'other-host:1', time.time())
+
+    assert journal.recover(stale_seconds=600) == 2
+    assert journal.get('main:dead')['state'] == SENT
+    assert journal.get('main:stale')['state'] == SENT
+    assert journal.get('main:fresh')['state'] == RESERVED  # May still be sending
+
+
+def test_recover_can_queue_unconfirmed_sends_for_retry(tmp_path):
+    journal = make_journal(tmp_path)
+    insert_reservation(journal, 'main:dead', dead_owner(), time.time())
+
+    assert journal.recover(retry_unconfirmed=True) == 1
+    assert journal.get('main:dead')['state'] == FAILED
+    assert journal.reserve('main:dead', '-100')
+
+
+def test_recover_leaves_this_process_alone(tmp_path):
+    journal = make_journal(tmp_path)
+    journal.reserve('main:a1', '-100')
+    assert journal.recover(stale_seconds=0) == 0
+    assert journal.get('main:a1')['state'] == RESERVED
@@ -0,0 +1,107 @@
+import asyncio
+
+from telegram_sender import TelegramSender
+
+
+class FakeResponse:
+    def __init__(self, data):
+        self.data = data
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        return False
+
+    async def json(self, content_type=None):
+        return self.data
+
+
+class FakeSession:
+    """Answers every call with the next canned response (the last one repeats)"""
+    closed = False
+
+    def __init__(self, *responses):
+        self.responses = list(responses)
+        self.calls = 0
+
+    def post(self, url, json):
+        self.calls += 1
+        return FakeResponse(self.responses[min(self.calls, len(self.responses)) - 1])
+
+    async def close(self):
+        self.closed = True
+
+
+FLOOD = {'ok': False, 'error_code': 429, 'parameters': {'retry_after': 0.05}}
+
+
+def send(session, **sender_options):
+    async def scenario():
+        sender = TelegramSender('token', chat_rate=1000, **sender_options)
+        sender.session = session
+        try:
+            return await asyncio.wait_for(sender.send_message('-100', 'hello'), 5), sender.stats
+        finally:
+            await sender.close()
+
+    return asyncio.run(scenario())
+
+
+def test_flood_control_is_retried_after_retry_after():
+    session = FakeSession(FLOOD, {'ok': True, 'result': {'message_id': 7}})
+    result, stats = send(session)
+    assert result == {'message_id': 7}
+    assert session.calls == 2
+    assert (stats['rate_limited'], stats['sent']) == (1, 1)
+
+
+def test_flood_control_gives_up_after_the_total_wait_cap():
+    session = FakeSession(FLOOD)
+    result, stats = send(session, max_flood_wait=0.12)
+    assert result is None
+    assert session.calls == 3  # Waited 0.05s twice; a third wait would pass the cap
+    assert stats['failed'] == 1
+
+
+def test_client_errors_are_not_retried():
+    session = FakeSession({'ok': False, 'error_code': 400, 'description': 'Bad Request'})
+    result, stats = send(session)
+    assert result is None
+    assert session.calls == 1
+    assert stats['failed'] == 1
+
+
+def send_photo(session, **sender_options):
+    async def scenario():
+        sender = TelegramSender('token', chat_rate=1000, **sender_options)
+        sender.session = session
+        try:
+            return await asyncio.wait_for(
+                sender.send_message_with_error('-100', 'hello', 'https://example.com/a.jpg'), 5)
+        finally:
+            await sender.close()
+
+    return asyncio.run(scenario())
+
+
+def test_refused_photo_is_reported_as_a_photo_rejection():
+    session = FakeSession({'ok': False, 'error_code': 400,
+                           'description': 'Bad Request: wrong file identifier/HTTP URL specified'})
+    result, error = send_photo(session)
+    assert result is None
+    assert error.is_photo_rejected()
+
+
+def test_other_failures_are_not_photo_rejections():
+    _, flood_error = send_photo(FakeSession(FLOOD), max_flood_wait=0.01)
+    assert flood_error.error_code == 429
+    assert not flood_error.is_photo_rejected()
+
+    _, bad_request = send_photo(FakeSession({'ok': False, 'error_code': 400,
+                                             'description': "Bad Request: can't parse entities"}))
+    assert not bad_request.is_photo_rejected()
+
+
+def test_successful_send_has_no_error():
+    assert send_photo(FakeSession({'ok': True, 'result': {'message_id': 9}})) == ({'message_id': 9}, None)
@@ -0,0 +1,170 @@
+#!/usr/bin/env python3
+"""
+Persistent translation cache
+Content-addressed by normalized source text + model + prompt version, so re-published
+or retried headlines never pay for the same translation twice
+"""
+import hashlib
+import logging
+import sqlite3
+import time
+import unicodedata
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Model name used for Google Translate entries
+GOOGLE_MODEL = 'google'
+
+
+def normalize_source_text(text: str) -> str:
+    """Normalize text so trivially different copies of a headline share one cache entry"""
+    text = unicodedata.normalize('NFKC', text)
+    return ' '.join(text.split()).casefold()
+
+
+def make_cache_key(text: str, model: str, prompt_version: str = '') -> str:
+    """Cache key for a source text translated by a model with a prompt version"""
+    content = f"{model}\x00{prompt_version}\x00{normalize_source_text(text)}"
+    return hashlib.sha256(content.encode('utf-8')).hexdigest()
+
+
+class TranslationCache:
+    """Two-tier translation cache: LRU in memory, SQLite on disk, both with TTL"""
+
+    def __init__(self, db_file: str = "translation_cache.db", memory_size: int = 500,
+                 ttl_seconds: float = 72 * 3600):
+        self.db_file = db_file
+        self.memory_size = memory_size
+        self.ttl_seconds = ttl_seconds
+
+        # key -> (translation, created_at, latency_seconds)
+        self.memory: "OrderedDict[str, Tuple[str, float, float]]" = OrderedDict()
+        self.connection: Optional[sqlite3.Connection] = None
+
+        self.stats = {
+            'memory_hits': 0,
+            'disk_hits': 0,
+            'misses': 0,
+            'stores': 0,
+            'latency_saved_seconds': 0.0,
+        }
+
+        self._open_database()
+
+    def _open_database(self):
+        """Open (and create) the on-disk tier, falling back to memory only on error"""
+        try:
+            self.connection = sqlite3.connect(self.db_file)
+            self.connection.execute(
+                "CREATE TABLE IF NOT EXISTS translations ("
+                "key TEXT PRIMARY KEY, translation TEXT NOT NULL, model TEXT, "
+                "created_at REAL NOT NULL, latency REAL NOT NULL DEFAULT 0)"
+            )
+            self.connection.commit()
+            self.cleanup_expired()
+        except sqlite3.Error as e:
+            logger.error(f"Error opening translation cache, using memory only: {e}")
+            self.connection = None
+
+    def _is_fresh(self, created_at: float) -> bool:
+        """True if an entry created at this time is within the TTL"""
+        return time.time() - created_at < self.ttl_seconds
+
+    def _remember(self, key: str, entry: Tuple[str, float, float]):
+        """Insert into the memory tier, evicting the least recently used entry"""
+        self.memory[key] = entry
+        self.memory.move_to_end(key)
+        if len(self.memory) > self.memory_size:
+            self.memory.popitem(last=False)
+
+    def get(self, text: str, model: str, prompt_version: str = '') -> Optional[str]:
+        """Cached translation or None"""
+        key = make_cache_key(text, model, prompt_version)
+
+        entry = self.memory.get(key)
+        if entry and self._is_fresh(entry[1]):
+            self.memory.move_to_end(key)
+            self.stats['memory_hits'] += 1
+            self.stats['latency_saved_seconds'] += entry[2]
+            return entry[0]
+
+        if self.connection:
+            try:
+                row = self.connection.execute(
+                    "SELECT translation, created_at, latency FROM translations WHERE key = ?", (key,)
+                ).fetchone()
+            except sqlite3.Error as e:
+                logger.debug(f"Translation cache read failed: {e}")
+                row = None
+            if row and self._is_fresh(row[1]):
+                self._remember(key, row)
+                self.stats['disk_hits'] += 1
+                self.stats['latency_saved_seconds'] += row[2]
+                return row[0]
+
+        self.stats['misses'] += 1
+        return None
+
+    def contains(self, text: str, model: str, prompt_version: str = '') -> bool:
+        """True if a fresh translation is cached (does not count towards hit stats)"""
+        key = make_cache_key(text, model, prompt_version)
+        entry = self.memory.get(key)
+        if entry and self._is_fresh(entry[1]):
+            return True
+        if self.connection:
+            try:
+                row = self.connection.execute(
+                    "SELECT created_at FROM translations WHERE key = ?", (key,)
+                ).fetchone()
+                return bool(row) and self._is_fresh(row[0])
+            except sqlite3.Error:
+                return False
+        return False
+
+    def put(self, text: str, model: str, prompt_version: str, translation: str, latency_seconds: float = 0.0):
+        """Store a translation in both tiers"""
+        if not translation:
+            return
+        key = make_cache_key(text, model, prompt_version)
+        entry = (translation, time.time(), latency_seconds)
+        self._remember(key, entry)
+        self.stats['stores'] += 1
+
+        if self.connection:
+            try:
+                self.connection.execute(
+                    "INSERT OR REPLACE INTO translations (key, translation, model, created_at, latency) "
+                    "VALUES (?, ?, ?, ?, ?)",
+                    (key, translation, model, entry[1], latency_seconds)
+                )
+                self.connection.commit()
+            except sqlite3.Error as e:
+                logger.debug(f"Translation cache write failed: {e}")
+
+    def cleanup_expired(self):
+        """Remove expired entries from the disk tier"""
+        if not self.connection:
+            return
+        cutoff = time.time() - self.ttl_seconds
+        cursor = self.connection.execute("DELETE FROM translations WHERE created_at < ?", (cutoff,))
+        self.connection.commit()
+        if cursor.rowcount:
+            logger.info(f"Cleaned up translation cache, removed {cursor.rowcount} expired entries")
+
+    def get_stats(self) -> Dict[str, float]:
+        """Hit rate and latency saved so far"""
+        hits = self.stats['memory_hits'] + self.stats['disk_hits']
+        lookups = hits + self.stats['misses']
+        return {
+            **self.stats,
+            'hit_rate': hits / lookups if lookups else 0.0,
+            'memory_entries': len(self.memory),
+        }
+
+    def close(self):
+        """Close the on-disk tier"""
+        if self.connection:
+            self.connection.close()
+            self.connection = None